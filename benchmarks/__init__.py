@@ -0,0 +1,3 @@
+'''performance benchmarks for grg_pssedata, run from the repository root,
+e.g. python -m benchmarks.bench_to_psse
+'''
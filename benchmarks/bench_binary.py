@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+'''compares loading cases from pss/e text files and binary case files'''
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import warnings
+
+from grg_pssedata.binary import open_binary_case_file
+from grg_pssedata.binary import read_binary_case_file
+from grg_pssedata.binary import write_binary_case_file
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import write_psse_case_file
+
+from benchmarks.bench_to_psse import default_case
+from benchmarks.bench_to_psse import replicate_case
+
+
+def timed(function, *args):
+    start = time.time()
+    result = function(*args)
+    return time.time() - start, result
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+    work_dir = tempfile.mkdtemp()
+    try:
+        print('copies, buses, parse raw, open binary, read bus column, read binary case')
+        for copies in args.copies:
+            case = replicate_case(parse_psse_case_file(args.file), copies)
+            raw_file = os.path.join(work_dir, 'case.raw')
+            binary_file = os.path.join(work_dir, 'case.grgb')
+            write_psse_case_file(case, raw_file)
+            write_binary_case_file(case, binary_file)
+
+            parse_time, case_2 = timed(parse_psse_case_file, raw_file)
+            open_time, binary_case = timed(open_binary_case_file, binary_file)
+            column_time, vm = timed(lambda: sum(binary_case.column('buses', 'vm')))
+            binary_case.close()
+            read_time, case_3 = timed(read_binary_case_file, binary_file)
+            assert case == case_3
+
+            print('{}, {}, {:.3f}, {:.4f}, {:.4f}, {:.3f}'.format(copies, len(case.buses),
+                parse_time, open_time, column_time, read_time))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks binary case files against pss/e text files')
+    parser.add_argument('--file', default=default_case, help='the pss/e data file to replicate (.raw)')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10, 100], help='the number of copies of the base case')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+'''compares the time to parse plain and compressed pss/e data files
+
+Each file is written once per compression format to a temporary directory
+and then parsed, so every parse reads a file that was not read before in
+this process.
+'''
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import warnings
+
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import write_psse_case_file
+
+from benchmarks.bench_to_psse import default_case
+from benchmarks.bench_to_psse import replicate_case
+
+extensions = ['.raw', '.raw.gz', '.raw.bz2', '.raw.xz']
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+    work_dir = tempfile.mkdtemp()
+    try:
+        print('copies, format, bytes, seconds, relative')
+        for copies in args.copies:
+            case = replicate_case(parse_psse_case_file(args.file), copies)
+
+            plain_time = None
+            for extension in extensions:
+                file_name = os.path.join(work_dir, 'case_{}{}'.format(copies, extension))
+                write_psse_case_file(case, file_name)
+
+                start = time.time()
+                parse_psse_case_file(file_name)
+                elapsed = time.time() - start
+                if plain_time is None:
+                    plain_time = elapsed
+
+                print('{}, {}, {}, {:.3f}, {:.2f}'.format(copies, extension,
+                    os.path.getsize(file_name), elapsed, elapsed/plain_time))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks parsing of compressed pss/e data files')
+    parser.add_argument('--file', default=default_case, help='the pss/e data file to replicate (.raw)')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10, 100], help='the number of copies of the base case')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+'''compares the time of cmd eq with and without section digests
+
+Each replicated case is written twice, once as written by Case.to_psse and
+once with its comments removed, and a third time with one bus changed.
+'''
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import warnings
+
+from grg_pssedata.cmd import eq
+from grg_pssedata.cmd import eq_files
+from grg_pssedata.io import parse_psse_case_file
+
+from benchmarks.bench_to_psse import default_case
+from benchmarks.bench_to_psse import replicate_case
+
+
+def full_eq(file_1, file_2):
+    return eq(parse_psse_case_file(file_1), parse_psse_case_file(file_2))
+
+
+def time_eq(function, file_1, file_2):
+    start = time.time()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        result = function(file_1, file_2)
+    return result, time.time() - start
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    print('copies, buses, files, full seconds, digest seconds, speedup')
+    for copies in args.copies:
+        case = replicate_case(parse_psse_case_file(args.file), copies)
+        psse_data = case.to_psse()
+
+        with tempfile.TemporaryDirectory() as directory:
+            base_file = os.path.join(directory, 'base.raw')
+            same_file = os.path.join(directory, 'same.raw')
+            changed_file = os.path.join(directory, 'changed.raw')
+
+            with open(base_file, 'w') as psse_file:
+                psse_file.write(psse_data)
+            with open(same_file, 'w') as psse_file:
+                psse_file.write('\n'.join(line.split(' /')[0] for line in psse_data.split('\n')))
+            case.buses[0].vm += 0.01
+            with open(changed_file, 'w') as psse_file:
+                psse_file.write(case.to_psse())
+            case.buses[0].vm -= 0.01
+
+            for name, file_name in [('identical', base_file), ('equivalent', same_file), ('changed', changed_file)]:
+                full_result, full_time = time_eq(full_eq, base_file, file_name)
+                digest_result, digest_time = time_eq(eq_files, base_file, file_name)
+                assert full_result == digest_result
+                print('{}, {}, {}, {:.3f}, {:.3f}, {:.1f}'.format(copies, len(case.buses),
+                    name, full_time, digest_time, full_time/digest_time))
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks cmd eq')
+    parser.add_argument('--file', default=default_case, help='the pss/e data file to replicate (.raw)')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10, 100], help='the number of copies of the base case')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
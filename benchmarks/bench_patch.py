@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+'''compares the time of applying a case patch with the time of parsing
+
+A new case is derived from a replicated test case by changing the voltage
+of every 100th bus, removing every 500th load and adding buses.
+'''
+
+import argparse
+import copy
+import io
+import time
+import warnings
+
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import parse_psse_case_str
+from grg_pssedata.patch import apply_patch
+from grg_pssedata.patch import read_patch
+from grg_pssedata.patch import write_case_delta
+
+from benchmarks.bench_to_psse import default_case
+from benchmarks.bench_to_psse import replicate_case
+
+
+def updated_case(case):
+    '''returns a modified copy of the given case'''
+    case = copy.deepcopy(case)
+    for bus in case.buses[::100]:
+        bus.vm += 0.01
+    del case.loads[::500]
+    for index, load in enumerate(case.loads):
+        load.index = index
+    for bus in copy.deepcopy(case.buses[:10]):
+        bus.i += 900000
+        case.buses.append(bus)
+    return case
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    print('copies, buses, operations, patch bytes, parse seconds, delta seconds, apply seconds')
+    for copies in args.copies:
+        case = replicate_case(parse_psse_case_file(args.file), copies)
+        # re-parse so that no component objects are shared
+        psse_data = case.to_psse()
+        case = parse_psse_case_str(psse_data)
+        new_case = updated_case(case)
+
+        start = time.time()
+        base_case = parse_psse_case_str(psse_data)
+        parse_time = time.time() - start
+
+        start = time.time()
+        patch = io.StringIO()
+        operations = write_case_delta(case, new_case, patch)
+        delta_time = time.time() - start
+
+        start = time.time()
+        apply_patch(base_case, read_patch(io.StringIO(patch.getvalue())))
+        apply_time = time.time() - start
+        assert base_case == new_case
+
+        print('{}, {}, {}, {}, {:.3f}, {:.3f}, {:.3f}'.format(copies, len(case.buses),
+            operations, len(patch.getvalue()), parse_time, delta_time, apply_time))
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks case patches')
+    parser.add_argument('--file', default=default_case, help='the pss/e data file to replicate (.raw)')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10, 100], help='the number of copies of the base case')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+'''compares the packed pickling of cases with default object pickling
+
+The default pickling of each component (its class and attribute dict) is
+reproduced with a reducer override, which requires python 3.8 or newer.
+'''
+
+import argparse
+import copyreg
+import io
+import pickle
+import time
+import warnings
+
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import parse_psse_case_str
+
+from benchmarks.bench_to_psse import default_case
+from benchmarks.bench_to_psse import replicate_case
+
+
+class DefaultPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if type(obj).__module__ == 'grg_pssedata.struct':
+            return (copyreg.__newobj__, (type(obj),), obj.__dict__)
+        return NotImplemented
+
+
+def default_dumps(obj):
+    output = io.BytesIO()
+    DefaultPickler(output, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return output.getvalue()
+
+
+def packed_dumps(obj):
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    print('copies, buses, pickling, bytes, dump seconds, load seconds')
+    for copies in args.copies:
+        case = replicate_case(parse_psse_case_file(args.file), copies)
+        # re-parse so that no component objects are shared
+        case = parse_psse_case_str(case.to_psse())
+
+        for name, dumps in [('default', default_dumps), ('packed', packed_dumps)]:
+            start = time.time()
+            data = dumps(case)
+            dump_time = time.time() - start
+
+            start = time.time()
+            case_2 = pickle.loads(data)
+            load_time = time.time() - start
+            assert case == case_2
+            # each load starts with the same objects alive
+            del case_2
+
+            print('{}, {}, {}, {}, {:.3f}, {:.3f}'.format(copies, len(case.buses),
+                name, len(data), dump_time, load_time))
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks pickling of cases')
+    parser.add_argument('--file', default=default_case, help='the pss/e data file to replicate (.raw)')
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10, 100], help='the number of copies of the base case')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+'''measures the rate of probing case headers, with and without section
+line counts, against parsing
+
+The test cases are copied into a temporary directory until it holds the
+given number of files, which are then probed in a loop.  The first pass
+over the files also warms the page cache.
+'''
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import warnings
+
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import probe_psse_case_file
+
+from benchmarks.suite import test_case_files
+
+
+def files_per_minute(function, file_names):
+    start = time.perf_counter()
+    for file_name in file_names:
+        function(file_name)
+    return 60.0*len(file_names)/(time.perf_counter() - start)
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    base_files = []
+    for file_name in test_case_files():
+        try:
+            probe_psse_case_file(file_name, section_lines=True)
+            base_files.append(file_name)
+        except Exception:
+            pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = []
+        for index in range(0, args.files):
+            file_name = os.path.join(directory, 'case_{}.raw'.format(index))
+            shutil.copyfile(base_files[index % len(base_files)], file_name)
+            file_names.append(file_name)
+
+        files_per_minute(probe_psse_case_file, file_names)
+        print('files, probe files/min, probe lines files/min, parse files/min')
+        probe_rate = files_per_minute(probe_psse_case_file, file_names)
+        lines_rate = files_per_minute(lambda file_name: probe_psse_case_file(file_name, section_lines=True), file_names)
+        parse_rate = files_per_minute(parse_psse_case_file, file_names[:args.parse_files])
+        print('{}, {:.0f}, {:.0f}, {:.0f}'.format(len(file_names), probe_rate, lines_rate, parse_rate))
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks probe_psse_case_file')
+    parser.add_argument('--files', type=int, default=10000, help='the number of files to probe')
+    parser.add_argument('--parse-files', type=int, default=200, help='the number of files to parse')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
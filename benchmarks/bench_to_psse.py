@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+'''measures the time of serial and parallel Case.to_psse encodings
+
+The synthetic cases are built by repeating the component lists of a test
+case, which is sufficient for measuring the cost of pss/e encoding.
+'''
+
+import argparse
+import os
+import time
+import warnings
+
+from grg_pssedata.io import parse_psse_case_file
+
+data_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'tests', 'data', 'correct')
+default_case = os.path.join(data_path, 'WECC240_M21_psse33_v01b.raw')
+
+
+def replicate_case(case, copies):
+    '''repeats every component list of the given case, in place'''
+    for component_list in case.component_lists:
+        component_list.extend(component_list * (copies - 1))
+    return case
+
+
+def time_to_psse(case, workers, repeats):
+    best = None
+    for r in range(0, repeats):
+        start = time.time()
+        psse_data = case.to_psse(workers=workers)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, psse_data
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    print('copies, buses, workers, seconds, speedup')
+    for copies in args.copies:
+        case = replicate_case(parse_psse_case_file(args.file), copies)
+        serial_time, serial_data = time_to_psse(case, None, args.repeats)
+        print('{}, {}, {}, {:.3f}, {:.2f}'.format(copies, len(case.buses), 1, serial_time, 1.0))
+
+        for workers in args.workers:
+            parallel_time, parallel_data = time_to_psse(case, workers, args.repeats)
+            assert(parallel_data == serial_data)
+            print('{}, {}, {}, {:.3f}, {:.2f}'.format(copies, len(case.buses), workers, parallel_time, serial_time/parallel_time))
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='benchmarks serial and parallel Case.to_psse')
+    parser.add_argument('--file', default=default_case, help='the pss/e data file to replicate (.raw)')
+    parser.add_argument('--copies', type=int, nargs='+', default=[10, 100, 400], help='the number of copies of the base case')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, os.cpu_count() or 1], help='the process pool sizes to measure')
+    parser.add_argument('--repeats', type=int, default=3, help='the number of timings of each encoding, the best is reported')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+'''compares two json results of benchmarks.suite, memory or startup
+
+A benchmark regresses when its throughput in records per second drops by
+more than the threshold, relative to the baseline, or for the memory and
+startup benchmarks when its peak memory or import time grows by more than
+the threshold.  The exit status is 1 when there are regressions, e.g.
+
+    python -m benchmarks.compare base.json new.json --threshold 0.1
+'''
+
+import argparse
+import collections
+import json
+import sys
+
+
+# the metric of one (case, benchmark) pair, ratio is new / base
+Comparison = collections.namedtuple('Comparison', ['case', 'benchmark', 'base', 'new', 'ratio', 'regression'])
+
+
+# the metric of each kind of result document and whether lower is better
+METRICS = {
+    'throughput': ('records_per_second', False),
+    'memory': ('peak_bytes', True),
+    'startup': ('import_us', True),
+}
+
+
+def compare_results(baseline, results, threshold):
+    '''compares the metrics of the benchmarks of two result documents,
+    benchmarks that are not in both documents are skipped.  The metric is
+    given by the kind of the documents, throughput by default.
+
+    Returns:
+        a list of Comparison, in the order of results
+    '''
+
+    metric, lower_is_better = METRICS[results.get('kind', 'throughput')]
+    base_values = {(result['case'], result['benchmark']): result[metric]
+        for result in baseline['results']}
+
+    comparisons = []
+    for result in results['results']:
+        key = (result['case'], result['benchmark'])
+        base = base_values.get(key)
+        new = result[metric]
+        if not base or new is None:
+            continue
+        ratio = new/base
+        if lower_is_better:
+            regression = ratio > 1.0 + threshold
+        else:
+            regression = ratio < 1.0 - threshold
+        comparisons.append(Comparison(key[0], key[1], base, new, ratio, regression))
+    return comparisons
+
+
+def print_comparison(comparisons, output=None, unit='rec/s'):
+    '''writes a table of comparisons to output, stdout by default, unit is
+    the unit of the metric
+
+    Returns:
+        int: the number of regressions
+    '''
+
+    if output is None:
+        output = sys.stdout
+    print('{:<40} {:<12} {:>14} {:>14} {:>7}'.format('case', 'benchmark', 'base '+unit, 'new '+unit, 'ratio'), file=output)
+    for comparison in comparisons:
+        print('{:<40} {:<12} {:>14.0f} {:>14.0f} {:>7.2f}{}'.format(comparison.case, comparison.benchmark,
+            comparison.base, comparison.new, comparison.ratio, ' REGRESSION' if comparison.regression else ''), file=output)
+
+    regressions = sum(1 for comparison in comparisons if comparison.regression)
+    print('{} of {} benchmarks regressed'.format(regressions, len(comparisons)), file=output)
+    return regressions
+
+
+def main(args):
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.results) as results_file:
+        results = json.load(results_file)
+
+    unit = {'memory': 'bytes', 'startup': 'us'}.get(results.get('kind'), 'rec/s')
+    regressions = print_comparison(compare_results(baseline, results, args.threshold), unit=unit)
+    return 1 if regressions > 0 else 0
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='compares two benchmark result files')
+    parser.add_argument('baseline', help='the json results of the reference commit')
+    parser.add_argument('results', help='the json results to check')
+    parser.add_argument('--threshold', type=float, default=0.1, help='the relative throughput loss or memory growth that is a regression (default: 0.1)')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+'''measures the peak memory of parsing, writing and diff
+
+Each benchmark is run on synthetic cases of a given number of buses (see
+benchmarks.suite) with tracemalloc, and its peak traced memory is
+reported in bytes and bytes per record, along with the deep size of the
+parsed case (see grg_pssedata.memory).  The inputs of a benchmark are
+created before tracing starts, so only the memory that the benchmark
+allocates is counted.  The results are written as json, which
+benchmarks.compare checks against the results of another commit, e.g.
+
+    python -m benchmarks.memory --output base.json
+    python -m benchmarks.memory --output new.json --baseline base.json
+
+Tracing memory slows python down several times, the default sizes are 1k
+and 10k buses, larger cases are measured with --buses 1000 10000 100000.
+'''
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from grg_pssedata.cmd import diff
+from grg_pssedata.io import parse_psse_case_file
+
+from benchmarks.compare import compare_results
+from benchmarks.compare import print_comparison
+from benchmarks.suite import commit_id
+from benchmarks.suite import perturbed_case
+from benchmarks.suite import record_count
+from benchmarks.suite import synthetic_case_data
+
+RESULTS_VERSION = 1
+
+BENCHMARKS = ['parse', 'to_psse', 'diff']
+
+
+def peak_memory(function):
+    '''returns the peak traced memory of calling function, in bytes above
+    the traced memory before the call, and its result
+    '''
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - start, result
+
+
+def run_case(name, psse_file_name):
+    '''runs all memory benchmarks on one pss/e data file
+
+    Returns:
+        a list of json compatible result dicts
+    '''
+
+    peaks = {}
+    peaks['parse'], case = peak_memory(lambda: parse_psse_case_file(psse_file_name))
+    peaks['to_psse'], psse_data = peak_memory(case.to_psse)
+
+    changed_case = perturbed_case(psse_data)
+    del psse_data
+    peaks['diff'], count = peak_memory(lambda: diff(case, changed_case, output=io.StringIO()))
+
+    records = record_count(case)
+    case_bytes = case.memory_report().total().bytes
+    return [{
+        'case': name,
+        'benchmark': benchmark,
+        'buses': len(case.buses),
+        'records': records,
+        'case_bytes': case_bytes,
+        'peak_bytes': peaks[benchmark],
+        'bytes_per_record': peaks[benchmark]/records if records > 0 else None,
+    } for benchmark in BENCHMARKS]
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for buses in args.buses:
+            file_name = os.path.join(directory, 'synthetic_{}.raw'.format(buses))
+            with open(file_name, 'w') as psse_file:
+                psse_file.write(synthetic_case_data(buses, args.seed))
+            results.extend(run_case('synthetic_{}'.format(buses), file_name))
+            os.remove(file_name)
+            print('synthetic_{}: {} records, {} bytes'.format(buses, results[-1]['records'], results[-1]['case_bytes']), file=sys.stderr)
+
+    document = {
+        'version': RESULTS_VERSION,
+        'kind': 'memory',
+        'commit': commit_id(),
+        'python': platform.python_version(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+    if args.output is None:
+        json.dump(document, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as output_file:
+            json.dump(document, output_file, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        comparisons = compare_results(baseline, document, args.threshold)
+        regressions = print_comparison(comparisons, sys.stderr, unit='bytes')
+        return 1 if regressions > 0 else 0
+    return 0
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='measures the peak memory of grg_pssedata with tracemalloc')
+    parser.add_argument('--buses', type=int, nargs='*', default=[1000, 10000], help='the numbers of buses of the synthetic cases')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the synthetic cases')
+    parser.add_argument('--output', help='the json file of the results (default: stdout)')
+    parser.add_argument('--baseline', help='a json file of earlier results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='the relative peak memory growth that is a regression (default: 0.1)')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    sys.exit(main(parser.parse_args()))
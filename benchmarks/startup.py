@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+'''measures the import time and command line startup of grg_pssedata
+
+Each command is run in a new interpreter with python -X importtime, and
+the time of its imports and the modules of grg_pssedata that it loads are
+reported in microseconds, along with the wall time of the whole process.
+The best of a number of runs is kept, after a first run that writes the
+bytecode caches.
+The results are written as json, which benchmarks.compare checks against
+the results of another commit, e.g.
+
+    python -m benchmarks.startup --output base.json
+    python -m benchmarks.startup --output new.json --baseline base.json
+'''
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+from benchmarks.compare import compare_results
+from benchmarks.compare import print_comparison
+from benchmarks.suite import commit_id
+
+RESULTS_VERSION = 1
+
+# the python arguments of each measured command
+COMMANDS = [
+    ('python', ['-c', 'pass']),
+    ('import', ['-c', 'import grg_pssedata']),
+    ('import_io', ['-c', 'import grg_pssedata.io']),
+    ('cmd_version', ['-m', 'grg_pssedata.cmd', '--version']),
+    ('cmd_help', ['-m', 'grg_pssedata.cmd', '--help']),
+]
+
+# self time, cumulative time and name of an import, the indentation of the
+# name is its depth in the import tree
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+package_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def parse_import_times(stderr):
+    '''parses the output of python -X importtime
+
+    Returns:
+        a tuple of the microseconds of the top level imports and a list of
+        the names of all imported modules
+    '''
+
+    microseconds = 0
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append(name)
+        if len(indent) == 1:
+            microseconds += int(cumulative_us)
+    return microseconds, modules
+
+
+def run_command(arguments):
+    '''runs python -X importtime with the given arguments
+
+    Returns:
+        a tuple of the wall and import microseconds and the modules
+    '''
+
+    environment = dict(os.environ)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    environment['PYTHONPATH'] = os.pathsep.join([package_path] + ([environment['PYTHONPATH']] if 'PYTHONPATH' in environment else []))
+
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, env=environment,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    elapsed = int(1e6*(time.perf_counter() - start))
+    import_us, modules = parse_import_times(process.stderr)
+    return elapsed, import_us, modules
+
+
+def run_startup(name, arguments, repeats):
+    '''Returns: a json compatible result dict of one command'''
+    run_command(arguments)
+
+    best_wall, best_import = None, None
+    for r in range(0, repeats):
+        wall_us, import_us, modules = run_command(arguments)
+        best_wall = wall_us if best_wall is None else min(best_wall, wall_us)
+        best_import = import_us if best_import is None else min(best_import, import_us)
+
+    return {
+        'case': name,
+        'benchmark': 'startup',
+        'arguments': arguments,
+        'wall_us': best_wall,
+        'import_us': best_import,
+        'modules': len(modules),
+        'package_modules': sorted(set(module for module in modules if module.split('.')[0] == 'grg_pssedata')),
+    }
+
+
+def main(args):
+    results = []
+    for name, arguments in COMMANDS:
+        result = run_startup(name, arguments, args.repeats)
+        results.append(result)
+        print('{}: {:.1f} ms, imports {:.1f} ms, {} modules {}'.format(name, result['wall_us']/1000,
+            result['import_us']/1000, result['modules'], ' '.join(result['package_modules'])), file=sys.stderr)
+
+    document = {
+        'version': RESULTS_VERSION,
+        'kind': 'startup',
+        'commit': commit_id(),
+        'python': platform.python_version(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+    if args.output is None:
+        json.dump(document, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as output_file:
+            json.dump(document, output_file, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        comparisons = compare_results(baseline, document, args.threshold)
+        regressions = print_comparison(comparisons, sys.stderr, unit='us')
+        return 1 if regressions > 0 else 0
+    return 0
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='measures the import time and command line startup of grg_pssedata')
+    parser.add_argument('--repeats', type=int, default=10, help='the number of runs of each command, the best is reported')
+    parser.add_argument('--output', help='the json file of the results (default: stdout)')
+    parser.add_argument('--baseline', help='a json file of earlier results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='the relative import time growth that is a regression (default: 0.2)')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+'''measures the throughput of parsing, writing, round-trips, diff and eq
+
+Each benchmark is run on the test cases and on synthetic cases of a given
+number of buses, and its throughput is reported in records (components)
+per second.  The results are written as json, which benchmarks.compare
+checks against the results of another commit, e.g.
+
+    python -m benchmarks.suite --output base.json
+    python -m benchmarks.suite --output new.json --baseline base.json
+
+The synthetic cases tile WECC240 (see grg_pssedata.synthetic).  The
+default sizes are 1k, 10k and 100k buses, larger cases are measured with
+--buses 1000 10000 100000 999000, the largest case that fits the pss/e
+bus number range.
+'''
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+from grg_pssedata.cmd import diff
+from grg_pssedata.cmd import eq
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import parse_psse_case_str
+from grg_pssedata.synthetic import synthetic_case
+
+from benchmarks.bench_to_psse import data_path
+from benchmarks.bench_to_psse import default_case
+from benchmarks.compare import compare_results
+from benchmarks.compare import print_comparison
+
+RESULTS_VERSION = 1
+
+BENCHMARKS = ['parse', 'to_psse', 'round_trip', 'diff', 'eq']
+
+
+def test_case_files():
+    '''returns the paths of the correct test cases'''
+    file_names = []
+    for directory, directories, files in os.walk(data_path):
+        file_names.extend(os.path.join(directory, file) for file in files if file.endswith('.raw'))
+    return sorted(file_names)
+
+
+def synthetic_case_data(buses, seed):
+    '''returns the pss/e data of a synthetic case with at least the given
+    number of buses, built by tiling the default test case'''
+    return synthetic_case(parse_psse_case_file(default_case), buses=buses, seed=seed).to_psse()
+
+
+def record_count(case):
+    return sum(len(component_list) for component_list in case.component_lists)
+
+
+def best_time(function, repeats):
+    '''returns the least time of calling function and its last result'''
+    best = None
+    for r in range(0, repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def perturbed_case(psse_data):
+    '''returns a case that differs in the voltage of every 100th bus'''
+    case = parse_psse_case_str(psse_data)
+    for bus in case.buses[::100]:
+        bus.vm += 0.01
+    return case
+
+
+def run_case(name, psse_file_name, repeats):
+    '''runs all benchmarks on one pss/e data file
+
+    Returns:
+        a list of json compatible result dicts
+    '''
+
+    seconds = {}
+    seconds['parse'], case = best_time(lambda: parse_psse_case_file(psse_file_name), repeats)
+    seconds['to_psse'], psse_data = best_time(case.to_psse, repeats)
+    seconds['round_trip'], case_2 = best_time(lambda: parse_psse_case_str(case.to_psse()), repeats)
+
+    changed_case = perturbed_case(psse_data)
+    seconds['diff'], count = best_time(lambda: diff(case, changed_case, output=io.StringIO()), repeats)
+    seconds['eq'], equal = best_time(lambda: eq(case, case_2), repeats)
+    assert equal
+
+    records = record_count(case)
+    return [{
+        'case': name,
+        'benchmark': benchmark,
+        'buses': len(case.buses),
+        'records': records,
+        'seconds': seconds[benchmark],
+        'records_per_second': records/seconds[benchmark] if seconds[benchmark] > 0 else None,
+    } for benchmark in BENCHMARKS]
+
+
+def commit_id():
+    '''returns the git commit of the working directory, if there is one'''
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('utf-8').strip()
+
+
+def main(args):
+    warnings.simplefilter('ignore')
+
+    results = []
+    if not args.no_test_cases:
+        for file_name in test_case_files():
+            name = os.path.relpath(file_name, data_path)
+            results.extend(run_case(name, file_name, args.repeats))
+            print('{}: {} records'.format(name, results[-1]['records']), file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for buses in args.buses:
+            file_name = os.path.join(directory, 'synthetic_{}.raw'.format(buses))
+            with open(file_name, 'w') as psse_file:
+                psse_file.write(synthetic_case_data(buses, args.seed))
+            results.extend(run_case('synthetic_{}'.format(buses), file_name, args.repeats))
+            os.remove(file_name)
+            print('synthetic_{}: {} records'.format(buses, results[-1]['records']), file=sys.stderr)
+
+    document = {
+        'version': RESULTS_VERSION,
+        'kind': 'throughput',
+        'commit': commit_id(),
+        'python': platform.python_version(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+    if args.output is None:
+        json.dump(document, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as output_file:
+            json.dump(document, output_file, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        comparisons = compare_results(baseline, document, args.threshold)
+        regressions = print_comparison(comparisons, sys.stderr)
+        return 1 if regressions > 0 else 0
+    return 0
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='measures the throughput of grg_pssedata in records per second')
+    parser.add_argument('--buses', type=int, nargs='*', default=[1000, 10000, 100000], help='the numbers of buses of the synthetic cases')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the synthetic cases')
+    parser.add_argument('--no-test-cases', action='store_true', help='only measure the synthetic cases')
+    parser.add_argument('--repeats', type=int, default=3, help='the number of timings of each benchmark, the best is reported')
+    parser.add_argument('--output', help='the json file of the results (default: stdout)')
+    parser.add_argument('--baseline', help='a json file of earlier results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='the relative throughput loss that is a regression (default: 0.1)')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    sys.exit(main(parser.parse_args()))
@@ -1,8 +1,24 @@
 """a package for reading and writing of pss/e data files"""
 
+import importlib
+import sys
+
 __version__ = '0.1.4'
 
-# import standard entry points to the code
-from grg_pssedata import io
-from grg_pssedata import exception
-from grg_pssedata import cmd
+# standard entry points to the code, they are imported on first access
+# (e.g. grg_pssedata.io) so that importing the package stays fast
+_submodules = ['io', 'exception', 'cmd']
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('grg_pssedata.'+name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(list(globals().keys()) + _submodules)
+
+# module __getattr__ requires python 3.7
+if sys.version_info < (3, 7):
+    from grg_pssedata import io
+    from grg_pssedata import exception
+    from grg_pssedata import cmd
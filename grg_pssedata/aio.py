@@ -0,0 +1,136 @@
+'''asyncio interfaces for reading and writing pss/e data files
+
+Parsing and writing a case are cpu bound, the coroutines of this module
+run them on an executor so that they do not block the event loop, e.g.
+
+    >>> case = await load_case('case.raw')
+    >>> async for file_name, case in iter_cases(file_names):
+    ...     print(file_name, len(case.buses))
+
+By default the work is done on the default executor of the event loop, a
+thread pool, which keeps the loop responsive but parses one case at a time
+as the parser holds the interpreter lock.  A
+:class:`concurrent.futures.ProcessPoolExecutor` parses cases in parallel,
+the cases are then pickled back to the event loop process.
+
+The number of concurrent loads and writes is bounded by sharing an
+:class:`asyncio.Semaphore` between calls (the limiter argument).  When a
+coroutine is cancelled, a call that is waiting for the limiter or for a
+worker of the executor does not run, a call that is already running on a
+worker completes but its result is discarded.  This module requires
+python 3.6 or later, it uses asynchronous generators.
+'''
+
+import asyncio
+import functools
+
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import write_psse_case_file
+
+
+# the number of files that iter_cases loads at the same time by default
+DEFAULT_CONCURRENCY = 4
+
+
+async def _run(executor, limiter, function, *args, **kwargs):
+    loop = asyncio.get_event_loop()
+    call = functools.partial(function, *args, **kwargs)
+    if limiter is None:
+        return await loop.run_in_executor(executor, call)
+    async with limiter:
+        return await loop.run_in_executor(executor, call)
+
+
+async def load_case(psse_file_name, executor=None, limiter=None, **kwargs):
+    '''Parses a pss/e data file on an executor, see
+    :func:`grg_pssedata.io.parse_psse_case_file`.
+
+    Args:
+        psse_file_name (str): path to a psse data file, it may be gzip, bz2
+            or xz compressed
+        executor: the concurrent.futures executor of the parser, the
+            default executor of the event loop if None
+        limiter (asyncio.Semaphore): if not None, it is held while the file
+            is parsed
+        **kwargs: the keyword arguments of parse_psse_case_file, e.g.
+            diagnostics=True
+    Returns:
+        the result of parse_psse_case_file, a Case by default
+    '''
+
+    return await _run(executor, limiter, parse_psse_case_file, psse_file_name, **kwargs)
+
+
+async def write_case(case, psse_file_name, executor=None, limiter=None):
+    '''Writes a case to a path as pss/e data on an executor, see
+    :func:`grg_pssedata.io.write_psse_case_file`.
+
+    Args:
+        case (Case): a grg_pssedata case
+        psse_file_name (str): path to the psse data file to write, it is
+            compressed when it ends with .gz, .bz2 or .xz
+        executor: the concurrent.futures executor of the writer, the
+            default executor of the event loop if None
+        limiter (asyncio.Semaphore): if not None, it is held while the file
+            is written
+    '''
+
+    await _run(executor, limiter, write_psse_case_file, case, psse_file_name)
+
+
+async def iter_cases(file_names, executor=None, concurrency=DEFAULT_CONCURRENCY, return_exceptions=False, **kwargs):
+    '''Parses many pss/e data files on an executor, at most concurrency
+    files at a time, and yields each case as soon as it is parsed.  When
+    the iteration stops early (or the consuming coroutine is cancelled),
+    the loads that did not complete are cancelled.
+
+    Args:
+        file_names (iterable): paths to psse data files, they are read
+            as loads complete
+        executor: the concurrent.futures executor of the parser, the
+            default executor of the event loop if None
+        concurrency (int): the number of files that are loaded at the
+            same time
+        return_exceptions (bool): if True, the exception of a file that
+            can not be parsed is yielded in place of its case, otherwise it
+            is raised and the other loads are cancelled
+        **kwargs: the keyword arguments of parse_psse_case_file
+    Returns:
+        an async iterator over (file name, case) pairs, in the order in
+        which the loads complete
+    '''
+
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1, not {}'.format(concurrency))
+
+    file_names = iter(file_names)
+    pending = {}
+    try:
+        while True:
+            for file_name in file_names:
+                task = asyncio.ensure_future(load_case(file_name, executor, **kwargs))
+                pending[task] = file_name
+                if len(pending) >= concurrency:
+                    break
+            if len(pending) <= 0:
+                return
+
+            done, waiting = await asyncio.wait(list(pending), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                file_name = pending.pop(task)
+                exception = task.exception()
+                if exception is None:
+                    yield file_name, task.result()
+                elif return_exceptions:
+                    yield file_name, exception
+                else:
+                    raise exception
+    finally:
+        for task in pending:
+            task.cancel()
+        if len(pending) > 0:
+            await asyncio.wait(list(pending))
+        # the results of loads that completed but were not yielded
+        for task in pending:
+            if not task.cancelled():
+                task.exception()
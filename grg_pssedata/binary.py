@@ -0,0 +1,639 @@
+'''a binary columnar file format for pss/e cases, which can be memory mapped
+
+A binary case file stores the columnar encoding of a case (see
+:mod:`grg_pssedata.columnar`), all multi-byte values are little-endian.
+
+=======  =====  ===========================================================
+offset   bytes  content
+=======  =====  ===========================================================
+0        8      magic number, ``GRGPSSEB``
+8        4      format version (uint32), currently 1
+12       4      reserved (zero)
+16       8      offset of the directory (uint64)
+24       8      length of the directory in bytes (uint64)
+32       4      CRC-32 of the directory (uint32)
+36       28     reserved (zero)
+64       ...    data blocks, each starting at a multiple of 64 bytes
+=======  =====  ===========================================================
+
+The directory is a UTF-8 JSON document that describes the data blocks.
+Every block is referenced as ``[offset, length, crc32]``.  The directory
+holds the case header values, the string table and one entry per section
+in :data:`grg_pssedata.struct.PSSE_SECTIONS`::
+
+    {"version": 1,
+     "header": {"ic": 0, "sbase": 100.0, ..., "record2": "..."},
+     "strings": {"count": n, "offsets": block, "data": block},
+     "sections": [{"name": "buses", ...section...}, ...]}
+
+A section is ``{"count": n, "order": block or null, "tables": [table]}``,
+where ``order`` gives the table of each component (an int64 column) when
+components of several shapes are present, e.g. two and three winding
+transformers.  A table is::
+
+    {"shape": shape, "count": n,
+     "columns": [{"path": "p1.i", "kind": "int", "data": block, "mask": block or null}],
+     "children": [{"path": "converters", "counts": block, "section": section}]}
+
+where a shape is ``{"class": "Bus", "fields": [[name, field]]}`` and each
+field is null (a scalar), ``"list"`` (a child section) or a nested shape.
+Columns of kind ``int`` are int64 values, ``float`` are float64 values,
+``str`` are int32 indices into the string table and ``any`` are int32
+indices of python literals (``repr`` strings) in the string table.  A
+column mask is a uint8 flag per value that is 0 where the value is None.
+The string table is an int64 array of ``count + 1`` byte offsets into a
+block of UTF-8 data.
+'''
+
+import array
+import ast
+import json
+import mmap
+import struct
+import sys
+import zlib
+
+import grg_pssedata.struct
+from grg_pssedata.columnar import CASE_HEADER_FIELDS
+from grg_pssedata.columnar import COLUMN_TYPECODES
+from grg_pssedata.columnar import LIST_FIELD
+from grg_pssedata.columnar import Column
+from grg_pssedata.columnar import ComponentSection
+from grg_pssedata.columnar import ComponentTable
+from grg_pssedata.columnar import decode_case
+from grg_pssedata.columnar import encode_case
+from grg_pssedata.exception import PSSEDataParsingError
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+BINARY_MAGIC = b'GRGPSSEB'
+BINARY_VERSION = 1
+
+_header_length = 64
+_block_alignment = 64
+_string_typecode = 'i'
+_numpy_types = {'q': '<i8', 'd': '<f8', 'i': '<i4', 'B': 'u1'}
+
+
+def write_binary_case_file(case, file_name):
+    '''writes the given case to a path in the binary columnar format
+
+    Args:
+        case(Case): a grg_pssedata case
+        file_name(str): path to the binary file to write
+    '''
+
+    with open(file_name, 'wb') as binary_file:
+        _write_binary_case(case, binary_file)
+
+
+def binary_case_bytes(case):
+    '''Returns: the binary columnar encoding of the given case as bytes'''
+    writer = _BytesWriter()
+    _write_binary_case(case, writer)
+    return writer.getvalue()
+
+
+def open_binary_case_file(file_name, verify=False):
+    '''memory maps a binary case file, no component data is read until it
+    is accessed.
+
+    Args:
+        file_name(str): path to a binary case file
+        verify(bool): if True, the checksums of all data blocks are checked
+    Returns:
+        BinaryCase: a read-only view of the file
+    '''
+
+    with open(file_name, 'rb') as binary_file:
+        buffer = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return BinaryCase(buffer, verify=verify)
+
+
+def read_binary_case_file(file_name):
+    '''reads a binary case file, verifying all checksums
+
+    Args:
+        file_name(str): path to a binary case file
+    Returns:
+        Case: a grg_pssedata case
+    '''
+
+    binary_case = open_binary_case_file(file_name, verify=True)
+    try:
+        return binary_case.to_case()
+    finally:
+        binary_case.close()
+
+
+class BinaryCase(object):
+    def __init__(self, buffer, verify=False):
+        '''This data structure provides zero-copy access to a case in the
+        binary columnar format.
+
+        Args:
+            buffer: a bytes-like object holding the encoding, e.g. an mmap
+            verify (bool): if True, the checksums of all data blocks are checked
+        '''
+
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._strings = None
+
+        if len(self._view) < _header_length or bytes(self._view[0:8]) != BINARY_MAGIC:
+            raise PSSEDataParsingError('the given data is not a binary pss/e case')
+
+        version, reserved, directory_offset, directory_length, directory_crc = \
+            _unpack_header(bytes(self._view[8:36]))
+        if version != BINARY_VERSION:
+            raise PSSEDataParsingError('binary case version {} given, only version {} is supported'.format(version, BINARY_VERSION))
+
+        directory_bytes = bytes(self._view[directory_offset:directory_offset+directory_length])
+        if zlib.crc32(directory_bytes) & 0xffffffff != directory_crc:
+            raise PSSEDataParsingError('the directory of the binary case is corrupted')
+        self.directory = json.loads(directory_bytes.decode('utf-8'))
+
+        for name in CASE_HEADER_FIELDS:
+            setattr(self, name, self.directory['header'][name])
+        self._sections = {section['name']: section for section in self.directory['sections']}
+
+        if verify:
+            self.verify()
+
+    def __getattr__(self, name):
+        # component lists are set up on first access, e.g. binary_case.buses
+        sections = self.__dict__.get('_sections', {})
+        if name in sections:
+            components = BinaryComponentList(self, sections[name])
+            setattr(self, name, components)
+            return components
+        raise AttributeError(name)
+
+    @property
+    def component_lists(self):
+        return [getattr(self, name) for name, terminator in PSSE_SECTIONS]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''releases the underlying buffer.  A memory map that is still
+        referenced by column views stays open until the views are released.
+        '''
+        for name in self._sections:
+            self.__dict__.pop(name, None)
+        self._view.release()
+        if hasattr(self._buffer, 'close'):
+            try:
+                self._buffer.close()
+            except BufferError:
+                pass
+
+    def verify(self):
+        '''checks the checksums of all data blocks
+
+        Raises:
+            PSSEDataParsingError: if a block is corrupted
+        '''
+
+        for block in _directory_blocks(self.directory):
+            offset, length, crc = block
+            if zlib.crc32(self._view[offset:offset+length]) & 0xffffffff != crc:
+                raise PSSEDataParsingError('the binary case block at offset {} is corrupted'.format(offset))
+
+    def count(self, section_name):
+        '''Returns: the number of components in the given section'''
+        return self._sections[section_name]['count']
+
+    def tables(self, section_name):
+        '''Returns: the list of BinaryTable objects of the given section, one
+        per component shape'''
+        return [BinaryTable(self, table) for table in self._sections[section_name]['tables']]
+
+    def column(self, section_name, path, numpy=False):
+        '''Returns: a column of a section whose components share one shape,
+        see BinaryTable.column'''
+        tables = self.tables(section_name)
+        if len(tables) != 1:
+            raise KeyError('section {} has {} tables, use tables() to select one'.format(section_name, len(tables)))
+        return tables[0].column(path, numpy)
+
+    def string(self, index):
+        '''Returns: the string with the given index in the string table'''
+        return self._string_table()[index]
+
+    def to_case(self):
+        '''Returns: a grg_pssedata Case with the data of this binary case'''
+        header = [getattr(self, name) for name in CASE_HEADER_FIELDS]
+        sections = [self._component_section(self._sections[name]) for name, terminator in PSSE_SECTIONS]
+        return decode_case(header, sections)
+
+    def to_psse(self):
+        '''Returns: a pss/e encoding of this data structure as a string'''
+        return self.to_case().to_psse()
+
+    def _block(self, block, typecode):
+        offset, length, crc = block
+        view = self._view[offset:offset+length]
+        if sys.byteorder == 'little':
+            return view.cast(typecode)
+        values = array.array(typecode, view)
+        values.byteswap()
+        return values
+
+    def _numpy_block(self, block, typecode):
+        import numpy
+        offset, length, crc = block
+        itemsize = array.array(typecode).itemsize
+        return numpy.frombuffer(self._buffer, dtype=_numpy_types[typecode], count=length//itemsize, offset=offset)
+
+    def _string_table(self):
+        if self._strings is None:
+            strings = self.directory['strings']
+            offsets = self._block(strings['offsets'], 'q')
+            start = strings['data'][0]
+            data = bytes(self._view[start:start+strings['data'][1]])
+            self._strings = [data[offsets[i]:offsets[i+1]].decode('utf-8') for i in range(0, strings['count'])]
+        return self._strings
+
+    def _column(self, column):
+        mask = None
+        if column['mask'] is not None:
+            mask = self._block(column['mask'], 'B')
+
+        kind = column['kind']
+        if kind in COLUMN_TYPECODES:
+            values = self._block(column['data'], COLUMN_TYPECODES[kind])
+        else:
+            strings = self._string_table()
+            values = [strings[index] for index in self._block(column['data'], _string_typecode)]
+            if kind == 'any':
+                values = [ast.literal_eval(value) for value in values]
+
+        return Column(column['path'], kind, values, mask)
+
+    def _component_section(self, section):
+        tables = []
+        for table in section['tables']:
+            columns = [self._column(column) for column in table['columns']]
+            children = [(child['path'], Column(child['path'], 'int', self._block(child['counts'], 'q')),
+                self._component_section(child['section'])) for child in table['children']]
+            tables.append(ComponentTable(_decode_shape(table['shape']), table['count'], columns, children))
+
+        order = None
+        if section['order'] is not None:
+            order = self._block(section['order'], 'q')
+        return ComponentSection(tables, order)
+
+
+class BinaryComponentList(object):
+    def __init__(self, binary_case, section):
+        '''This data structure is a read-only list of the components of a
+        section in a BinaryCase.  Components are built from the columns of
+        the binary case when they are accessed, so changes to them are not
+        stored in the binary case.
+
+        Args:
+            binary_case (BinaryCase): the binary case holding the section
+            section (dict): the directory entry of the section
+        '''
+
+        self._section = section
+        self._tables = [_TableReader(binary_case, table) for table in section['tables']]
+        self._locations = None
+
+    def __len__(self):
+        return self._section['count']
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not (index >= 0 and index < len(self)):
+            raise IndexError('component index out of range')
+
+        if len(self._tables) == 1:
+            return self._tables[0].component(index)
+        table_index, row = self._location(index)
+        return self._tables[table_index].component(row)
+
+    def __iter__(self):
+        for index in range(0, len(self)):
+            yield self[index]
+
+    def __eq__(self, other):
+        try:
+            if len(self) != len(other):
+                return False
+        except TypeError:
+            return NotImplemented
+        return all(component == other_component for component, other_component in zip(self, other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def _location(self, index):
+        if self._locations is None:
+            order = self._tables[0].binary_case._block(self._section['order'], 'q')
+            rows = array.array('q')
+            table_rows = [0] * len(self._tables)
+            for table_index in order:
+                rows.append(table_rows[table_index])
+                table_rows[table_index] += 1
+            self._locations = (order, rows)
+        order, rows = self._locations
+        return order[index], rows[index]
+
+
+class _TableReader(object):
+    '''builds individual components from the columns of a binary table'''
+    def __init__(self, binary_case, table):
+        self.binary_case = binary_case
+        self.shape = _decode_shape(table['shape'])
+        self.columns = {}
+        for column in table['columns']:
+            kind = column['kind']
+            typecode = COLUMN_TYPECODES.get(kind, _string_typecode)
+            mask = None
+            if column['mask'] is not None:
+                mask = binary_case._block(column['mask'], 'B')
+            self.columns[column['path']] = (kind, binary_case._block(column['data'], typecode), mask)
+
+        self.children = {}
+        for child in table['children']:
+            offsets = array.array('q', [0])
+            for count in binary_case._block(child['counts'], 'q'):
+                offsets.append(offsets[-1] + count)
+            self.children[child['path']] = (offsets, BinaryComponentList(binary_case, child['section']))
+
+    def component(self, row):
+        return self._build(self.shape, '', row)
+
+    def _build(self, shape, prefix, row):
+        component_class, fields = shape
+        component = component_class.__new__(component_class)
+        attributes = component.__dict__
+        for name, field_shape in fields:
+            path = prefix+name
+            if field_shape is None:
+                attributes[name] = self._value(path, row)
+            elif field_shape == LIST_FIELD:
+                offsets, items = self.children[path]
+                attributes[name] = items[offsets[row]:offsets[row+1]]
+            else:
+                attributes[name] = self._build(field_shape, path+'.', row)
+        return component
+
+    def _value(self, path, row):
+        kind, values, mask = self.columns[path]
+        if mask is not None and not mask[row]:
+            return None
+        value = values[row]
+        if kind in COLUMN_TYPECODES:
+            return value
+        value = self.binary_case.string(value)
+        if kind == 'any':
+            return ast.literal_eval(value)
+        return value
+
+
+class BinaryTable(object):
+    def __init__(self, binary_case, table):
+        '''This data structure provides access to the columns of components
+        that share a shape in a BinaryCase.
+
+        Args:
+            binary_case (BinaryCase): the binary case holding the table
+            table (dict): the directory entry of the table
+        '''
+
+        self._binary_case = binary_case
+        self._table = table
+        self._columns = {column['path']: column for column in table['columns']}
+
+    @property
+    def component_class(self):
+        return _decode_shape(self._table['shape'])[0]
+
+    @property
+    def count(self):
+        return self._table['count']
+
+    @property
+    def paths(self):
+        return [column['path'] for column in self._table['columns']]
+
+    def column(self, path, numpy=False):
+        '''Returns the values of a field.  Numeric fields are zero-copy views
+        of the underlying buffer (a memoryview, or a numpy array if numpy is
+        True), values that are None are stored as 0, see mask.  Other fields
+        are returned as lists of python objects.
+
+        Args:
+            path (str): the attribute path of the field, e.g. 'p1.i'
+            numpy (bool): if True, numeric fields are returned as numpy arrays
+        '''
+
+        column = self._columns[path]
+        if numpy and column['kind'] in COLUMN_TYPECODES:
+            return self._binary_case._numpy_block(column['data'], COLUMN_TYPECODES[column['kind']])
+        if column['kind'] in COLUMN_TYPECODES:
+            return self._binary_case._block(column['data'], COLUMN_TYPECODES[column['kind']])
+        return self._binary_case._column(column).to_list()
+
+    def mask(self, path, numpy=False):
+        '''Returns: None if no value of the field is None, otherwise a uint8
+        view that is 0 where a value is None'''
+
+        column = self._columns[path]
+        if column['mask'] is None:
+            return None
+        if numpy:
+            return self._binary_case._numpy_block(column['mask'], 'B')
+        return self._binary_case._block(column['mask'], 'B')
+
+
+class _BytesWriter(object):
+    '''a minimal seekable sink for binary_case_bytes'''
+    def __init__(self):
+        self._data = bytearray()
+        self._position = 0
+
+    def tell(self):
+        return self._position
+
+    def seek(self, position):
+        self._position = position
+
+    def write(self, data):
+        data = bytes(data)
+        end = self._position + len(data)
+        if end > len(self._data):
+            self._data.extend(b'\x00' * (end - len(self._data)))
+        self._data[self._position:end] = data
+        self._position = end
+
+    def getvalue(self):
+        return bytes(self._data)
+
+
+class _BlockWriter(object):
+    def __init__(self, output):
+        self.output = output
+        self.strings = {}
+        self.string_list = []
+
+    def write(self, data):
+        position = self.output.tell()
+        padding = -position % _block_alignment
+        if padding > 0:
+            self.output.write(b'\x00' * padding)
+            position += padding
+        data = bytes(data)
+        self.output.write(data)
+        return [position, len(data), zlib.crc32(data) & 0xffffffff]
+
+    def write_array(self, values):
+        if sys.byteorder != 'little':
+            values = array.array(values.typecode, values)
+            values.byteswap()
+        return self.write(values.tobytes())
+
+    def string_index(self, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.string_list)
+            self.strings[value] = index
+            self.string_list.append(value)
+        return index
+
+
+def _write_binary_case(case, output):
+    header, sections = encode_case(case)
+
+    output.write(b'\x00' * _header_length)
+    writer = _BlockWriter(output)
+
+    section_entries = []
+    for (name, terminator), section in zip(PSSE_SECTIONS, sections):
+        entry = _write_section(writer, section)
+        entry['name'] = name
+        section_entries.append(entry)
+
+    encoded_strings = [value.encode('utf-8') for value in writer.string_list]
+    offsets = array.array('q', [0])
+    for value in encoded_strings:
+        offsets.append(offsets[-1] + len(value))
+    strings = {
+        'count': len(encoded_strings),
+        'offsets': writer.write_array(offsets),
+        'data': writer.write(b''.join(encoded_strings))
+    }
+
+    directory = {
+        'version': BINARY_VERSION,
+        'header': dict(zip(CASE_HEADER_FIELDS, header)),
+        'strings': strings,
+        'sections': section_entries
+    }
+    directory_bytes = json.dumps(directory, separators=(',', ':')).encode('utf-8')
+    directory_offset, directory_length, directory_crc = writer.write(directory_bytes)
+
+    output.seek(0)
+    output.write(BINARY_MAGIC)
+    output.write(_pack_header(BINARY_VERSION, 0, directory_offset, directory_length, directory_crc))
+
+
+def _write_section(writer, section):
+    tables = []
+    for table in section.tables:
+        columns = []
+        for column in table.columns:
+            mask = None
+            if column.mask is not None:
+                mask = writer.write_array(array.array('B', column.mask))
+
+            if column.kind in COLUMN_TYPECODES:
+                data = writer.write_array(array.array(COLUMN_TYPECODES[column.kind], column.values))
+            else:
+                values = column.values
+                if column.kind == 'any':
+                    values = [repr(value) for value in values]
+                data = writer.write_array(array.array(_string_typecode, [writer.string_index(value) for value in values]))
+
+            columns.append({'path': column.path, 'kind': column.kind, 'data': data, 'mask': mask})
+
+        children = []
+        for path, counts, child_section in table.children:
+            children.append({
+                'path': path,
+                'counts': writer.write_array(array.array('q', counts.values)),
+                'section': _write_section(writer, child_section)
+            })
+
+        tables.append({'shape': _encode_shape(table.shape), 'count': table.count,
+            'columns': columns, 'children': children})
+
+    order = None
+    if section.order is not None:
+        order = writer.write_array(array.array('q', section.order))
+
+    return {'count': len(section), 'order': order, 'tables': tables}
+
+
+def _pack_header(version, reserved, directory_offset, directory_length, directory_crc):
+    return struct.pack('<IIQQI', version, reserved, directory_offset, directory_length, directory_crc)
+
+
+def _unpack_header(data):
+    return struct.unpack('<IIQQI', data)
+
+
+def _encode_shape(shape):
+    component_class, fields = shape
+    encoded_fields = []
+    for name, field_shape in fields:
+        if field_shape is None or field_shape == LIST_FIELD:
+            encoded_fields.append([name, field_shape])
+        else:
+            encoded_fields.append([name, _encode_shape(field_shape)])
+    return {'class': component_class.__name__, 'fields': encoded_fields}
+
+
+def _decode_shape(encoded_shape):
+    component_class = getattr(grg_pssedata.struct, encoded_shape['class'], None)
+    if not isinstance(component_class, type):
+        raise PSSEDataParsingError('unknown component class {} in binary case'.format(encoded_shape['class']))
+
+    fields = []
+    for name, field_shape in encoded_shape['fields']:
+        if field_shape is None or field_shape == LIST_FIELD:
+            fields.append((name, field_shape))
+        else:
+            fields.append((name, _decode_shape(field_shape)))
+    return (component_class, tuple(fields))
+
+
+def _directory_blocks(directory):
+    blocks = [directory['strings']['offsets'], directory['strings']['data']]
+    sections = list(directory['sections'])
+    while len(sections) > 0:
+        section = sections.pop()
+        if section['order'] is not None:
+            blocks.append(section['order'])
+        for table in section['tables']:
+            for column in table['columns']:
+                blocks.append(column['data'])
+                if column['mask'] is not None:
+                    blocks.append(column['mask'])
+            for child in table['children']:
+                blocks.append(child['counts'])
+                sections.append(child['section'])
+    return blocks
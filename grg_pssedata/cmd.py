@@ -1,158 +1,307 @@
 '''functions for analyzing and transforming psse data files'''
 
 import argparse
+import sys
 
-from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.formats import CONVERT_FORMATS
+
+# the modules of the sub-commands, including the standard library modules
+# of their output formats, are imported by the functions that use them, so
+# that the command line starts without loading the parser
+
+DIFF_FORMATS = ['text', 'json', 'jsonl', 'csv']
+PROFILE_FORMATS = ['table', 'json']
+STATS_FORMATS = ['json', 'jsonl', 'csv']
 
 def compare_component_lists(list_1, list_2, comp_name, index_name = 'index'):
     '''compares two lists and prints the differences to stdout.  Objects in the
-    lists are assumed to have an identification attribute.
+    lists are matched by their identification attributes.
 
     Args:
         list_1 (list): the first list
         list_2 (list): the second list
         comp_name (string): the name of components being compared
-        index_name (string): the name of the object identification attribute
+        index_name (string or tuple): the name(s) of the object identification
+            attribute(s)
     Returns (int):
         returns the number of items that differed in the two lists
     '''
 
-    if not len(list_1) == len(list_2):
-        print('%s counts: %s %s' % (comp_name, len(list_1), len(list_2)))
-        return abs(len(list_1) - len(list_2))
+    from grg_pssedata.diff import diff_components
+
+    diff_count = 0
+    for change in diff_components(list_1, list_2, comp_name, index_name):
+        print_change(change, comp_name)
+        diff_count += 1
+    return diff_count
+
+
+def print_change(change, comp_name=None, output=None):
+    '''prints a component change record to stdout'''
+
+    from grg_pssedata.diff import CASE_HEADER_SECTION
+    from grg_pssedata.diff import SECTION_COMPONENT_NAMES
+    from grg_pssedata.diff import format_key
+
+    if output is None:
+        output = sys.stdout
+    if comp_name is None:
+        comp_name = SECTION_COMPONENT_NAMES.get(change.section, change.section)
+
+    if change.section == CASE_HEADER_SECTION:
+        print('case header: modified', file=output)
     else:
-        diff_count = 0
-        for index in range(0, len(list_1)):
-            comp_1 = list_1[index]
-            comp_2 = list_2[index]
-            if not comp_1 == comp_2:
-                print('different %s (%d): %d %d' % (comp_name, index, 
-                    getattr(comp_1, index_name), getattr(comp_1, index_name)))
-                print('case 1: %s' % str(comp_1))
-                print('case 2: %s' % str(comp_2))
-                print('')
-                diff_count += 1
-        return diff_count
-
-
-def diff(case_1, case_2):
-    '''Compares two :class:`grg_pssedata.struct.Case` objects and prints the 
-    differences to stdout.
+        print('%s %s: %s' % (comp_name, format_key(change.key), change.change), file=output)
+    for field in change.fields:
+        print('  %s: %r -> %r' % (field.field, field.value_1, field.value_2), file=output)
+
+
+def diff(case_1, case_2, format='text', summary=False, output=None, tolerance=None):
+    '''Compares two :class:`grg_pssedata.struct.Case` objects and writes the
+    differences to stdout.  Components are matched by their natural keys,
+    see :data:`grg_pssedata.diff.SECTION_KEYS`.  Changes are written as they
+    are found, the report is never held in memory.
 
     Args:
         case_1: the first psse case
         case_2: the second psse case
+        format (str): one of DIFF_FORMATS, the json, jsonl and csv formats
+            are described in :mod:`grg_pssedata.diff`
+        summary (bool): if True, only the number of changes per section and
+            field are written
+        output: the text stream to write to, stdout by default
+        tolerance (Tolerance): if not None, float fields that are equal
+            within this tolerance are not reported
     Returns (int):
         returns the number of items that differed in the two cases
     '''
 
+    from grg_pssedata.diff import diff_cases
+    from grg_pssedata.diff import summarize_changes
+    from grg_pssedata.diff import write_csv_changes
+    from grg_pssedata.diff import write_json_changes
+    from grg_pssedata.diff import write_jsonl_changes
+
+    if format not in DIFF_FORMATS:
+        raise ValueError('unknown diff format {}, expected one of {}'.format(format, DIFF_FORMATS))
+    if output is None:
+        output = sys.stdout
+
+    changes = diff_cases(case_1, case_2, tolerance)
+
+    if summary:
+        change_counts, field_counts = summarize_changes(changes)
+        print_summary(change_counts, field_counts, format, output)
+        return sum(change_counts.values())
+
+    if format == 'json':
+        return write_json_changes(changes, output)
+    if format == 'jsonl':
+        return write_jsonl_changes(changes, output)
+    if format == 'csv':
+        return write_csv_changes(changes, output)
+
     diff_count = 0
-    if not case_1 == case_2:
-        if not case_1.ic == case_2.ic:
-            print('ic: %d %d' % (case_1.ic, case_2.ic))
-            diff_count += 1
-        if not case_1.sbase == case_2.sbase:
-            print('sbase: %s %s' % (case_1.sbase, case_2.sbase))
-            diff_count += 1
-        if not case_1.rev == case_2.rev:
-            print('rev: %s %s' % (case_1.rev, case_2.rev))
-            diff_count += 1
-        if not case_1.xfrrat == case_2.xfrrat:
-            print('xfrrat: %s %s' % (case_1.xfrrat, case_2.xfrrat))
-            diff_count += 1
-        if not case_1.nxfrat == case_2.nxfrat:
-            print('nxfrat: %s %s' % (case_1.nxfrat, case_2.nxfrat))
-            diff_count += 1
-        if not case_1.basfrq == case_2.basfrq:
-            print('basfrq: %s %s' % (case_1.basfrq, case_2.basfrq))
-            diff_count += 1
-        if not case_1.record1 == case_2.record1:
-            print('record1: %s %s' % (case_1.record1, case_2.record1))
-            diff_count += 1
-        if not case_1.record2 == case_2.record2:
-            print('record2: %s %s' % (case_1.record2, case_2.record2))
+    for change in changes:
+        print_change(change, output=output)
+        diff_count += 1
+
+    if diff_count <= 0:
+        if case_1 == case_2:
+            print('the files are identical', file=output)
+        elif tolerance is not None:
+            print('the files are identical within the given tolerances', file=output)
+        else:
+            print('the files differ only in the order of components', file=output)
+
+    return diff_count
+
+
+def diff_many(file_names, base_file_name=None, workers=None, format='jsonl', output=None, tolerance=None):
+    '''Compares consecutive pairs of psse data files, or each file against a
+    base file, and writes the differences to stdout as they are found, see
+    :func:`grg_pssedata.diff.diff_case_files`.  Each change record also names
+    the two files that were compared (file_1 and file_2).
+
+    Args:
+        file_names (list): paths to psse data files
+        base_file_name (str): if given, each file is compared to this file
+        workers (int): if greater than one, the size of the process pool
+        format (str): one of DIFF_FORMATS
+        output: the text stream to write to, stdout by default
+        tolerance (Tolerance): if not None, float fields that are equal
+            within this tolerance are not reported
+    Returns (int):
+        returns the number of items that differed in all pairs of files
+    '''
+
+    import csv
+    import json
+
+    from grg_pssedata.diff import CSV_CHANGE_COLUMNS
+    from grg_pssedata.diff import change_record
+    from grg_pssedata.diff import diff_case_files
+    from grg_pssedata.diff import format_key
+
+    if format not in DIFF_FORMATS:
+        raise ValueError('unknown diff format {}, expected one of {}'.format(format, DIFF_FORMATS))
+    if output is None:
+        output = sys.stdout
+
+    if format == 'json':
+        output.write('[')
+    elif format == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(['file_1', 'file_2'] + CSV_CHANGE_COLUMNS)
+
+    diff_count = 0
+    for file_name_1, file_name_2, changes in diff_case_files(file_names, base_file_name, workers, tolerance):
+        if format == 'text':
+            print('--- %s' % file_name_1, file=output)
+            print('+++ %s' % file_name_2, file=output)
+        for change in changes:
+            if format == 'text':
+                print_change(change, output=output)
+            elif format == 'csv':
+                key = format_key(change.key)
+                if len(change.fields) <= 0:
+                    writer.writerow([file_name_1, file_name_2, change.section, change.change, key, '', '', ''])
+                for field in change.fields:
+                    writer.writerow([file_name_1, file_name_2, change.section, change.change, key, field.field, field.value_1, field.value_2])
+            else:
+                record = {'file_1': file_name_1, 'file_2': file_name_2}
+                record.update(change_record(change))
+                if format == 'json':
+                    output.write(',\n' if diff_count > 0 else '\n')
+                    output.write(json.dumps(record))
+                else:
+                    output.write(json.dumps(record))
+                    output.write('\n')
             diff_count += 1
+        output.flush()
+
+    if format == 'json':
+        output.write('\n]\n')
+    return diff_count
+
+
+def expand_file_names(patterns):
+    '''expands glob patterns, in order, patterns that match no files are
+    kept as file names'''
+    import glob
 
-        if not case_1.buses == case_2.buses:
-            diff_count += compare_component_lists(
-                case_1.buses, case_2.buses, 'bus', 'i')
+    file_names = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else []
+        file_names.extend(matches if len(matches) > 0 else [pattern])
+    return file_names
 
-        if not case_1.loads == case_2.loads:
-            diff_count += compare_component_lists(
-                case_1.loads, case_2.loads, 'load')
 
-        if not case_1.fixed_shunts == case_2.fixed_shunts:
-            diff_count += compare_component_lists(
-                case_1.fixed_shunts, case_2.fixed_shunts, 'fixed shunt')
+def print_summary(change_counts, field_counts, format='text', output=None):
+    '''writes the change counts of grg_pssedata.diff.summarize_changes'''
 
-        if not case_1.generators == case_2.generators:
-            diff_count += compare_component_lists(
-                case_1.generators, case_2.generators, 'generator')
+    import csv
+    import json
 
-        if not case_1.branches == case_2.branches:
-            diff_count += compare_component_lists(
-                case_1.branches, case_2.branches, 'branch')
+    from grg_pssedata.diff import CSV_SUMMARY_COLUMNS
+    from grg_pssedata.diff import summary_rows
 
-        if not case_1.transformers == case_2.transformers:
-            diff_count += compare_component_lists(
-                case_1.transformers, case_2.transformers, 'transformer')
+    if output is None:
+        output = sys.stdout
+    rows = summary_rows(change_counts, field_counts)
 
-        if not case_1.areas == case_2.areas:
-            diff_count += compare_component_lists(
-                case_1.areas, case_2.areas, 'areas', 'i')
+    if format in ('json', 'jsonl'):
+        records = [dict(zip(CSV_SUMMARY_COLUMNS, row)) for row in rows]
+        if format == 'json':
+            output.write(json.dumps(records, indent=2))
+            output.write('\n')
+        else:
+            for record in records:
+                output.write(json.dumps(record))
+                output.write('\n')
+    elif format == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(CSV_SUMMARY_COLUMNS)
+        writer.writerows(rows)
+    else:
+        for section, change, field, count in rows:
+            if field == '':
+                print('%s %s: %d' % (section, change, count), file=output)
+            else:
+                print('  %s.%s: %d' % (section, field, count), file=output)
 
-        if not case_1.tt_dc_lines == case_2.tt_dc_lines:
-            diff_count += compare_component_lists(
-                case_1.tt_dc_lines, case_2.tt_dc_lines, 'two terminal dc line')
 
-        if not case_1.vsc_dc_lines == case_2.vsc_dc_lines:
-            diff_count += compare_component_lists(
-                case_1.vsc_dc_lines, case_2.vsc_dc_lines, 'vsc dc line')
+def build_tolerance(rtol=0.0, atol=0.0, field_tolerances=None):
+    '''builds a :class:`grg_pssedata.diff.Tolerance` from command line
+    arguments.
 
-        if not case_1.transformer_corrections == case_2.transformer_corrections:
-            diff_count += compare_component_lists(
-                case_1.transformer_corrections, case_2.transformer_corrections, 'transformer correction')
+    Args:
+        rtol (float): the default relative tolerance
+        atol (float): the default absolute tolerance
+        field_tolerances (list): overrides of the form FIELD=RTOL[,ATOL],
+            e.g. 'buses.vm=1e-4' or 'r=0,1e-6'
+    Returns:
+        a Tolerance, or None if all tolerances are zero
+    '''
 
-        if not case_1.mt_dc_lines == case_2.mt_dc_lines:
-            diff_count += compare_component_lists(
-                case_1.mt_dc_lines, case_2.mt_dc_lines, 'multi terminal dc line')
+    from grg_pssedata.diff import Tolerance
 
-        if not case_1.line_groupings == case_2.line_groupings:
-            diff_count += compare_component_lists(
-                case_1.line_groupings, case_2.line_groupings, 'line group')
+    fields = {}
+    for text in field_tolerances or []:
+        field, separator, values = text.partition('=')
+        values = values.split(',')
+        if separator == '' or len(field) <= 0 or len(values) > 2:
+            raise ValueError('invalid field tolerance {}, expected FIELD=RTOL[,ATOL]'.format(text))
+        field_rtol = float(values[0])
+        field_atol = float(values[1]) if len(values) > 1 else atol
+        fields[field] = (field_rtol, field_atol)
 
-        if not case_1.zones == case_2.zones:
-            diff_count += compare_component_lists(
-                case_1.zones, case_2.zones, 'zones', 'i')
+    if rtol == 0.0 and atol == 0.0 and len(fields) <= 0:
+        return None
+    return Tolerance(rtol, atol, fields)
 
-        if not case_1.transfers == case_2.transfers:
-            diff_count += compare_component_lists(
-                case_1.transfers, case_2.transfers, 'inter-area transfer')
 
-        if not case_1.owners == case_2.owners:
-            diff_count += compare_component_lists(
-                case_1.owners, case_2.owners, 'owners', 'i')
+def delta(case_1, case_2, output=None):
+    '''Writes the patch that transforms one case into another to stdout,
+    see :mod:`grg_pssedata.patch` for the format.
+
+    Args:
+        case_1: the base psse case
+        case_2: the new psse case
+        output: the text stream to write to, stdout by default
+    Returns (int):
+        returns the number of patch operations
+    '''
+
+    from grg_pssedata.patch import write_case_delta
 
-        if not case_1.facts == case_2.facts:
-            diff_count += compare_component_lists(
-                case_1.facts, case_2.facts, 'facts device')
+    if output is None:
+        output = sys.stdout
+    return write_case_delta(case_1, case_2, output)
 
-        if not case_1.switched_shunts == case_2.switched_shunts:
-            diff_count += compare_component_lists(
-                case_1.switched_shunts, case_2.switched_shunts, 'switched shunt')
 
-        if not case_1.gnes == case_2.gnes:
-            diff_count += compare_component_lists(
-                case_1.gnes, case_2.gnes, 'generic network element')
+def apply(case, patch_lines, output=None):
+    '''Applies a patch to a case and writes the patched case to stdout as a
+    psse data file.
 
-        if not case_1.induction_machines == case_2.induction_machines:
-            diff_count += compare_component_lists(
-                case_1.induction_machines, case_2.induction_machines, 'induction machine')
+    Args:
+        case: the base psse case of the patch, it is modified in place
+        patch_lines (iterable): the lines of a patch
+        output: the text stream to write to, stdout by default
+    Returns:
+        the patched case
+    '''
 
-    else:
-        print('the files are identical')
+    from grg_pssedata.patch import apply_patch
+    from grg_pssedata.patch import read_patch
 
-    return diff_count
+    if output is None:
+        output = sys.stdout
+    case = apply_patch(case, read_patch(patch_lines))
+    for line in case.psse_lines():
+        output.write(line)
+        output.write('\n')
+    return case
 
 
 def eq(case_1, case_2):
@@ -171,6 +320,163 @@ def eq(case_1, case_2):
     return False
 
 
+def eq_files(file_1, file_2):
+    '''Tests if two psse data files are equal.  The files are compared by
+    size and content digest first, then by the digests of their sections
+    (see :mod:`grg_pssedata.digest`).  Only the sections whose digests
+    differ are parsed and compared with :func:`eq`.
+
+    Args:
+        file_1 (str): path to the first psse data file
+        file_2 (str): path to the second psse data file
+    Returns (bool):
+        returns True if the files hold equal cases
+    '''
+
+    from grg_pssedata.digest import files_identical
+    from grg_pssedata.digest import reduced_case_lines
+    from grg_pssedata.digest import section_digests
+    from grg_pssedata.io import parse_psse_case_file
+    from grg_pssedata.io import parse_psse_case_lines
+
+    if files_identical(file_1, file_2):
+        print('the files are identical')
+        return True
+
+    digests_1 = section_digests(file_1)
+    digests_2 = section_digests(file_2)
+    if digests_1 is None or digests_2 is None:
+        # incomplete files are reported by the parser
+        return eq(parse_psse_case_file(file_1), parse_psse_case_file(file_2))
+
+    sections = set(section for (section, digest_1), (section_2, digest_2) in zip(digests_1, digests_2) if digest_1 != digest_2)
+    if len(sections) <= 0:
+        print('the case file data structures are identical')
+        print('the section digests are identical')
+        return True
+
+    case_1 = parse_psse_case_lines(reduced_case_lines(file_1, sections))
+    case_2 = parse_psse_case_lines(reduced_case_lines(file_2, sections))
+    return eq(case_1, case_2)
+
+
+def profile(file_name, format='table', output=None):
+    '''Parses a psse data file and writes the parse profile of each section
+    to stdout, see :mod:`grg_pssedata.profiling`.
+
+    Args:
+        file_name (str): path to a psse data file
+        format (str): one of PROFILE_FORMATS
+        output: the text stream to write to, stdout by default
+    Returns:
+        the ParseStats of the file
+    '''
+
+    import json
+
+    from grg_pssedata.io import parse_psse_case_file
+
+    if output is None:
+        output = sys.stdout
+    parse_stats = parse_psse_case_file(file_name, profile=True).parse_stats
+
+    if format == 'json':
+        json.dump({'file': file_name, 'sections': parse_stats.records()}, output)
+        output.write('\n')
+    else:
+        for line in parse_stats.table():
+            output.write(line)
+            output.write('\n')
+    return parse_stats
+
+
+def stats(file_names, workers=None, format='json', output=None):
+    '''Summarizes psse data files without parsing them into cases and writes
+    the statistics of each file to stdout as they are computed, see
+    :mod:`grg_pssedata.stats`.
+
+    Args:
+        file_names (list): paths to psse data files
+        workers (int): if greater than one, the size of the process pool
+        format (str): one of STATS_FORMATS
+        output: the text stream to write to, stdout by default
+    Returns (int):
+        returns the number of files that could not be read
+    '''
+
+    from grg_pssedata.stats import case_files_stats
+    from grg_pssedata.stats import write_csv_stats
+    from grg_pssedata.stats import write_json_stats
+    from grg_pssedata.stats import write_jsonl_stats
+
+    if format not in STATS_FORMATS:
+        raise ValueError('unknown stats format {}, expected one of {}'.format(format, STATS_FORMATS))
+    if output is None:
+        output = sys.stdout
+
+    errors = []
+    def count_errors(case_stats):
+        for file_stats in case_stats:
+            if file_stats.error is not None:
+                errors.append(file_stats.file)
+            yield file_stats
+
+    case_stats = count_errors(case_files_stats(file_names, workers))
+    if format == 'json':
+        write_json_stats(case_stats, output)
+    elif format == 'jsonl':
+        write_jsonl_stats(case_stats, output)
+    else:
+        write_csv_stats(case_stats, output)
+    return len(errors)
+
+
+def convert(file_names, out_dir, to='raw', workers=None, output=None):
+    '''Parses psse data files and writes each case to a directory in another
+    format, see :mod:`grg_pssedata.convert`.  A progress line is written for
+    each file as its conversion completes, followed by the number of files,
+    components and bytes that were converted and their rates.
+
+    Args:
+        file_names (list): paths to psse data files
+        out_dir (str): the directory of the converted cases
+        to (str): one of CONVERT_FORMATS
+        workers (int): if greater than one, the size of the process pool
+        output: the text stream of the progress, stderr by default
+    Returns (int):
+        returns the number of files that could not be converted
+    '''
+
+    import time
+
+    from grg_pssedata.convert import convert_files
+
+    if to not in CONVERT_FORMATS:
+        raise ValueError('unknown convert format {}, expected one of {}'.format(to, CONVERT_FORMATS))
+    if output is None:
+        output = sys.stderr
+
+    start = time.perf_counter()
+    converted, errors, components, input_bytes = 0, 0, 0, 0
+    for count, result in enumerate(convert_files(file_names, out_dir, to, workers), 1):
+        if result.error is None:
+            converted += 1
+            components += result.components
+            input_bytes += result.input_bytes
+            print('[{}/{}] {} -> {} ({} components, {:.3f} s)'.format(count, len(file_names),
+                result.file, result.output, result.components, result.seconds), file=output)
+        else:
+            errors += 1
+            print('[{}/{}] {} failed: {}'.format(count, len(file_names), result.file, result.error), file=output)
+        output.flush()
+
+    seconds = max(time.perf_counter() - start, 1e-9)
+    print('converted {} of {} files to {} in {:.3f} s, {} errors: {:.1f} files/s, {:.0f} components/s, {:.2f} MB/s'.format(
+        converted, len(file_names), to, seconds, errors, converted/seconds, components/seconds,
+        input_bytes/seconds/1e6), file=output)
+    return errors
+
+
 def build_cmd_parser():
     parser = argparse.ArgumentParser(
         description='''grg_pssedata.cmd provides tools for analyzing and
@@ -190,6 +496,74 @@ def build_cmd_parser():
         'differences between two case files')
     parser_diff.add_argument('file_1', help='a psse data file (.raw)')
     parser_diff.add_argument('file_2', help='a psse data file (.raw)')
+    parser_diff.add_argument('--format', choices=DIFF_FORMATS, default='text',
+        help='the output format of the changes (default: text)')
+    parser_diff.add_argument('--summary', action='store_true', help='only '
+        'count the changes per section and field')
+    parser_diff.add_argument('--rtol', type=float, default=0.0, help='the '
+        'relative tolerance of float fields (default: 0)')
+    parser_diff.add_argument('--atol', type=float, default=0.0, help='the '
+        'absolute tolerance of float fields (default: 0)')
+    parser_diff.add_argument('--tolerance', action='append', default=[],
+        metavar='FIELD=RTOL[,ATOL]', help='the tolerance of one field, e.g. '
+        'buses.vm=1e-4 or va=0,1e-3, may be repeated')
+
+    parser_diff_many = subparsers.add_parser('diff-many', help = 'presents '
+        'the differences between consecutive case files, or between each case '
+        'file and a base case file')
+    parser_diff_many.add_argument('files', nargs='+', help='psse data files '
+        '(.raw) or glob patterns, e.g. "snapshots/*.raw"')
+    parser_diff_many.add_argument('--base', help='a psse data file that each '
+        'file is compared to')
+    parser_diff_many.add_argument('--jobs', type=int, default=None, help='the '
+        'number of worker processes')
+    parser_diff_many.add_argument('--format', choices=DIFF_FORMATS, default='jsonl',
+        help='the output format of the changes (default: jsonl)')
+    parser_diff_many.add_argument('--rtol', type=float, default=0.0, help='the '
+        'relative tolerance of float fields (default: 0)')
+    parser_diff_many.add_argument('--atol', type=float, default=0.0, help='the '
+        'absolute tolerance of float fields (default: 0)')
+    parser_diff_many.add_argument('--tolerance', action='append', default=[],
+        metavar='FIELD=RTOL[,ATOL]', help='the tolerance of one field, may be '
+        'repeated')
+
+    parser_delta = subparsers.add_parser('delta', help = 'writes a patch '
+        'that transforms the first case file into the second')
+    parser_delta.add_argument('file_1', help='the base psse data file (.raw)')
+    parser_delta.add_argument('file_2', help='the new psse data file (.raw)')
+
+    parser_apply = subparsers.add_parser('apply', help = 'applies a patch '
+        'to a case file and writes the patched case file')
+    parser_apply.add_argument('file', help='the base psse data file (.raw)')
+    parser_apply.add_argument('patch', help='a patch written by the delta '
+        'sub-command')
+
+    parser_profile = subparsers.add_parser('profile', help = 'parses a case '
+        'file and presents the time, size and memory of each section')
+    parser_profile.add_argument('file', help='a psse data file (.raw)')
+    parser_profile.add_argument('--format', choices=PROFILE_FORMATS, default='table',
+        help='the output format of the profile (default: table)')
+
+    parser_stats = subparsers.add_parser('stats', help = 'counts the records '
+        'of each section, the buses by area and type and the total load and '
+        'generation of case files, without parsing them into cases')
+    parser_stats.add_argument('files', nargs='+', help='psse data files '
+        '(.raw) or glob patterns, e.g. "archive/*.raw"')
+    parser_stats.add_argument('--jobs', type=int, default=None, help='the '
+        'number of worker processes')
+    parser_stats.add_argument('--format', choices=STATS_FORMATS, default='json',
+        help='the output format of the statistics (default: json)')
+
+    parser_convert = subparsers.add_parser('convert', help = 'parses case '
+        'files and writes them to a directory in another format')
+    parser_convert.add_argument('files', nargs='+', help='psse data files '
+        '(.raw) or glob patterns, e.g. "archive/*.raw"')
+    parser_convert.add_argument('out_dir', metavar='outdir', help='the '
+        'directory of the converted cases')
+    parser_convert.add_argument('--to', choices=CONVERT_FORMATS, default='raw',
+        help='the format of the converted cases (default: raw)')
+    parser_convert.add_argument('--jobs', type=int, default=None, help='the '
+        'number of worker processes')
 
     #parser.add_argument('--foo', help='foo help')
     version = __import__('grg_pssedata').__version__
@@ -207,17 +581,45 @@ def main(args):
         args: an argparse data structure
     '''
 
-    if args.cmd == 'eq':
-        case_1 = parse_psse_case_file(args.file_1)
-        case_2 = parse_psse_case_file(args.file_2)
+    from grg_pssedata.io import open_psse_file
+    from grg_pssedata.io import parse_psse_case_file
 
-        return eq(case_1, case_2)
+    if args.cmd == 'eq':
+        return eq_files(args.file_1, args.file_2)
 
     if args.cmd == 'diff':
+         tolerance = build_tolerance(args.rtol, args.atol, args.tolerance)
+
          case_1 = parse_psse_case_file(args.file_1)
          case_2 = parse_psse_case_file(args.file_2)
 
-         return diff(case_1, case_2)
+         return diff(case_1, case_2, args.format, args.summary, tolerance=tolerance)
+
+    if args.cmd == 'diff-many':
+        tolerance = build_tolerance(args.rtol, args.atol, args.tolerance)
+        file_names = expand_file_names(args.files)
+
+        return diff_many(file_names, args.base, args.jobs, args.format, tolerance=tolerance)
+
+    if args.cmd == 'delta':
+        case_1 = parse_psse_case_file(args.file_1)
+        case_2 = parse_psse_case_file(args.file_2)
+
+        return delta(case_1, case_2)
+
+    if args.cmd == 'apply':
+        case = parse_psse_case_file(args.file)
+        with open_psse_file(args.patch) as patch_file:
+            return apply(case, patch_file)
+
+    if args.cmd == 'profile':
+        return profile(args.file, args.format)
+
+    if args.cmd == 'stats':
+        return stats(expand_file_names(args.files), args.jobs, args.format)
+
+    if args.cmd == 'convert':
+        return convert(expand_file_names(args.files), args.out_dir, args.to, args.jobs)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,499 @@
+'''columnar encodings of the component lists of a pss/e case
+
+Each component list is encoded as a :class:`ComponentSection`, which groups
+its components by shape (class and attribute layout) into
+:class:`ComponentTable` objects.  A table stores one :class:`Column` per
+scalar attribute, attributes of nested components (e.g. the first line of
+parameters of a transformer) are flattened into dotted paths such as
+``p1.i``, and attributes holding lists of components (e.g. the converters
+of a multi-terminal dc line) are encoded as nested sections.
+
+Building typed columns costs more than pickling components one by one, so
+cases are pickled with a lighter packed encoding (see :func:`pack_case`),
+which stores the attribute names of each class of components once and the
+attribute values of its components in one list.
+'''
+
+import array
+import itertools
+
+from grg_pssedata.struct import Case
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+CASE_HEADER_FIELDS = ['ic', 'sbase', 'rev', 'xfrrat', 'nxfrat', 'basfrq', 'record1', 'record2']
+
+# the shape of a component attribute that holds a list of components
+LIST_FIELD = 'list'
+
+# column kinds and the array type codes used to store them
+COLUMN_TYPECODES = {'int': 'q', 'float': 'd'}
+
+_scalar_types = frozenset([int, float, str, bool, type(None)])
+_flat_shapes = {}
+
+_component_field = 'component'
+_mixed_field = 'mixed'
+
+_int_min = -2**63
+_int_max = 2**63 - 1
+
+
+class Column(object):
+    def __init__(self, path, kind, values, mask=None):
+        '''This data structure contains the values of one field of a table
+        of components.
+
+        Args:
+            path (str): the attribute path of the field, e.g. 'p1.i'
+            kind (str): 'int', 'float', 'str' or 'any' (a mix of value types)
+            values (sequence): the field values, an array or memoryview for
+                the 'int' and 'float' kinds
+            mask (sequence): None if no value is None, otherwise a flag per
+                value that is 0 where the value is None
+        '''
+
+        self.path = path
+        self.kind = kind
+        self.values = values
+        self.mask = mask
+
+    def __len__(self):
+        return len(self.values)
+
+    def to_list(self):
+        '''Returns: the values of this column as python objects'''
+        if self.mask is None:
+            return list(self.values)
+        return [value if present else None for value, present in zip(self.values, self.mask)]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if isinstance(self.values, memoryview):
+            state['values'] = array.array(self.values.format, self.values)
+        if isinstance(self.mask, memoryview):
+            state['mask'] = array.array(self.mask.format, self.mask)
+        if self.kind == 'str':
+            # each distinct string is pickled once, values refer to it by index
+            strings = {}
+            indexes = array.array('q', [strings.setdefault(value, len(strings)) for value in self.values])
+            state['values'] = (tuple(strings), indexes)
+        return state
+
+    def __setstate__(self, state):
+        if state['kind'] == 'str':
+            strings, indexes = state['values']
+            state['values'] = [strings[index] for index in indexes]
+        self.__dict__.update(state)
+
+
+class ComponentTable(object):
+    def __init__(self, shape, count, columns, children):
+        '''This data structure contains components that share a shape.
+
+        Args:
+            shape (tuple): the component shape, see component_shape
+            count (int): the number of components
+            columns (list of Column): the scalar fields of the components
+            children (list of (str, Column, ComponentSection)): for each list
+                field, its path, the length of the list in each component
+                and the encoding of all list items
+        '''
+
+        self.shape = shape
+        self.count = count
+        self.columns = columns
+        self.children = children
+
+    @property
+    def component_class(self):
+        return self.shape[0]
+
+    def column(self, path):
+        '''Returns: the Column with the given path'''
+        for column in self.columns:
+            if column.path == path:
+                return column
+        raise KeyError(path)
+
+    def to_components(self):
+        '''Returns: a list of the components encoded by this table'''
+        columns = {column.path: column.to_list() for column in self.columns}
+        children = {}
+        for path, counts, section in self.children:
+            items = section.to_components()
+            lists, start = [], 0
+            for count in counts.values:
+                lists.append(items[start:start+count])
+                start += count
+            children[path] = lists
+        return _build_components(self.shape, columns, children, '', self.count)
+
+
+class ComponentSection(object):
+    def __init__(self, tables, order=None):
+        '''This data structure contains a columnar encoding of a list of
+        components.
+
+        Args:
+            tables (list of ComponentTable): the components grouped by shape
+            order (sequence): None if there is at most one table, otherwise
+                the index of the table holding each component, in list order
+        '''
+
+        self.tables = tables
+        self.order = order
+
+    def __len__(self):
+        return sum(table.count for table in self.tables)
+
+    def to_components(self):
+        '''Returns: the list of components encoded by this section'''
+        if len(self.tables) <= 0:
+            return []
+        if self.order is None:
+            return self.tables[0].to_components()
+
+        table_components = [iter(table.to_components()) for table in self.tables]
+        return [next(table_components[table_index]) for table_index in self.order]
+
+
+def component_shape(component):
+    '''Computes a hashable description of the class and attribute layout of
+    a component, i.e. (class, ((name, field_shape), ...)) where field_shape
+    is None for scalar values, LIST_FIELD for lists of components and a
+    nested shape for component values.
+    '''
+
+    attributes = component.__dict__
+    if _scalar_types.issuperset(map(type, attributes.values())):
+        key = (component.__class__, tuple(attributes))
+        shape = _flat_shapes.get(key)
+        if shape is None:
+            shape = (component.__class__, tuple((name, None) for name in attributes))
+            _flat_shapes[key] = shape
+        return shape
+
+    fields = []
+    for name, value in attributes.items():
+        if isinstance(value, list):
+            fields.append((name, LIST_FIELD))
+        elif hasattr(value, '__dict__'):
+            fields.append((name, component_shape(value)))
+        else:
+            fields.append((name, None))
+    return (component.__class__, tuple(fields))
+
+
+def shape_paths(shape, prefix=''):
+    '''Returns: the (path, field_shape) pairs of the scalar and list fields
+    of a shape, in attribute order, with nested components flattened
+    '''
+
+    paths = []
+    for name, field_shape in shape[1]:
+        if field_shape is None or field_shape == LIST_FIELD:
+            paths.append((prefix+name, field_shape))
+        else:
+            paths.extend(shape_paths(field_shape, prefix+name+'.'))
+    return paths
+
+
+def typed_column(path, values, types=None):
+    '''Builds a Column with the most compact kind that holds all the given
+    values exactly.
+
+    Args:
+        path (str): the attribute path of the field
+        values (sequence): the field values
+        types (set): the types of the values, if already known
+    '''
+
+    if types is None:
+        types = set(map(type, values))
+    types = set(types)
+    nullable = type(None) in types
+    types.discard(type(None))
+
+    kind = 'any'
+    if types == set([int]):
+        non_null = values
+        if nullable:
+            non_null = [value for value in values if value is not None]
+        if min(non_null) >= _int_min and max(non_null) <= _int_max:
+            kind = 'int'
+    elif types == set([float]):
+        kind = 'float'
+    elif types == set([str]):
+        kind = 'str'
+
+    if kind == 'any' or not nullable:
+        mask = None
+    else:
+        mask = array.array('B', [0 if value is None else 1 for value in values])
+        null = '' if kind == 'str' else 0
+        values = [null if value is None else value for value in values]
+
+    if kind in COLUMN_TYPECODES:
+        values = array.array(COLUMN_TYPECODES[kind], values)
+
+    return Column(path, kind, values, mask)
+
+
+def encode_components(components):
+    '''Builds the columnar encoding of a list of components.
+
+    Args:
+        components (list): a list of grg_pssedata components
+    Returns:
+        ComponentSection: the encoded components
+    '''
+
+    if len(components) <= 0:
+        return ComponentSection([])
+
+    # most lists hold components of a single shape, which is checked while
+    # the columns are built instead of computing the shape of each component
+    table = _encode_table(components)
+    if table is not None:
+        return ComponentSection([table])
+
+    shape_index = {}
+    shape_rows = []
+    order = array.array('q')
+    for component in components:
+        shape = component_shape(component)
+        index = shape_index.get(shape)
+        if index is None:
+            index = len(shape_rows)
+            shape_index[shape] = index
+            shape_rows.append([])
+        shape_rows[index].append(component)
+        order.append(index)
+
+    tables = [_encode_table(rows) for rows in shape_rows]
+    return ComponentSection(tables, order)
+
+
+def encode_case(case):
+    '''Builds the columnar encoding of a case.
+
+    Args:
+        case (Case): a grg_pssedata case
+    Returns:
+        (list, list of ComponentSection): the values of CASE_HEADER_FIELDS and
+        an encoding of each component list in PSSE_SECTIONS
+    '''
+
+    header = [getattr(case, name) for name in CASE_HEADER_FIELDS]
+    sections = [encode_components(getattr(case, name)) for name, terminator in PSSE_SECTIONS]
+    return header, sections
+
+
+def decode_case(header, sections):
+    '''Rebuilds a case from the output of encode_case.
+
+    Args:
+        header (list): the values of CASE_HEADER_FIELDS
+        sections (list of ComponentSection): the component lists
+    Returns:
+        Case: a grg_pssedata case
+    '''
+
+    component_lists = [section.to_components() for section in sections]
+    return Case(*(list(header) + component_lists))
+
+
+def pack_components(components):
+    '''Builds the packed encoding of a list of components, the components
+    are grouped by class and attribute names and each group stores the
+    attribute values of its components in one list, component after
+    component.  Attributes that hold a component in every member of a group
+    are packed in turn.
+
+    Args:
+        components (list): a list of grg_pssedata components
+    Returns:
+        (list, array or None): the groups, as (class, attribute names, count,
+        values, packed attributes) tuples, and None if there is at most one
+        group, otherwise the group of each component, in list order
+    '''
+
+    if len(components) <= 0:
+        return [], None
+
+    # most lists hold components of a single class and attribute layout,
+    # which is checked on the attribute names of all components at once
+    attributes = [component.__dict__ for component in components]
+    names = list(attributes[0])
+    if len(set(map(type, components))) == 1 and list(itertools.chain.from_iterable(attributes)) == names*len(attributes):
+        return [_pack_group(components[0].__class__, tuple(names), attributes)], None
+
+    group_index = {}
+    groups = []
+    order = array.array('q')
+    for component, component_attributes in zip(components, attributes):
+        key = (component.__class__, tuple(component_attributes))
+        index = group_index.get(key)
+        if index is None:
+            index = len(groups)
+            group_index[key] = index
+            groups.append((key[0], key[1], []))
+        groups[index][2].append(component_attributes)
+        order.append(index)
+
+    return [_pack_group(*group) for group in groups], order
+
+
+def unpack_components(packed):
+    '''Returns: the list of components of the output of pack_components'''
+    groups, order = packed
+
+    group_components = []
+    for component_class, names, count, values, nested in groups:
+        if len(nested) > 0:
+            values = list(values)
+            for index, field_packed in nested:
+                values[index::len(names)] = unpack_components(field_packed)
+
+        # components are restored without their constructors, see
+        # _build_components
+        new = component_class.__new__
+        components = [new(component_class) for index in range(0, count)]
+        rows = zip(*[iter(values)]*len(names))
+        for component, row in zip(components, rows):
+            component.__dict__.update(zip(names, row))
+        group_components.append(components)
+
+    if order is None:
+        return group_components[0] if len(group_components) > 0 else []
+    group_iterators = [iter(components) for components in group_components]
+    return [next(group_iterators[index]) for index in order]
+
+
+def pack_case(case):
+    '''Builds the packed encoding of a case, see pack_components.
+
+    Returns:
+        (list, list): the values of CASE_HEADER_FIELDS and the packed
+        component lists of PSSE_SECTIONS
+    '''
+
+    header = [getattr(case, name) for name in CASE_HEADER_FIELDS]
+    sections = [pack_components(getattr(case, name)) for name, terminator in PSSE_SECTIONS]
+    return header, sections
+
+
+def unpack_case(header, sections):
+    '''Returns: the case of the output of pack_case'''
+    component_lists = [unpack_components(packed) for packed in sections]
+    return Case(*(list(header) + component_lists))
+
+
+def _pack_group(component_class, names, attributes):
+    values = list(itertools.chain.from_iterable(map(dict.values, attributes)))
+
+    # nested components, e.g. the windings of a transformer, are packed
+    nested = []
+    for index, value in enumerate(values[:len(names)]):
+        if type(value) in _scalar_types:
+            continue
+        field_values = values[index::len(names)]
+        if _field_shape(set(map(type, field_values))) == _component_field:
+            nested.append((index, pack_components(field_values)))
+            values[index::len(names)] = [None]*len(attributes)
+
+    return (component_class, names, len(attributes), values, tuple(nested))
+
+
+def _encode_table(rows):
+    columns, children = [], []
+    shape = _encode_fields(rows, '', columns, children)
+    if shape is None:
+        return None
+    return ComponentTable(shape, len(rows), columns, children)
+
+
+def _encode_fields(rows, prefix, columns, children):
+    '''adds the columns and child sections of a non-empty list of components
+    to the given lists.
+
+    Returns:
+        the shape of the components, or None if they do not share a shape
+    '''
+
+    component_class = rows[0].__class__
+    # the values are read in attribute order, which must be the same
+    names = tuple(rows[0].__dict__)
+    for row in rows:
+        if row.__class__ is not component_class or tuple(row.__dict__) != names:
+            return None
+
+    fields = []
+    field_values = zip(*[tuple(row.__dict__.values()) for row in rows])
+    for name, values in zip(names, field_values):
+        path = prefix+name
+        types = set(map(type, values))
+        field_shape = _field_shape(types)
+        if field_shape is None:
+            columns.append(typed_column(path, values, types))
+        elif field_shape == LIST_FIELD:
+            counts = Column(path, 'int', array.array('q', [len(items) for items in values]))
+            items = [item for row_items in values for item in row_items]
+            children.append((path, counts, encode_components(items)))
+        elif field_shape == _component_field:
+            field_shape = _encode_fields(values, path+'.', columns, children)
+            if field_shape is None:
+                return None
+        else:
+            return None
+        fields.append((name, field_shape))
+
+    return (component_class, tuple(fields))
+
+
+def _field_shape(types):
+    '''classifies a field by the types of its values, consistently with
+    component_shape'''
+
+    if _scalar_types.issuperset(types):
+        return None
+
+    lists = [issubclass(value_type, list) for value_type in types]
+    components = [not is_list and value_type.__dictoffset__ != 0 for value_type, is_list in zip(types, lists)]
+    if all(lists):
+        return LIST_FIELD
+    if all(components):
+        return _component_field
+    if not any(lists) and not any(components):
+        return None
+    return _mixed_field
+
+
+def _build_components(shape, columns, children, prefix, count):
+    component_class, fields = shape
+
+    names, field_values = [], []
+    for name, field_shape in fields:
+        path = prefix+name
+        names.append(name)
+        if field_shape is None:
+            field_values.append(columns[path])
+        elif field_shape == LIST_FIELD:
+            field_values.append(children[path])
+        else:
+            field_values.append(_build_components(field_shape, columns, children, path+'.', count))
+
+    components = []
+    if len(names) <= 0:
+        for index in range(0, count):
+            components.append(component_class.__new__(component_class))
+        return components
+
+    for values in zip(*field_values):
+        # components are restored without their constructors, which would
+        # re-apply default values and string normalization
+        component = component_class.__new__(component_class)
+        component.__dict__.update(zip(names, values))
+        components.append(component)
+    return components
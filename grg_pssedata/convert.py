@@ -0,0 +1,297 @@
+'''conversion of pss/e data files to other formats
+
+Each file is parsed with :func:`grg_pssedata.io.parse_psse_case_file` and
+written to an output directory in one of CONVERT_FORMATS:
+
+``raw``
+    pss/e data, as written by :meth:`grg_pssedata.struct.Case.to_psse`
+``json``
+    a json document of the case header fields and of the components of
+    each section, encoded as by :func:`grg_pssedata.patch.component_state`
+``csv``
+    a directory of csv files, ``header.csv`` holds the case header fields
+    and each section with components has a file with a row per component
+    and a column per field path (see :func:`grg_pssedata.diff.component_fields`)
+``npz``
+    a numpy archive of the columnar encoding of the case (see
+    :mod:`grg_pssedata.columnar`), this format requires numpy
+``binary``
+    the binary columnar format of :mod:`grg_pssedata.binary`
+
+The output is named after the input file, without its compression and
+data file extensions, e.g. ``archive/case.raw.gz`` is converted to
+``case.json``.  Many files are converted on a process pool, an error in one
+file is reported in its result and does not stop the others.
+'''
+
+import collections
+import csv
+import json
+import multiprocessing
+import os
+import time
+
+from grg_pssedata.binary import write_binary_case_file
+from grg_pssedata.columnar import CASE_HEADER_FIELDS
+from grg_pssedata.columnar import encode_components
+from grg_pssedata.diff import component_fields
+from grg_pssedata.formats import CONVERT_EXTENSIONS
+from grg_pssedata.formats import CONVERT_FORMATS
+from grg_pssedata.io import compression_extensions
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import write_psse_case_file
+from grg_pssedata.patch import build_component
+from grg_pssedata.patch import component_state
+from grg_pssedata.struct import Case
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+JSON_CASE_FORMAT = 'grg-pssedata-case'
+JSON_CASE_VERSION = 1
+
+CSV_HEADER_FILE = 'header.csv'
+
+# the result of converting one file, output is the path of the converted
+# case, components its number of components and input_bytes and
+# output_bytes the sizes of the input file and of the output.  When the
+# file could not be converted, error is a description of the problem.
+ConvertResult = collections.namedtuple('ConvertResult', ['file', 'output',
+    'components', 'input_bytes', 'output_bytes', 'seconds', 'error'])
+
+
+def output_name(psse_file_name, out_dir, format):
+    '''Returns: the path of the conversion of a file to a format'''
+    if format not in CONVERT_FORMATS:
+        raise ValueError('unknown convert format {}, expected one of {}'.format(format, CONVERT_FORMATS))
+
+    base_name = os.path.basename(psse_file_name)
+    for extension in compression_extensions:
+        if base_name.endswith(extension):
+            base_name = base_name[:-len(extension)]
+            break
+    stem, extension = os.path.splitext(base_name)
+    if len(stem) <= 0:
+        stem = base_name
+    return os.path.join(out_dir, stem + CONVERT_EXTENSIONS[format])
+
+
+def case_record(case):
+    '''Returns: the json compatible dict of a case in the json format'''
+    record = collections.OrderedDict([('format', JSON_CASE_FORMAT), ('version', JSON_CASE_VERSION)])
+    for name in CASE_HEADER_FIELDS:
+        record[name] = getattr(case, name)
+    record['sections'] = collections.OrderedDict((name, [component_state(component) for component in getattr(case, name)])
+        for name, terminator in PSSE_SECTIONS)
+    return record
+
+
+def record_case(record):
+    '''Returns: the case of a dict in the json format, see case_record'''
+    if not isinstance(record, dict) or record.get('format') != JSON_CASE_FORMAT:
+        raise ValueError('the document is not a {} document'.format(JSON_CASE_FORMAT))
+    if record.get('version') != JSON_CASE_VERSION:
+        raise ValueError('unsupported {} version {}'.format(JSON_CASE_FORMAT, record.get('version')))
+
+    header = [record[name] for name in CASE_HEADER_FIELDS]
+    component_lists = [[build_component(state) for state in record['sections'].get(name, [])]
+        for name, terminator in PSSE_SECTIONS]
+    return Case(*(header + component_lists))
+
+
+def write_json_case_file(case, file_name):
+    '''writes the given case to a path in the json format'''
+    with open(file_name, 'w') as json_file:
+        json.dump(case_record(case), json_file)
+
+
+def read_json_case_file(file_name):
+    '''Returns: the case of a file in the json format'''
+    with open(file_name) as json_file:
+        return record_case(json.load(json_file))
+
+
+def write_csv_case_directory(case, directory):
+    '''writes the given case to a directory of csv files, one per section
+    with components and CSV_HEADER_FILE for the case header fields.
+
+    Returns:
+        list: the paths of the files that were written
+    '''
+
+    os.makedirs(directory, exist_ok=True)
+    file_names = [os.path.join(directory, CSV_HEADER_FILE)]
+    with open(file_names[0], 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['field', 'value'])
+        for name in CASE_HEADER_FIELDS:
+            writer.writerow([name, getattr(case, name)])
+
+    for name, terminator in PSSE_SECTIONS:
+        components = getattr(case, name)
+        if len(components) <= 0:
+            continue
+
+        # the columns are the fields of all components, in order of appearance
+        rows = [collections.OrderedDict(component_fields(component)) for component in components]
+        columns = collections.OrderedDict()
+        for row in rows:
+            columns.update((path, None) for path in row)
+
+        file_names.append(os.path.join(directory, name + '.csv'))
+        with open(file_names[-1], 'w', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, list(columns))
+            writer.writeheader()
+            writer.writerows(rows)
+    return file_names
+
+
+def npz_arrays(case):
+    '''Builds the arrays of the npz format of a case.  The case header is a
+    json string named 'header' and each column of the columnar encoding of
+    a section is named by its section, table and field path, e.g.
+    'buses/0/i'.  The mask of a nullable column is named by its path and
+    ':mask', the table order of a section with several tables is named
+    by the section and 'order' and the list lengths of a list field by its
+    path and ':count', its items being encoded under the path.  Values of
+    columns of mixed types are json encoded.
+
+    Returns:
+        dict: the numpy arrays by name
+    '''
+
+    import numpy
+
+    arrays = collections.OrderedDict()
+    arrays['header'] = numpy.array(json.dumps(dict((name, getattr(case, name)) for name in CASE_HEADER_FIELDS)))
+    for name, terminator in PSSE_SECTIONS:
+        _section_arrays(numpy, name, encode_components(getattr(case, name)), arrays)
+    return arrays
+
+
+def _section_arrays(numpy, prefix, section, arrays):
+    if section.order is not None:
+        arrays[prefix + '/order'] = numpy.asarray(section.order, dtype=numpy.int64)
+    for table_index, table in enumerate(section.tables):
+        table_prefix = '{}/{}/'.format(prefix, table_index)
+        for column in table.columns:
+            arrays[table_prefix + column.path] = _column_array(numpy, column)
+            if column.mask is not None:
+                arrays[table_prefix + column.path + ':mask'] = numpy.asarray(column.mask, dtype=numpy.bool_)
+        for path, counts, child in table.children:
+            arrays[table_prefix + path + ':count'] = numpy.asarray(counts.values, dtype=numpy.int64)
+            _section_arrays(numpy, table_prefix + path, child, arrays)
+
+
+def _column_array(numpy, column):
+    if column.kind == 'int':
+        return numpy.asarray(column.values, dtype=numpy.int64)
+    if column.kind == 'float':
+        return numpy.asarray(column.values, dtype=numpy.float64)
+    if column.kind == 'str':
+        return numpy.array(list(column.values), dtype=numpy.str_)
+    return numpy.array([json.dumps(value) for value in column.values], dtype=numpy.str_)
+
+
+def write_npz_case_file(case, file_name):
+    '''writes the given case to a path in the npz format, see npz_arrays.
+    This requires numpy.
+    '''
+
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('the npz format requires numpy, which is not installed')
+    with open(file_name, 'wb') as npz_file:
+        numpy.savez_compressed(npz_file, **npz_arrays(case))
+
+
+def write_case(case, file_name, format):
+    '''writes the given case to a path in one of CONVERT_FORMATS
+
+    Returns:
+        list: the paths of the files that were written
+    '''
+
+    if format == 'raw':
+        write_psse_case_file(case, file_name)
+    elif format == 'json':
+        write_json_case_file(case, file_name)
+    elif format == 'csv':
+        return write_csv_case_directory(case, file_name)
+    elif format == 'npz':
+        write_npz_case_file(case, file_name)
+    elif format == 'binary':
+        write_binary_case_file(case, file_name)
+    else:
+        raise ValueError('unknown convert format {}, expected one of {}'.format(format, CONVERT_FORMATS))
+    return [file_name]
+
+
+def convert_file(psse_file_name, output_file_name, format):
+    '''Converts a pss/e data file, the file may be compressed.  Problems
+    with the file are reported in the error field of the result.
+
+    Args:
+        psse_file_name (str): path to a psse data file
+        output_file_name (str): path of the converted case
+        format (str): one of CONVERT_FORMATS
+    Returns:
+        ConvertResult: the result of the conversion
+    '''
+
+    start = time.perf_counter()
+    components, input_bytes, output_bytes, error = 0, 0, 0, None
+    try:
+        if os.path.abspath(psse_file_name) == os.path.abspath(output_file_name):
+            raise ValueError('the output would overwrite the input file')
+        input_bytes = os.path.getsize(psse_file_name)
+        case = parse_psse_case_file(psse_file_name)
+        components = sum(len(getattr(case, name)) for name, terminator in PSSE_SECTIONS)
+        output_bytes = sum(os.path.getsize(file_name) for file_name in write_case(case, output_file_name, format))
+    # any problem with one file, including a parser failure on malformed
+    # data, must not stop the conversion of the others
+    except Exception as exception:
+        error = '{}: {}'.format(exception.__class__.__name__, exception)
+    return ConvertResult(psse_file_name, output_file_name, components, input_bytes,
+        output_bytes, time.perf_counter() - start, error)
+
+
+def _convert_task(task):
+    return convert_file(*task)
+
+
+def convert_files(file_names, out_dir, format, workers=None):
+    '''Converts many pss/e data files, see convert_file.
+
+    Args:
+        file_names (list): paths to psse data files
+        out_dir (str): the directory of the converted cases, it is created
+            if it does not exist
+        format (str): one of CONVERT_FORMATS
+        workers (int): if greater than one, the size of the process pool
+    Returns:
+        an iterator over the ConvertResult of each file, in the order in
+        which the conversions complete
+    Raises:
+        ValueError: if two files would be converted to the same output
+    '''
+
+    tasks = [(file_name, output_name(file_name, out_dir, format), format) for file_name in file_names]
+    outputs = collections.Counter(output for file_name, output, format in tasks)
+    duplicates = sorted(output for output, count in outputs.items() if count > 1)
+    if len(duplicates) > 0:
+        raise ValueError('several files would be converted to {}'.format(', '.join(duplicates)))
+    os.makedirs(out_dir, exist_ok=True)
+
+    if workers is None or workers <= 1:
+        for task in tasks:
+            yield _convert_task(task)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        for result in pool.imap_unordered(_convert_task, tasks):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,107 @@
+'''aggregated diagnostics of the pss/e parser
+
+Dirty data files can have an issue on every record, e.g. trailing values
+that are ignored.  Instead of issuing a warning per line, the parser adds
+its issues to a :class:`ParseDiagnostics` collector, which counts them per
+section and kind and keeps the first few examples of each.  Messages are
+only formatted when they are requested, so counting an issue is cheap.
+'''
+
+import collections
+import warnings
+
+from grg_pssedata.exception import PSSEDataWarning
+
+
+# the number of examples kept of each (section, kind) of issue
+MAX_EXAMPLES = 10
+
+# one parser issue, line_index is the index of the line in the data and
+# the message is template.format(*args)
+Diagnostic = collections.namedtuple('Diagnostic', ['section', 'kind', 'line_index', 'template', 'args'])
+
+
+class ParseDiagnostics(object):
+    def __init__(self, max_examples=MAX_EXAMPLES, escalate=False):
+        '''This data structure collects the issues found while parsing a case.
+
+        Args:
+            max_examples (int): the number of examples kept of each
+                (section, kind) of issue, all issues are counted
+            escalate (bool): if True, the parser issues the collected
+                diagnostics as warnings when it completes, see warn
+        '''
+
+        self.max_examples = max_examples
+        self.escalate = escalate
+        self.issue_counts = collections.Counter()
+        self.examples = collections.OrderedDict()
+
+    def __len__(self):
+        return sum(self.issue_counts.values())
+
+    def __iter__(self):
+        '''iterates over the kept examples'''
+        for examples in self.examples.values():
+            for diagnostic in examples:
+                yield diagnostic
+
+    def add(self, section, kind, line_index, template, *args):
+        '''counts an issue and keeps it if it is one of the first examples of
+        its section and kind
+
+        Args:
+            section (str): the section of the data, e.g. 'bus'
+            kind (str): a short name of the issue, e.g. 'extra values'
+            line_index (int): the index of the line, None if it does not
+                apply
+            template (str): a format string of the message
+            args: the arguments of the format string
+        '''
+
+        key = (section, kind)
+        count = self.issue_counts[key]
+        self.issue_counts[key] = count + 1
+        if count < self.max_examples:
+            self.examples.setdefault(key, []).append(Diagnostic(section, kind, line_index, template, args))
+
+    def counts(self):
+        '''Returns: a Counter of the issues per (section, kind)'''
+        return collections.Counter(self.issue_counts)
+
+    def suppressed(self):
+        '''Returns: a dict of the number of issues per (section, kind) that
+        were counted but not kept'''
+        return collections.OrderedDict((key, self.issue_counts[key] - len(examples))
+            for key, examples in self.examples.items() if self.issue_counts[key] > len(examples))
+
+    def messages(self):
+        '''Returns: the messages of the kept examples, followed by a summary
+        of each kind of issue with suppressed examples'''
+        messages = [diagnostic_message(diagnostic) for diagnostic in self]
+        for (section, kind), count in self.suppressed().items():
+            messages.append(suppressed_message(section, kind, count))
+        return messages
+
+    def records(self):
+        '''Returns: a json compatible dict for each (section, kind) of issue'''
+        return [{
+            'section': section,
+            'kind': kind,
+            'count': self.issue_counts[(section, kind)],
+            'examples': [{'line_index': diagnostic.line_index, 'message': diagnostic_message(diagnostic)} for diagnostic in examples],
+        } for (section, kind), examples in self.examples.items()]
+
+    def warn(self):
+        '''issues a PSSEDataWarning for each message'''
+        for message in self.messages():
+            warnings.warn(message, PSSEDataWarning)
+
+
+def diagnostic_message(diagnostic):
+    '''Returns: the message of a Diagnostic'''
+    return diagnostic.template.format(*diagnostic.args)
+
+
+def suppressed_message(section, kind, count):
+    return '{} more issues of kind "{}" in the "{}" section were not reported'.format(count, kind, section)
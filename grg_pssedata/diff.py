@@ -0,0 +1,635 @@
+'''key-based comparison of pss/e cases
+
+Components of two cases are matched by their natural keys (e.g. the bus
+number of a bus or the from bus, to bus and circuit of a branch) using a
+hash join, so inserting or removing a component only reports that
+component.  Differences are produced as a stream of ComponentChange
+records.
+
+The records can be written as they are produced as a json array, as json
+lines (one object per change with the keys section, change, key and fields)
+or as csv (one row per changed field, see CSV_CHANGE_COLUMNS).
+summarize_changes only counts the changes per section and field.
+
+Float fields can be compared with a relative and absolute Tolerance.  In
+that case matched components are compared in chunks of DIFF_CHUNK_SIZE as
+columns (see :mod:`grg_pssedata.columnar`), using numpy when it is
+available.
+'''
+
+import collections
+import csv
+import json
+import math
+import multiprocessing
+import operator
+import re
+
+from grg_pssedata.columnar import encode_components
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+# a difference in one field of a matched component
+FieldChange = collections.namedtuple('FieldChange', ['field', 'value_1', 'value_2'])
+
+# a difference in one component, change is 'added', 'removed' or 'modified'
+ComponentChange = collections.namedtuple('ComponentChange', ['section', 'change', 'key', 'fields'])
+
+# the attribute paths that identify a component in each section, components
+# without a natural key are matched by their position
+SECTION_KEYS = {
+    'buses': ('i',),
+    'loads': ('i', 'id'),
+    'fixed_shunts': ('i', 'id'),
+    'generators': ('i', 'id'),
+    'branches': ('i', 'j', 'ckt'),
+    'transformers': ('p1.i', 'p1.j', 'p1.k', 'p1.ckt'),
+    'areas': ('i',),
+    'tt_dc_lines': ('params.name',),
+    'vsc_dc_lines': ('params.name',),
+    'transformer_corrections': ('i',),
+    'mt_dc_lines': ('params.name',),
+    'line_groupings': ('i', 'j', 'id'),
+    'zones': ('i',),
+    'transfers': ('arfrom', 'arto', 'trid'),
+    'owners': ('i',),
+    'facts': ('name',),
+    'switched_shunts': ('i',),
+    'gnes': ('index',),
+    'induction_machines': ('i', 'id'),
+}
+
+# the name of a single component of each section
+SECTION_COMPONENT_NAMES = {
+    'buses': 'bus',
+    'loads': 'load',
+    'fixed_shunts': 'fixed shunt',
+    'generators': 'generator',
+    'branches': 'branch',
+    'transformers': 'transformer',
+    'areas': 'area',
+    'tt_dc_lines': 'two terminal dc line',
+    'vsc_dc_lines': 'vsc dc line',
+    'transformer_corrections': 'transformer correction',
+    'mt_dc_lines': 'multi terminal dc line',
+    'line_groupings': 'line group',
+    'zones': 'zone',
+    'transfers': 'inter-area transfer',
+    'owners': 'owner',
+    'facts': 'facts device',
+    'switched_shunts': 'switched shunt',
+    'gnes': 'generic network element',
+    'induction_machines': 'induction machine',
+}
+
+CASE_HEADER_SECTION = 'case'
+
+# the columns of the csv change format, one row per changed field
+CSV_CHANGE_COLUMNS = ['section', 'change', 'key', 'field', 'value_1', 'value_2']
+
+# the columns of the csv summary format
+CSV_SUMMARY_COLUMNS = ['section', 'change', 'field', 'count']
+
+# the number of matched components compared together when a tolerance is used
+DIFF_CHUNK_SIZE = 4096
+
+_case_header_fields = ['ic', 'sbase', 'rev', 'xfrrat', 'nxfrat', 'basfrq', 'record1', 'record2']
+_numeric_types = frozenset([int, float])
+_list_position = re.compile(r'\[\d+\]')
+
+
+class Tolerance(object):
+    def __init__(self, rtol=0.0, atol=0.0, fields=None):
+        '''This data structure describes when two float values are considered
+        equal, i.e. when abs(a-b) <= max(rtol*max(abs(a), abs(b)), atol) as in
+        math.isclose.  Fields that are not floats are compared exactly.
+
+        Args:
+            rtol (float): the default relative tolerance
+            atol (float): the default absolute tolerance
+            fields (dict): tolerance overrides, from a field path (e.g. 'vm')
+                or a section qualified field path (e.g. 'buses.vm') to a
+                (rtol, atol) pair.  List positions are omitted from paths,
+                e.g. 'converters.ib'.
+        '''
+
+        if rtol < 0 or atol < 0:
+            raise ValueError('tolerances must be non-negative')
+
+        self.rtol = rtol
+        self.atol = atol
+        self.fields = dict(fields) if fields is not None else {}
+
+    def field_tolerance(self, section, path):
+        '''Returns: the (rtol, atol) pair of a field of a section'''
+        path = _list_position.sub('', path)
+        tolerance = self.fields.get(section+'.'+path)
+        if tolerance is None:
+            tolerance = self.fields.get(path, (self.rtol, self.atol))
+        return tolerance
+
+    def values_differ(self, section, path, value_1, value_2):
+        '''Returns: True if two values of a field are not equal within the
+        tolerance of that field'''
+        if value_1 == value_2:
+            return False
+        if type(value_1) in _numeric_types and type(value_2) in _numeric_types and \
+                (type(value_1) is float or type(value_2) is float):
+            rtol, atol = self.field_tolerance(section, path)
+            return not math.isclose(value_1, value_2, rel_tol=rtol, abs_tol=atol)
+        return True
+
+
+def diff_cases(case_1, case_2, tolerance=None):
+    '''Compares two cases, component lists are compared section by section
+    in pss/e file order.
+
+    Args:
+        case_1 (Case): the first psse case
+        case_2 (Case): the second psse case
+        tolerance (Tolerance): if not None, float fields that are equal
+            within this tolerance are not reported
+    Returns:
+        an iterator over the ComponentChange records of the two cases
+    '''
+
+    header_changes = diff_case_headers(case_1, case_2, tolerance)
+    if header_changes is not None:
+        yield header_changes
+
+    for section, terminator in PSSE_SECTIONS:
+        for change in diff_components(getattr(case_1, section), getattr(case_2, section), section, tolerance=tolerance):
+            yield change
+
+
+# the number of pairs of files that a diff_case_files worker compares in
+# one task, without a base file the last file of a run is also the first
+# file of the next run and is parsed by both
+DIFF_RUN_PAIRS = 8
+
+
+def diff_case_files(file_names, base_file_name=None, workers=None, tolerance=None):
+    '''Compares a sequence of pss/e data files, each consecutive pair or each
+    file against a base file.  With a process pool, each task parses a run
+    of DIFF_RUN_PAIRS consecutive pairs of files in a worker and compares
+    them there, only the changes of the pairs travel between processes.
+    At most two runs per worker are in progress or waiting to be read, so
+    the parser does not run ahead of the consumer.
+
+    Args:
+        file_names (list): paths to psse data files
+        base_file_name (str): if given, each file is compared to this file
+            instead of to the preceding file
+        workers (int): if greater than one, the size of the process pool
+        tolerance (Tolerance): if not None, float fields that are equal
+            within this tolerance are not reported
+    Returns:
+        an iterator over (file_name_1, file_name_2, changes) triples, in the
+        order of the files, where changes is an iterator over the
+        ComponentChange records of the pair.  The changes of a pair are
+        read before the next pair.
+    '''
+
+    if base_file_name is not None:
+        pairs = [(base_file_name, file_name) for file_name in file_names]
+    else:
+        pairs = list(zip(file_names, file_names[1:]))
+
+    if workers is None or workers <= 1:
+        base_case = None
+        if base_file_name is not None:
+            base_case = parse_psse_case_file(base_file_name)
+        cases = map(parse_psse_case_file, file_names)
+        for (file_name_1, file_name_2), (case_1, case_2) in zip(pairs, _case_pairs(cases, base_case)):
+            yield file_name_1, file_name_2, diff_cases(case_1, case_2, tolerance)
+        return
+
+    if base_file_name is not None:
+        runs = [file_names[start:start+DIFF_RUN_PAIRS] for start in range(0, len(file_names), DIFF_RUN_PAIRS)]
+    else:
+        runs = [file_names[start:start+DIFF_RUN_PAIRS+1] for start in range(0, len(pairs), DIFF_RUN_PAIRS)]
+
+    pairs = iter(pairs)
+    pool = multiprocessing.Pool(workers, _init_diff_worker, (base_file_name, tolerance))
+    try:
+        tasks = collections.deque()
+        for run in runs:
+            tasks.append(pool.apply_async(_diff_run, (run,)))
+            while len(tasks) >= 2*workers:
+                for changes in tasks.popleft().get():
+                    yield next(pairs) + (iter(changes),)
+        while len(tasks) > 0:
+            for changes in tasks.popleft().get():
+                yield next(pairs) + (iter(changes),)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+# the base file, its case and the tolerance of a diff_case_files worker
+# process, the base file is parsed by the first task of the worker
+_worker_base_file_name = None
+_worker_base_case = None
+_worker_tolerance = None
+
+def _init_diff_worker(base_file_name, tolerance):
+    global _worker_base_file_name, _worker_base_case, _worker_tolerance
+    _worker_base_file_name = base_file_name
+    _worker_base_case = None
+    _worker_tolerance = tolerance
+
+
+def _case_pairs(cases, base_case):
+    '''pairs each case with the base case, or with the preceding case if
+    there is no base case'''
+    if base_case is not None:
+        for case in cases:
+            yield base_case, case
+        return
+
+    previous = None
+    for case in cases:
+        if previous is not None:
+            yield previous, case
+        previous = case
+
+
+def _diff_run(file_names):
+    '''Returns: the list of changes of each pair of a run of files'''
+    global _worker_base_case
+    if _worker_base_file_name is not None and _worker_base_case is None:
+        _worker_base_case = parse_psse_case_file(_worker_base_file_name)
+
+    cases = map(parse_psse_case_file, file_names)
+    return [list(diff_cases(case_1, case_2, _worker_tolerance)) for case_1, case_2 in _case_pairs(cases, _worker_base_case)]
+
+
+def diff_case_headers(case_1, case_2, tolerance=None):
+    '''Returns: a ComponentChange of the case header fields that differ, or
+    None if the headers are the same'''
+
+    fields = []
+    for name in _case_header_fields:
+        value_1 = getattr(case_1, name)
+        value_2 = getattr(case_2, name)
+        if tolerance is not None:
+            differ = tolerance.values_differ(CASE_HEADER_SECTION, name, value_1, value_2)
+        else:
+            differ = value_1 != value_2
+        if differ:
+            fields.append(FieldChange(name, value_1, value_2))
+
+    if len(fields) <= 0:
+        return None
+    return ComponentChange(CASE_HEADER_SECTION, 'modified', (), fields)
+
+
+def diff_components(components_1, components_2, section, key_fields=None, tolerance=None):
+    '''Compares two component lists by matching components with equal keys.
+    Each list is indexed once, so the comparison takes linear time.
+
+    Args:
+        components_1 (list): the first component list
+        components_2 (list): the second component list
+        section (str): the name of the section, e.g. 'buses'
+        key_fields (tuple): the attribute paths that identify a component,
+            SECTION_KEYS of the section by default
+        tolerance (Tolerance): if not None, float fields that are equal
+            within this tolerance are not reported
+    Returns:
+        an iterator over ComponentChange records, removed and modified
+        components in the order of the first list followed by added
+        components in the order of the second list
+    '''
+
+    key_function = component_key_function(section, key_fields)
+    index_2 = key_index(components_2, key_function)
+
+    matched_keys = set()
+    pending = []
+    for key, component_1 in keyed_components(components_1, key_function):
+        component_2 = index_2.get(key)
+        if component_2 is None:
+            if len(pending) > 0:
+                # keeps the changes in the order of the first list
+                pending.append((key, None, None))
+            else:
+                yield ComponentChange(section, 'removed', key, [])
+            continue
+
+        matched_keys.add(key)
+        if component_1.__dict__ == component_2.__dict__:
+            continue
+
+        if tolerance is None:
+            fields = field_changes(component_1, component_2)
+            if len(fields) > 0:
+                yield ComponentChange(section, 'modified', key, fields)
+            continue
+
+        pending.append((key, component_1, component_2))
+        if len(pending) >= DIFF_CHUNK_SIZE:
+            for change in tolerant_changes(section, pending, tolerance):
+                yield change
+            pending = []
+
+    for change in tolerant_changes(section, pending, tolerance):
+        yield change
+
+    if len(matched_keys) < len(index_2):
+        for key, component_2 in keyed_components(components_2, key_function):
+            if key not in matched_keys:
+                yield ComponentChange(section, 'added', key, [])
+
+
+def tolerant_changes(section, pending, tolerance):
+    '''Compares matched components field by field within a tolerance.
+    Components of a single shape are compared a column at a time.
+
+    Args:
+        section (str): the name of the section, e.g. 'buses'
+        pending (list): (key, component_1, component_2) triples, the
+            components are None for a key that is only in the first list
+        tolerance (Tolerance): the float tolerances
+    Returns:
+        an iterator over the ComponentChange records, in the order of pending
+    '''
+
+    if len(pending) <= 0:
+        return
+
+    matched = [(component_1, component_2) for key, component_1, component_2 in pending if component_1 is not None]
+    row_fields = _column_field_changes(section, matched, tolerance)
+    if row_fields is None:
+        row_fields = [field_changes(component_1, component_2, section, tolerance) for component_1, component_2 in matched]
+
+    row = 0
+    for key, component_1, component_2 in pending:
+        if component_1 is None:
+            yield ComponentChange(section, 'removed', key, [])
+            continue
+        fields = row_fields[row]
+        row += 1
+        if len(fields) > 0:
+            yield ComponentChange(section, 'modified', key, fields)
+
+
+def _column_field_changes(section, matched, tolerance):
+    '''Returns: the FieldChange lists of matched component pairs, or None if
+    the components do not share a flat shape'''
+
+    if len(matched) <= 0:
+        return []
+
+    encoding_1 = encode_components([component_1 for component_1, component_2 in matched])
+    encoding_2 = encode_components([component_2 for component_1, component_2 in matched])
+    if len(encoding_1.tables) != 1 or len(encoding_2.tables) != 1:
+        return None
+    table_1, table_2 = encoding_1.tables[0], encoding_2.tables[0]
+    if table_1.shape != table_2.shape or len(table_1.children) > 0:
+        return None
+
+    row_fields = [[] for component_pair in matched]
+    for column_1, column_2 in zip(table_1.columns, table_2.columns):
+        path = column_1.path
+        if path == 'index':
+            continue
+        values_1, values_2 = column_1.to_list(), column_2.to_list()
+        if column_1.kind == 'float' and column_2.kind == 'float':
+            rtol, atol = tolerance.field_tolerance(section, path)
+            rows = _close_mismatches(column_1, column_2, rtol, atol)
+        elif column_1.kind == column_2.kind and column_1.kind in ('int', 'str'):
+            rows = [row for row, (value_1, value_2) in enumerate(zip(values_1, values_2)) if value_1 != value_2]
+        else:
+            rows = [row for row, (value_1, value_2) in enumerate(zip(values_1, values_2))
+                if tolerance.values_differ(section, path, value_1, value_2)]
+        for row in rows:
+            row_fields[row].append(FieldChange(path, values_1[row], values_2[row]))
+    return row_fields
+
+
+def _close_mismatches(column_1, column_2, rtol, atol):
+    '''Returns: the rows of two float columns whose values are not close'''
+
+    if column_1.mask is not None or column_2.mask is not None:
+        values = zip(column_1.to_list(), column_2.to_list())
+        return [row for row, (value_1, value_2) in enumerate(values)
+            if value_1 != value_2 and (value_1 is None or value_2 is None or
+                not math.isclose(value_1, value_2, rel_tol=rtol, abs_tol=atol))]
+
+    try:
+        import numpy
+    except ImportError:
+        values = zip(column_1.values, column_2.values)
+        return [row for row, (value_1, value_2) in enumerate(values)
+            if value_1 != value_2 and not math.isclose(value_1, value_2, rel_tol=rtol, abs_tol=atol)]
+
+    values_1 = numpy.asarray(column_1.values, dtype=numpy.float64)
+    values_2 = numpy.asarray(column_2.values, dtype=numpy.float64)
+    with numpy.errstate(invalid='ignore'):
+        bound = numpy.maximum(rtol*numpy.maximum(numpy.abs(values_1), numpy.abs(values_2)), atol)
+        close = (values_1 == values_2) | (numpy.abs(values_1 - values_2) <= bound)
+    return numpy.flatnonzero(~close).tolist()
+
+
+def component_key_function(section, key_fields=None):
+    '''Returns: a function computing the key tuple of a component'''
+    if key_fields is None:
+        key_fields = SECTION_KEYS.get(section, ('index',))
+    if isinstance(key_fields, str):
+        key_fields = (key_fields,)
+
+    getter = operator.attrgetter(*key_fields)
+    if len(key_fields) == 1:
+        return lambda component: (getter(component),)
+    return getter
+
+
+def keyed_components(components, key_function):
+    '''Computes the keys of a list of components.  Repeated keys are made
+    unique by appending the number of prior occurrences.
+
+    Returns:
+        an iterator over (key, component) pairs
+    '''
+
+    occurrences = {}
+    for component in components:
+        key = key_function(component)
+        count = occurrences.get(key, 0)
+        occurrences[key] = count + 1
+        if count > 0:
+            key = key + (count,)
+        yield key, component
+
+
+def key_index(components, key_function):
+    '''Returns: a dict from the unique keys of the components to components'''
+    return dict(keyed_components(components, key_function))
+
+
+def component_fields(component, prefix=''):
+    '''Flattens the fields of a component, nested components are given
+    dotted paths (e.g. 'p1.i') and list items an index (e.g. 'converters[0].ib').
+    The position of a component in its list, its 'index' field, is omitted.
+
+    Returns:
+        a list of (path, value) pairs
+    '''
+
+    fields = []
+    for name, value in component.__dict__.items():
+        if name == 'index' and prefix == '':
+            continue
+        path = prefix+name
+        if isinstance(value, list):
+            for position, item in enumerate(value):
+                fields.extend(component_fields(item, '{}[{}].'.format(path, position)))
+            fields.append((path+'.count', len(value)))
+        elif hasattr(value, '__dict__'):
+            fields.extend(component_fields(value, path+'.'))
+        else:
+            fields.append((path, value))
+    return fields
+
+
+def field_changes(component_1, component_2, section=None, tolerance=None):
+    '''Returns: a list of FieldChange for the fields that differ between two
+    components, fields present in only one component have a value of None
+    in the other.  If a Tolerance is given, float fields of the section that
+    are equal within the tolerance are not reported.'''
+
+    fields_1 = component_fields(component_1)
+    fields_2 = dict(component_fields(component_2))
+
+    changes = []
+    for path, value_1 in fields_1:
+        value_2 = fields_2.pop(path, None)
+        if tolerance is not None:
+            differ = tolerance.values_differ(section, path, value_1, value_2)
+        else:
+            differ = value_1 != value_2
+        if differ:
+            changes.append(FieldChange(path, value_1, value_2))
+    for path, value_2 in fields_2.items():
+        changes.append(FieldChange(path, None, value_2))
+    return changes
+
+
+def format_key(key):
+    '''Returns: a readable form of a component key'''
+    if len(key) == 1:
+        return str(key[0])
+    return ' '.join([repr(value) if isinstance(value, str) else str(value) for value in key])
+
+
+def change_record(change):
+    '''Returns: a json compatible dict of a ComponentChange'''
+    return {
+        'section': change.section,
+        'change': change.change,
+        'key': list(change.key),
+        'fields': [{'field': field.field, 'value_1': field.value_1, 'value_2': field.value_2} for field in change.fields],
+    }
+
+
+def write_json_changes(changes, output):
+    '''Writes changes to a stream as a json array, one change at a time.
+
+    Args:
+        changes (iterable): ComponentChange records, e.g. from diff_cases
+        output: a writable text stream
+    Returns:
+        int: the number of changes written
+    '''
+
+    count = 0
+    output.write('[')
+    for change in changes:
+        if count > 0:
+            output.write(',')
+        output.write('\n')
+        output.write(json.dumps(change_record(change)))
+        count += 1
+    output.write('\n]\n')
+    return count
+
+
+def write_jsonl_changes(changes, output):
+    '''Writes changes to a stream as json lines, one object per change.
+
+    Args:
+        changes (iterable): ComponentChange records, e.g. from diff_cases
+        output: a writable text stream
+    Returns:
+        int: the number of changes written
+    '''
+
+    count = 0
+    for change in changes:
+        output.write(json.dumps(change_record(change)))
+        output.write('\n')
+        count += 1
+    return count
+
+
+def write_csv_changes(changes, output):
+    '''Writes changes to a stream as csv with the CSV_CHANGE_COLUMNS.  A
+    modified component has one row per changed field, added and removed
+    components a single row with empty field columns.
+
+    Args:
+        changes (iterable): ComponentChange records, e.g. from diff_cases
+        output: a writable text stream
+    Returns:
+        int: the number of changes written
+    '''
+
+    writer = csv.writer(output)
+    writer.writerow(CSV_CHANGE_COLUMNS)
+
+    count = 0
+    for change in changes:
+        key = format_key(change.key)
+        if len(change.fields) <= 0:
+            writer.writerow([change.section, change.change, key, '', '', ''])
+        for field in change.fields:
+            writer.writerow([change.section, change.change, key, field.field, field.value_1, field.value_2])
+        count += 1
+    return count
+
+
+def summarize_changes(changes):
+    '''Counts changes without retaining them.
+
+    Args:
+        changes (iterable): ComponentChange records, e.g. from diff_cases
+    Returns:
+        (Counter, Counter): the number of changes per (section, change) and
+        the number of modified components per (section, field)
+    '''
+
+    change_counts = collections.Counter()
+    field_counts = collections.Counter()
+    for change in changes:
+        change_counts[(change.section, change.change)] += 1
+        for field in change.fields:
+            field_counts[(change.section, field.field)] += 1
+    return change_counts, field_counts
+
+
+def summary_rows(change_counts, field_counts):
+    '''Returns: the rows of a change summary with the CSV_SUMMARY_COLUMNS,
+    sections in pss/e file order'''
+
+    order = {CASE_HEADER_SECTION: -1}
+    order.update((section, position) for position, (section, terminator) in enumerate(PSSE_SECTIONS))
+    sort_key = lambda item: (order.get(item[0][0], len(order)), item[0][1])
+
+    rows = []
+    for (section, change), count in sorted(change_counts.items(), key=sort_key):
+        rows.append([section, change, '', count])
+    for (section, field), count in sorted(field_counts.items(), key=sort_key):
+        rows.append([section, 'modified', field, count])
+    return rows
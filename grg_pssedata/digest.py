@@ -0,0 +1,207 @@
+'''content digests of pss/e data files
+
+Digests are computed in a single streaming pass over a file, without
+building a case.  Records are read as the parser reads them and comments
+are dropped, so two files whose sections have equal digests parse to equal
+component lists.  Lines are otherwise digested as they are written, which
+is much faster than tokenizing them; a difference in spacing alone only
+causes a section to be compared structurally.
+'''
+
+import hashlib
+import os
+
+from grg_pssedata.io import open_psse_file
+from grg_pssedata.io import parse_line
+from grg_pssedata.io import psse_record_terminus
+from grg_pssedata.io import psse_terminuses
+from grg_pssedata.struct import PSSE_SECTIONS
+
+# the name of the section of the first three lines of a file
+HEADER_SECTION = 'case'
+
+_block_size = 1 << 20
+_value_separator = b'\x1f'
+_line_separator = b'\x1e'
+
+
+def file_digest(psse_file_name):
+    '''Returns: the sha256 hex digest of the bytes of a file'''
+    digest = hashlib.sha256()
+    with open(psse_file_name, 'rb') as psse_file:
+        block = psse_file.read(_block_size)
+        while len(block) > 0:
+            digest.update(block)
+            block = psse_file.read(_block_size)
+    return digest.hexdigest()
+
+
+def files_identical(file_name_1, file_name_2):
+    '''Returns: True if two files have the same size and content digest'''
+    if os.path.getsize(file_name_1) != os.path.getsize(file_name_2):
+        return False
+    return file_digest(file_name_1) == file_digest(file_name_2)
+
+
+def line_content(line):
+    '''Returns: the content of a pss/e data line that determines how it is
+    parsed, i.e. the line without its comment'''
+    if '/' in line:
+        values = [value.strip() for value in parse_line(line)[0]]
+        return _value_separator.join(value.encode('utf-8') for value in values)
+    return line.strip().encode('utf-8')
+
+
+def first_value(line):
+    '''Returns: the first value of a pss/e data line, as split by parse_line'''
+    value = line.split(',', 1)[0]
+    if '/' in value:
+        return parse_line(line)[0][0].strip()
+    return value.strip()
+
+
+def section_digests(psse_file_name):
+    '''Computes a digest of the case header and of each section of a pss/e
+    data file, the file may be compressed.
+
+    Args:
+        psse_file_name (str): path to a psse data file
+    Returns:
+        a list of (section, hex digest) pairs, the header first followed by
+        PSSE_SECTIONS in file order, or None if the file does not contain
+        all of the sections
+    '''
+
+    with open_psse_file(psse_file_name, 'r') as psse_file:
+        return section_digests_lines(psse_file)
+
+
+def section_digests_lines(lines):
+    '''Computes the section digests of the lines of a pss/e data file, see
+    section_digests'''
+
+    digests = []
+    digest = hashlib.sha256()
+    try:
+        for position, (section, line) in enumerate(section_lines(lines)):
+            if line is None:
+                digests.append((section, digest.hexdigest()))
+                digest = hashlib.sha256()
+            elif position == 1 or position == 2:
+                # the case records are read as they are written
+                digest.update(line.strip('\n').encode('utf-8'))
+                digest.update(_line_separator)
+            else:
+                digest.update(line_content(line))
+                digest.update(_line_separator)
+    except EOFError:
+        return None
+    return digests
+
+
+def reduced_case_lines(psse_file_name, sections):
+    '''Reads the lines of a pss/e data file, keeping only the data of the
+    given sections.  Parsing the lines gives a case in which all other
+    component lists are empty.
+
+    Args:
+        psse_file_name (str): path to a psse data file
+        sections (set): the names of the sections to keep
+    Returns:
+        a list of lines
+    '''
+
+    reduced = []
+    with open_psse_file(psse_file_name, 'r') as psse_file:
+        for section, line in section_lines(psse_file):
+            if section == HEADER_SECTION:
+                if line is not None:
+                    reduced.append(line)
+            elif line is None:
+                reduced.append('0')
+            elif section in sections:
+                reduced.append(line)
+    reduced.append(psse_record_terminus)
+    return reduced
+
+
+def section_lines(lines):
+    '''Splits the lines of a pss/e data file into sections, reading records
+    as the parser does.  Lines after the last section are ignored.
+
+    Args:
+        lines (iterable): the lines of a psse data file
+    Returns:
+        an iterator over (section, line) pairs, line is None at the end of
+        each section
+    Raises:
+        EOFError: if the lines end before the last section
+    '''
+
+    for section, record in section_records(lines):
+        if record is None:
+            yield section, None
+        else:
+            for line in record:
+                yield section, line
+
+
+def section_records(lines):
+    '''Splits the lines of a pss/e data file into the records of each
+    section, as the parser reads them.  The three lines of the case header
+    are one record.  Lines after the last section are ignored.
+
+    Args:
+        lines (iterable): the lines of a psse data file
+    Returns:
+        an iterator over (section, record) pairs, record is a list of lines
+        or None at the end of each section
+    Raises:
+        EOFError: if the lines end before the last section
+    '''
+
+    lines = iter(lines)
+    yield HEADER_SECTION, [_next_line(lines) for index in range(0, 3)]
+    yield HEADER_SECTION, None
+
+    ended = False
+    for section, terminator in PSSE_SECTIONS:
+        while not ended:
+            line = _next_line(lines)
+            value = first_value(line)
+            if value in psse_terminuses:
+                ended = value == psse_record_terminus
+                break
+
+            count = record_line_count(section, line)
+            if count == 1:
+                yield section, [line]
+            else:
+                yield section, [line] + [_next_line(lines) for index in range(1, count)]
+        yield section, None
+
+
+def record_line_count(section, line):
+    '''Returns: the number of lines of a record given its first line, as
+    read by the parser'''
+
+    try:
+        if section == 'transformers':
+            # the bus numbers precede any quoted values
+            return 4 if int(line.split(',', 3)[2]) == 0 else 5
+        if section == 'tt_dc_lines' or section == 'vsc_dc_lines':
+            return 3
+        if section == 'mt_dc_lines':
+            values = parse_line(line)[0]
+            return 1 + int(values[1]) + int(values[2]) + int(values[3])
+    except (IndexError, ValueError):
+        # the parser reports the malformed line
+        return 1
+    return 1
+
+
+def _next_line(lines):
+    try:
+        return next(lines)
+    except StopIteration:
+        raise EOFError('the pss/e data ends before its last section')
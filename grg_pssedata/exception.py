@@ -18,6 +18,11 @@ class PSSEDataValidationError(PSSEDataException):
     pass
 
 
+class PSSEDataPatchError(PSSEDataException):
+    '''for errors that occur while attempting to read or apply a case patch'''
+    pass
+
+
 class PSSEDataWarning(Warning):
     '''root class for all PSSEData Warnings'''
     pass
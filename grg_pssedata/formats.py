@@ -0,0 +1,12 @@
+'''the names of the case file formats
+
+They are kept apart from the modules that read and write the formats, so
+that the command line can offer them without importing the parser.
+'''
+
+
+# the formats of grg_pssedata.convert
+CONVERT_FORMATS = ['raw', 'json', 'csv', 'npz', 'binary']
+
+# the extension of the output of each format, csv cases are directories
+CONVERT_EXTENSIONS = {'raw': '.raw', 'json': '.json', 'csv': '', 'npz': '.npz', 'binary': '.grgb'}
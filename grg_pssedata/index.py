@@ -0,0 +1,370 @@
+'''record offset indexes of pss/e data files
+
+An index maps the key of each component of a file (see
+:data:`grg_pssedata.diff.SECTION_KEYS`, e.g. the bus number or the
+``(i, j, ckt)`` of a branch) to the byte offset and number of lines of its
+record, so that a single component is read by seeking to its record and
+parsing only that record.  An index is built with one full parse of the
+file and is kept in a json sidecar file next to it (the file name with
+``.idx`` appended), e.g.
+
+    >>> lookup('case.raw', 'bus', 1001)
+    >>> lookup('case.raw', 'branch', (1001, 1002, '1'))
+
+The index records the size, modification time and sha256 digest of the
+file.  When the size or modification time of the file changes, its digest
+is compared and the index is rebuilt if the content changed.  String
+values of keys are matched without surrounding blanks and quotes.  Only
+uncompressed files can be indexed, the gne records that the parser skips
+are not indexed.
+'''
+
+import collections
+import json
+import locale
+import os
+
+from grg_pssedata.diagnostics import ParseDiagnostics
+from grg_pssedata.diff import SECTION_COMPONENT_NAMES
+from grg_pssedata.diff import component_key_function
+from grg_pssedata.diff import keyed_components
+from grg_pssedata.digest import HEADER_SECTION
+from grg_pssedata.digest import file_digest
+from grg_pssedata.digest import section_records
+from grg_pssedata.exception import PSSEDataParsingError
+from grg_pssedata.io import _compression_module
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import parse_psse_case_lines
+from grg_pssedata.io import psse_record_terminus
+from grg_pssedata.io import psse_table_terminus
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+
+# the sections that are indexed, the parser skips the gne records
+INDEXED_SECTIONS = [section for section, terminator in PSSE_SECTIONS if section != 'gnes']
+
+# the record of a component, offset is the byte offset of its first line,
+# lines its number of lines and index the index attribute of the component
+# (its position in the parsed section), None if it has none
+IndexEntry = collections.namedtuple('IndexEntry', ['offset', 'lines', 'index'])
+
+# the number of indexes that lookup keeps in memory
+INDEX_CACHE_SIZE = 8
+
+_index_cache = collections.OrderedDict()
+
+_section_names = dict((name, section) for section, name in SECTION_COMPONENT_NAMES.items())
+
+
+class RecordIndex(object):
+    def __init__(self, psse_file_name, size, mtime_ns, sha256, sections):
+        '''This data structure contains the record offsets of a pss/e data
+        file.
+
+        Args:
+            psse_file_name (str): path to the indexed psse data file
+            size (int): the size of the file in bytes when it was indexed
+            mtime_ns (int): the modification time of the file in ns
+            sha256 (str): the hex digest of the content of the file
+            sections (dict): for each section in INDEXED_SECTIONS, a dict
+                of the IndexEntry fields (a tuple) by normalized key
+        '''
+
+        self.psse_file_name = psse_file_name
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.sha256 = sha256
+        self.sections = sections
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.sections.values())
+
+    def is_current(self, check_hash=False):
+        '''Returns: True if the file has not changed since it was indexed.
+        The digest of the file is only computed if its size or modification
+        time changed, or if check_hash is True.  When only the modification
+        time changed, it is updated in the index.
+        '''
+
+        try:
+            status = os.stat(self.psse_file_name)
+        except OSError:
+            return False
+        if status.st_size != self.size:
+            return False
+        if status.st_mtime_ns == self.mtime_ns and not check_hash:
+            return True
+        if file_digest(self.psse_file_name) != self.sha256:
+            return False
+        self.mtime_ns = status.st_mtime_ns
+        return True
+
+    def entry(self, section, key):
+        '''Returns: the IndexEntry of the component of a section with the
+        given key, see lookup
+        '''
+
+        section = section_name(section)
+        entries = self.sections[section]
+        normalized = normalize_key(key)
+        if normalized not in entries:
+            raise KeyError('no {} with key {} in {}'.format(SECTION_COMPONENT_NAMES[section], key, self.psse_file_name))
+        return IndexEntry(*entries[normalized])
+
+    def lookup(self, section, key):
+        '''Reads the component of a section with the given key from the file,
+        parsing only its record.
+
+        Args:
+            section (str): a section, e.g. 'buses', or the name of one of its
+                components, e.g. 'bus'
+            key: the key of the component, a tuple of the SECTION_KEYS values
+                of the section, or a single value
+        Returns:
+            the component, equal to the one of the parsed file
+        Raises:
+            KeyError: if there is no such component
+        '''
+
+        section = section_name(section)
+        entry = self.entry(section, key)
+        with open(self.psse_file_name, 'rb') as psse_file:
+            header = [_decode(psse_file.readline()) for index in range(0, 3)]
+            psse_file.seek(entry.offset)
+            record = [_decode(psse_file.readline()) for index in range(0, entry.lines)]
+        return record_component(section, header, record, entry.index)
+
+    def records(self):
+        '''Returns: the json compatible dict of the index'''
+        return {
+            'version': INDEX_VERSION,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'sha256': self.sha256,
+            'sections': dict((section, [[list(key), offset, lines, index]
+                for key, (offset, lines, index) in entries.items()]) for section, entries in self.sections.items()),
+        }
+
+    def write(self, index_file_name=None):
+        '''writes the index to its sidecar file, or to the given path'''
+        if index_file_name is None:
+            index_file_name = self.psse_file_name + INDEX_SUFFIX
+        temporary_file_name = index_file_name + '.tmp'
+        with open(temporary_file_name, 'w') as index_file:
+            json.dump(self.records(), index_file)
+        os.replace(temporary_file_name, index_file_name)
+
+
+def section_name(section):
+    '''Returns: the section of a section or component name, e.g. 'buses'
+    for 'bus'
+    '''
+
+    section = _section_names.get(section, section)
+    if section not in INDEXED_SECTIONS:
+        raise KeyError('unknown section {}'.format(section))
+    return section
+
+
+def normalize_key(key):
+    '''Returns: a key tuple in which strings have no surrounding blanks and
+    quotes, a single value is a key of one value
+    '''
+
+    if not isinstance(key, (tuple, list)):
+        key = (key,)
+    return tuple(value.strip().strip('\'"').strip() if isinstance(value, str) else value for value in key)
+
+
+def _decode(line):
+    return line.decode(locale.getpreferredencoding(False)).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _offset_lines(psse_file, offsets):
+    # decodes the lines of a binary file, appending the offset of each line
+    offset = 0
+    for line in psse_file:
+        offsets.append(offset)
+        offset += len(line)
+        yield _decode(line)
+
+
+def build_index(psse_file_name):
+    '''Builds the record index of a pss/e data file, parsing it once.
+
+    Args:
+        psse_file_name (str): path to an uncompressed psse data file
+    Returns:
+        RecordIndex: the index of the file
+    Raises:
+        ValueError: if the file is compressed
+    '''
+
+    if _compression_module(psse_file_name, 'r') is not None:
+        raise ValueError('compressed file {} can not be indexed'.format(psse_file_name))
+
+    status = os.stat(psse_file_name)
+    case = parse_psse_case_file(psse_file_name, diagnostics=True)[0]
+
+    offsets = []
+    section_entries = collections.OrderedDict((section, []) for section in INDEXED_SECTIONS)
+    with open(psse_file_name, 'rb') as psse_file:
+        lines = _offset_lines(psse_file, offsets)
+        for section, record in section_records(lines):
+            if record is None or section == HEADER_SECTION or section not in section_entries:
+                continue
+            # the lines of the record are the last lines that were read
+            section_entries[section].append((offsets[len(offsets) - len(record)], len(record)))
+
+    sections = collections.OrderedDict()
+    for section, entries in section_entries.items():
+        components = getattr(case, section)
+        if len(components) != len(entries):
+            raise PSSEDataParsingError('{} {} records were found but {} were parsed'.format(len(entries), section, len(components)))
+        key_function = component_key_function(section)
+        sections[section] = dict((normalize_key(key), (offset, lines, getattr(component, 'index', None)))
+            for (key, component), (offset, lines) in zip(keyed_components(components, key_function), entries))
+
+    return RecordIndex(psse_file_name, status.st_size, status.st_mtime_ns, file_digest(psse_file_name), sections)
+
+
+def read_index(psse_file_name, index_file_name=None):
+    '''Reads the sidecar index of a pss/e data file, without checking that
+    it is current.
+
+    Args:
+        psse_file_name (str): path to the indexed psse data file
+        index_file_name (str): path to the index, the sidecar by default
+    Returns:
+        RecordIndex: the index, or None if there is no index of a known
+            version
+    '''
+
+    if index_file_name is None:
+        index_file_name = psse_file_name + INDEX_SUFFIX
+    try:
+        with open(index_file_name) as index_file:
+            records = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(records, dict) or records.get('version') != INDEX_VERSION:
+        return None
+
+    sections = collections.OrderedDict()
+    for section in INDEXED_SECTIONS:
+        sections[section] = dict((tuple(key), (offset, lines, index))
+            for key, offset, lines, index in records['sections'].get(section, []))
+    return RecordIndex(psse_file_name, records['size'], records['mtime_ns'], records['sha256'], sections)
+
+
+def open_index(psse_file_name, check_hash=False, write=True):
+    '''Returns the index of a pss/e data file, its sidecar index if that is
+    current and a new index otherwise.
+
+    Args:
+        psse_file_name (str): path to an uncompressed psse data file
+        check_hash (bool): if True, the digest of the file is always
+            compared with that of the index
+        write (bool): if True, a new index, or an index whose file
+            modification time changed, is written to the sidecar file.  An
+            index that can not be written is kept in memory only.
+    Returns:
+        RecordIndex: the index of the file
+    '''
+
+    index = read_index(psse_file_name)
+    if index is not None:
+        mtime_ns = index.mtime_ns
+        if not index.is_current(check_hash):
+            index = None
+        elif index.mtime_ns == mtime_ns:
+            return index
+
+    if index is None:
+        index = build_index(psse_file_name)
+    if write:
+        _write_index(index)
+    return index
+
+
+def _write_index(index):
+    # an index that can not be written is kept in memory only
+    try:
+        index.write()
+    except OSError:
+        pass
+
+
+def lookup(psse_file_name, section, key, check_hash=False):
+    '''Reads one component of a pss/e data file by its key, using the
+    sidecar index of the file, which is built if it is missing or stale.
+    The INDEX_CACHE_SIZE most recently used indexes are kept in memory and
+    are checked to be current on each lookup, as by open_index.
+
+    Args:
+        psse_file_name (str): path to an uncompressed psse data file
+        section (str): a section, e.g. 'buses', or the name of one of its
+            components, e.g. 'bus'
+        key: the key of the component, see RecordIndex.lookup
+        check_hash (bool): see open_index
+    Returns:
+        the component
+    Raises:
+        KeyError: if there is no such component
+    '''
+
+    cache_key = os.path.abspath(psse_file_name)
+    index = _index_cache.pop(cache_key, None)
+    if index is not None:
+        mtime_ns = index.mtime_ns
+        if not index.is_current(check_hash):
+            index = None
+        elif index.mtime_ns != mtime_ns:
+            # the content is unchanged, the sidecar gets the new modification time
+            _write_index(index)
+    if index is None:
+        index = open_index(psse_file_name, check_hash)
+    _index_cache[cache_key] = index
+    while len(_index_cache) > INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index.lookup(section, key)
+
+
+def record_component(section, header, record, index=None):
+    '''Parses one record of a section.
+
+    Args:
+        section (str): the section of the record
+        header (list): the three header lines of the file
+        record (list): the lines of the record
+        index (int): if not None, the index of the component
+    Returns:
+        the component of the record
+    '''
+
+    lines = list(header)
+    for name, terminator in PSSE_SECTIONS:
+        if name == section:
+            lines.extend(record)
+        lines.append(psse_table_terminus)
+    lines.append(psse_record_terminus)
+
+    # the issues of the record are those of the full parse of the file
+    case = parse_psse_case_lines(lines, ParseDiagnostics())
+    component = getattr(case, section)[0]
+    if index is not None:
+        component.index = index
+    return component
@@ -0,0 +1,198 @@
+'''instrumentation of the pss/e parser
+
+The parser reports a :class:`ParseEvent` for the case header, each section
+and the lines that follow the last section to an instrumentation object.
+The default instrumentation logs the events to the ``grg_pssedata.io``
+logger at the debug level, so it is silent unless logging is configured.
+:class:`ParseMetrics` aggregates the events of many parses per section.
+'''
+
+import collections
+import logging
+import time
+
+
+CASE_SECTION = 'case'
+UNPARSED_SECTION = 'unparsed'
+
+# the parsing of one section, bytes is the utf-8 size of its lines as read,
+# including the terminating line, and elapsed is in seconds
+ParseEvent = collections.namedtuple('ParseEvent', ['section', 'records', 'lines', 'bytes', 'elapsed'])
+
+logger = logging.getLogger('grg_pssedata.io')
+
+
+class ParseInstrumentation(object):
+    '''An instrumentation that ignores all events, subclasses override
+    event and enabled.
+    '''
+
+    @property
+    def enabled(self):
+        '''True if events should be measured and reported'''
+        return False
+
+    def event(self, event):
+        '''receives a ParseEvent'''
+        pass
+
+
+class LoggingInstrumentation(ParseInstrumentation):
+    def __init__(self, logger=logger, level=logging.DEBUG):
+        '''An instrumentation that logs each event as a message.
+
+        Args:
+            logger: a logging.Logger
+            level (int): the logging level of the messages
+        '''
+
+        self.logger = logger
+        self.level = level
+
+    @property
+    def enabled(self):
+        return self.logger.isEnabledFor(self.level)
+
+    def event(self, event):
+        self.logger.log(self.level, 'parsed %d %s records from %d lines (%d bytes) in %.6f seconds',
+            event.records, event.section, event.lines, event.bytes, event.elapsed,
+            extra={'parse_event': event._asdict()})
+
+
+class ParseMetrics(ParseInstrumentation):
+    def __init__(self):
+        '''An instrumentation that sums the events of any number of parses
+        per section.
+        '''
+
+        self.totals = collections.OrderedDict()
+        self.parses = 0
+
+    @property
+    def enabled(self):
+        return True
+
+    def event(self, event):
+        if event.section == CASE_SECTION:
+            self.parses += 1
+        total = self.totals.get(event.section)
+        if total is None:
+            self.totals[event.section] = event
+        else:
+            self.totals[event.section] = ParseEvent(event.section, total.records + event.records,
+                total.lines + event.lines, total.bytes + event.bytes, total.elapsed + event.elapsed)
+
+    def records(self):
+        '''Returns: a json compatible dict of the totals of each section'''
+        return [dict(total._asdict()) for total in self.totals.values()]
+
+
+class InstrumentationGroup(ParseInstrumentation):
+    def __init__(self, instrumentations):
+        '''An instrumentation that passes each event to the enabled members
+        of a list of instrumentations.
+        '''
+
+        self.instrumentations = instrumentations
+
+    @property
+    def enabled(self):
+        return any(instrumentation.enabled for instrumentation in self.instrumentations)
+
+    def event(self, event):
+        for instrumentation in self.instrumentations:
+            if instrumentation.enabled:
+                instrumentation.event(event)
+
+
+# the instrumentation of parses that do not specify one
+default_instrumentation = LoggingInstrumentation()
+
+
+class LineMeasure(object):
+    def __init__(self, lines, measure):
+        '''Sums a measure of consecutive runs of lines, e.g. their size.  The
+        lines of a StreamedLines are measured as they are read, as the lines
+        of a long section are no longer kept when it ends, and the time
+        spent measuring them is recorded (see take_seconds).
+
+        Args:
+            lines (list): the lines being parsed, or a StreamedLines that
+                was not read yet
+            measure (function): the measure of a line
+        '''
+
+        self.lines = lines
+        self.measure = measure
+        self.line_index = 0
+        self.seconds = 0.0
+        self.streamed = hasattr(lines, 'observe')
+        if self.streamed:
+            self.read_total = 0
+            self.total = 0
+            lines.observe(self._observe)
+
+    def _observe(self, line):
+        start = time.perf_counter()
+        self.read_total += self.measure(line)
+        self.seconds += time.perf_counter() - start
+
+    def take_seconds(self):
+        '''Returns: the time spent measuring lines as they were read since
+        the previous call'''
+        seconds = self.seconds
+        self.seconds = 0.0
+        return seconds
+
+    def sum(self, line_index):
+        '''Returns: the sum of the measure of the lines from the end of the
+        previous run to the given line index'''
+        if not self.streamed:
+            run = sum(self.measure(line) for line in self.lines[self.line_index:line_index])
+        else:
+            # the lines that were read ahead of the run are still kept
+            ahead = sum(self.measure(line) for line in self.lines[line_index:self.lines.lines_read])
+            total = self.read_total - ahead
+            run = total - self.total
+            self.total = total
+        self.line_index = line_index
+        return run
+
+
+def line_bytes(line):
+    '''Returns: the utf-8 size of a line'''
+    return len(line.encode('utf-8'))
+
+
+class ParseMeter(object):
+    def __init__(self, lines, instrumentation=None):
+        '''Measures the sections of a parse and reports them to an
+        instrumentation.  Nothing is measured when the instrumentation is
+        not enabled.
+
+        Args:
+            lines (list): the lines being parsed
+            instrumentation (ParseInstrumentation): default_instrumentation
+                if None
+        '''
+
+        if instrumentation is None:
+            instrumentation = default_instrumentation
+        self.instrumentation = instrumentation
+        self.enabled = instrumentation.enabled
+        self.line_index = 0
+        self.size = LineMeasure(lines, line_bytes) if self.enabled else None
+        self.time = time.perf_counter() if self.enabled else None
+
+    def section(self, section, records, line_index):
+        '''reports a section that ends before the given line index and
+        starts at the end of the previous section'''
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        size = self.size.sum(line_index)
+        elapsed = now - self.time - self.size.take_seconds()
+        self.instrumentation.event(ParseEvent(section, records, line_index - self.line_index, size, elapsed))
+        self.line_index = line_index
+        # the time of the instrumentation is not included in the next section
+        self.time = time.perf_counter()
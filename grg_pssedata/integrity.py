@@ -0,0 +1,256 @@
+'''referential integrity and duplicate key checks of pss/e cases
+
+The identifiers of the buses, areas, zones and owners of a case are
+collected in hash sets once, and each field that refers to one of them is
+then checked with a set lookup per component, so a case is checked in time
+linear in its number of components.  Duplicate component keys are found
+with a single dict of first positions per section.  The problems found are
+collected in an :class:`IntegrityReport`.
+'''
+
+import collections
+import warnings
+
+from grg_pssedata.diff import SECTION_COMPONENT_NAMES
+from grg_pssedata.diff import component_key_function
+from grg_pssedata.diff import format_key
+from grg_pssedata.exception import PSSEDataWarning
+from grg_pssedata.struct import PSSE_SECTIONS
+from grg_pssedata.validation import component_column
+
+
+MISSING = 'missing'
+DUPLICATE = 'duplicate'
+
+# a field of a section that refers to the identifiers of a target section,
+# when optional is True the value 0 refers to no component
+ForeignKey = collections.namedtuple('ForeignKey', ['section', 'path', 'name', 'target', 'optional'])
+
+# one integrity problem, position is the index of the component in its
+# section and key its identifier (see grg_pssedata.diff.SECTION_KEYS).
+# For a MISSING problem field and value are the referring field and its
+# value and target is the referred section.  For a DUPLICATE problem field
+# is None, value is the position of the first component with the same key
+# and target is the section itself.
+IntegrityIssue = collections.namedtuple('IntegrityIssue', ['problem', 'section', 'position', 'key', 'field', 'value', 'target'])
+
+
+def _owner_keys(section, prefix=''):
+    return [ForeignKey(section, '{}o{}'.format(prefix, number), 'owner {}'.format(number), 'owners', True)
+        for number in range(1, 5)]
+
+
+def _location_keys(section):
+    return [
+        ForeignKey(section, 'area', 'area', 'areas', False),
+        ForeignKey(section, 'zone', 'zone', 'zones', False),
+        ForeignKey(section, 'owner', 'owner', 'owners', False),
+    ]
+
+
+FOREIGN_KEYS = _location_keys('buses') + [
+    ForeignKey('loads', 'i', 'bus', 'buses', False),
+] + _location_keys('loads') + [
+    ForeignKey('fixed_shunts', 'i', 'bus', 'buses', False),
+
+    ForeignKey('generators', 'i', 'bus', 'buses', False),
+    ForeignKey('generators', 'ireg', 'regulated bus', 'buses', True),
+] + _owner_keys('generators') + [
+
+    ForeignKey('branches', 'i', 'bus i', 'buses', False),
+    ForeignKey('branches', 'j', 'bus j', 'buses', False),
+] + _owner_keys('branches') + [
+
+    ForeignKey('transformers', 'p1.i', 'bus i', 'buses', False),
+    ForeignKey('transformers', 'p1.j', 'bus j', 'buses', False),
+    ForeignKey('transformers', 'p1.k', 'bus k', 'buses', True),
+] + _owner_keys('transformers', 'p1.') + [
+
+    ForeignKey('facts', 'i', 'sending bus', 'buses', False),
+    ForeignKey('facts', 'j', 'terminal bus', 'buses', True),
+    ForeignKey('facts', 'owner', 'owner', 'owners', False),
+
+    ForeignKey('switched_shunts', 'i', 'bus', 'buses', False),
+    ForeignKey('switched_shunts', 'swrem', 'regulated bus', 'buses', True),
+
+    ForeignKey('induction_machines', 'i', 'bus', 'buses', False),
+] + _location_keys('induction_machines')
+
+# the sections whose components must have unique keys
+UNIQUE_SECTIONS = ['buses', 'loads', 'fixed_shunts', 'generators', 'branches',
+    'transformers', 'areas', 'zones', 'owners', 'facts', 'switched_shunts',
+    'induction_machines']
+
+
+class IntegrityReport(object):
+    def __init__(self, issues):
+        '''This data structure contains the integrity problems of a case.
+
+        Args:
+            issues (list of IntegrityIssue): the problems in section order
+        '''
+
+        self.issues = issues
+
+    def __len__(self):
+        return len(self.issues)
+
+    def __iter__(self):
+        return iter(self.issues)
+
+    @property
+    def valid(self):
+        '''True if there are no problems'''
+        return len(self.issues) <= 0
+
+    def missing(self):
+        '''Returns: the references to components that do not exist'''
+        return [issue for issue in self.issues if issue.problem == MISSING]
+
+    def duplicates(self):
+        '''Returns: the components whose keys are not unique'''
+        return [issue for issue in self.issues if issue.problem == DUPLICATE]
+
+    def counts(self):
+        '''Returns: a Counter of the problems per (problem, section, field)'''
+        return collections.Counter((issue.problem, issue.section, issue.field) for issue in self.issues)
+
+    def messages(self):
+        '''Returns: a readable message for each problem'''
+        return [issue_message(issue) for issue in self.issues]
+
+    def records(self):
+        '''Returns: a json compatible dict for each problem'''
+        return [{
+            'problem': issue.problem,
+            'section': issue.section,
+            'position': issue.position,
+            'key': list(issue.key),
+            'field': issue.field,
+            'value': issue.value,
+            'target': issue.target,
+            'message': issue_message(issue),
+        } for issue in self.issues]
+
+    def warn(self):
+        '''issues a PSSEDataWarning for each problem'''
+        for issue in self.issues:
+            warnings.warn(issue_message(issue), PSSEDataWarning)
+
+
+def issue_message(issue):
+    '''Returns: a readable description of an IntegrityIssue'''
+    component_type = SECTION_COMPONENT_NAMES.get(issue.section, issue.section)
+    component_id = format_key(issue.key)
+    if issue.problem == DUPLICATE:
+        return 'the {} {} at position {} has the same key as the {} at position {}'.format(
+            component_type, component_id, issue.position, component_type, issue.value)
+    target_type = SECTION_COMPONENT_NAMES.get(issue.target, issue.target)
+    return 'the {} value {} on {} {} refers to a {} that does not exist'.format(
+        issue.field, issue.value, component_type, component_id, target_type)
+
+
+def check_case(case, foreign_keys=None, unique_sections=None):
+    '''Checks the references between the components of a case and the
+    uniqueness of their keys.
+
+    The area, zone and owner data of a pss/e file is optional, references to
+    a section are only checked when the section is not empty.
+
+    Args:
+        case (Case): the case to check
+        foreign_keys (list): the references to check, FOREIGN_KEYS by default
+        unique_sections (list): the sections whose keys must be unique,
+            UNIQUE_SECTIONS by default
+    Returns:
+        IntegrityReport: the problems found
+    '''
+
+    if foreign_keys is None:
+        foreign_keys = FOREIGN_KEYS
+    if unique_sections is None:
+        unique_sections = UNIQUE_SECTIONS
+
+    # each set of identifiers is built once and shared by all references
+    identifiers = {}
+    for foreign_key in foreign_keys:
+        if foreign_key.target not in identifiers:
+            identifiers[foreign_key.target] = frozenset(component_column(getattr(case, foreign_key.target), 'i'))
+
+    section_keys = collections.defaultdict(list)
+    for foreign_key in foreign_keys:
+        section_keys[foreign_key.section].append(foreign_key)
+
+    issues = []
+    for section, terminator in PSSE_SECTIONS:
+        components = getattr(case, section)
+        if len(components) <= 0:
+            continue
+
+        if section in unique_sections:
+            issues.extend(duplicate_components(components, section))
+
+        rows = []
+        for foreign_key in section_keys[section]:
+            ids = identifiers[foreign_key.target]
+            if len(ids) <= 0:
+                continue
+            for row, value in missing_references(components, foreign_key, ids):
+                rows.append((row, foreign_key, value))
+        issues.extend(_missing_issues(components, section, rows))
+
+    return IntegrityReport(issues)
+
+
+def missing_references(components, foreign_key, ids):
+    '''Finds the values of a field that are not in a set of identifiers.
+
+    Args:
+        components (list): the components of the section of foreign_key
+        foreign_key (ForeignKey): the referring field
+        ids (set): the identifiers of the target section
+    Returns:
+        a list of (position, value) pairs
+    '''
+
+    values = component_column(components, foreign_key.path)
+    if foreign_key.optional:
+        ids = ids.union([0])
+    return [(row, value) for row, value in enumerate(values) if value not in ids]
+
+
+def duplicate_components(components, section, key_fields=None):
+    '''Finds the components of a section whose keys are not unique.
+
+    Args:
+        components (list): the components
+        section (str): the name of the section, e.g. 'branches'
+        key_fields (tuple): the key fields, SECTION_KEYS of the section by
+            default
+    Returns:
+        a list of DUPLICATE IntegrityIssue, one for each component after
+        the first with the same key
+    '''
+
+    key_function = component_key_function(section, key_fields)
+    first_positions = {}
+    issues = []
+    for row, component in enumerate(components):
+        key = key_function(component)
+        first_row = first_positions.setdefault(key, row)
+        if first_row != row:
+            issues.append(IntegrityIssue(DUPLICATE, section, row, key, None, first_row, section))
+    return issues
+
+
+def _missing_issues(components, section, rows):
+    # problems are reported in component order, then in foreign key order
+    rows.sort(key=lambda row: row[0])
+    key_function = component_key_function(section)
+    issues = []
+    key_row, key = None, None
+    for row, foreign_key, value in rows:
+        if row != key_row:
+            key_row, key = row, key_function(components[row])
+        issues.append(IntegrityIssue(MISSING, section, row, key, foreign_key.path, value, foreign_key.target))
+    return issues
@@ -1,10 +1,9 @@
 from __future__ import print_function
 
-import argparse
-import functools
+import importlib
+import itertools
 import re
 import warnings
-import sys
 import collections
 
 from grg_pssedata.struct import Bus
@@ -24,6 +23,7 @@ from grg_pssedata.struct import Zone
 from grg_pssedata.struct import Owner
 from grg_pssedata.struct import SwitchedShunt
 from grg_pssedata.struct import Case
+from grg_pssedata.struct import case_header_values
 from grg_pssedata.struct import TwoTerminalDCLine
 from grg_pssedata.struct import TwoTerminalDCLineParameters
 from grg_pssedata.struct import TwoTerminalDCLineRectifier
@@ -42,12 +42,20 @@ from grg_pssedata.struct import InterareaTransfer
 from grg_pssedata.struct import FACTSDevice
 from grg_pssedata.struct import InductionMachine
 
+from grg_pssedata.diagnostics import ParseDiagnostics
 from grg_pssedata.exception import PSSEDataParsingError
 from grg_pssedata.exception import PSSEDataWarning
+from grg_pssedata.instrumentation import CASE_SECTION
+from grg_pssedata.instrumentation import UNPARSED_SECTION
+from grg_pssedata.instrumentation import InstrumentationGroup
+from grg_pssedata.instrumentation import ParseMeter
+from grg_pssedata.instrumentation import default_instrumentation
 
 LineRequirements = collections.namedtuple('LineRequirements',['line_index','min_values','max_values','section'])
 
-print_err = functools.partial(print, file=sys.stderr)
+# the case header of a pss/e data file, as read by probe_psse_case_file.
+# section_lines is None or the number of data lines of each section.
+CaseHeader = collections.namedtuple('CaseHeader', ['ic', 'sbase', 'rev', 'xfrrat', 'nxfrat', 'basfrq', 'record1', 'record2', 'section_lines'])
 
 psse_table_terminus = '0'
 psse_record_terminus = 'Q'
@@ -64,47 +72,254 @@ def expand_commas(list):
     return expanded_list
 
 
-def parse_psse_case_file(psse_file_name):
-    '''opens the given path and parses it as pss/e data
+# the number of lines that StreamedLines keeps before the last line that
+# was read, the parser reads back at most one record (a multi-terminal dc
+# line has at most 53 lines)
+STREAMED_LINES_WINDOW = 4096
+
+
+class StreamedLines(object):
+    def __init__(self, lines, window=None):
+        '''A read only sequence of the lines of an iterator, e.g. a file,
+        that reads the lines as they are indexed and keeps only a window of
+        lines before the last one that was read, so that a file is parsed
+        without holding all of its text.
+
+        Args:
+            lines (iterator): the lines, they are read once
+            window (int): the number of lines kept before the last line
+                that was read, STREAMED_LINES_WINDOW by default
+        '''
+
+        self._iterator = iter(lines)
+        self._lines = []
+        self._start = 0
+        self._window = STREAMED_LINES_WINDOW if window is None else window
+        self._length = None
+        self._observers = []
+
+    @property
+    def lines_read(self):
+        '''the number of lines that were read'''
+        return self._start + len(self._lines)
+
+    def observe(self, observer):
+        '''registers a function that is called with each line as it is read'''
+        self._observers.append(observer)
+
+    def _read(self, index):
+        while self._length is None and index >= self._start + len(self._lines):
+            line = next(self._iterator, None)
+            if line is None:
+                self._length = self._start + len(self._lines)
+                break
+            self._lines.append(line)
+            for observer in self._observers:
+                observer(line)
+        if len(self._lines) > 2*self._window:
+            discarded = len(self._lines) - self._window
+            del self._lines[:discarded]
+            self._start += discarded
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.stop is None or index.stop < 0 or (index.start or 0) < 0:
+                index = slice(*index.indices(len(self)))
+            self._read(index.stop - 1)
+            stop = min(index.stop, self._start + len(self._lines))
+            return [self[position] for position in range(index.start or 0, stop, index.step or 1)]
+        if index < 0:
+            index += len(self)
+        self._read(index)
+        if index < self._start:
+            raise IndexError('line {} is no longer available, only {} lines are kept'.format(index, self._window))
+        if index >= self._start + len(self._lines):
+            raise IndexError('line index out of range')
+        return self._lines[index - self._start]
+
+    def __len__(self):
+        # the remaining lines are read, only the last window is kept
+        while self._length is None:
+            self._read(self._start + len(self._lines))
+        return self._length
+
+
+# compression modules by file extension and by leading bytes, they are
+# imported when a compressed file is opened
+compression_extensions = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma', '.lzma': 'lzma'}
+compression_signatures = [(b'\x1f\x8b', 'gzip'), (b'BZh', 'bz2'), (b'\xfd7zXZ\x00', 'lzma')]
+
+
+def _compression_module(psse_file_name, mode):
+    for extension, module_name in compression_extensions.items():
+        if psse_file_name.endswith(extension):
+            return importlib.import_module(module_name)
+
+    if 'r' in mode:
+        with open(psse_file_name, 'rb') as psse_file:
+            leading_bytes = psse_file.read(6)
+        for signature, module_name in compression_signatures:
+            if leading_bytes.startswith(signature):
+                return importlib.import_module(module_name)
+
+    return None
+
+
+def open_psse_file(psse_file_name, mode='r'):
+    '''opens the given path as a pss/e text file.  gzip, bz2 and xz
+    compressed files are recognized by their extension (or their leading
+    bytes when reading) and are (de)compressed incrementally as the file is
+    read or written.
 
     Args:
         psse_file_name(str): path to the a psse data file
+        mode(str): 'r' for reading, 'w' for writing
     Returns:
-        Case: a grg_pssedata case
+        a text file object
     '''
 
-    with open(psse_file_name, 'r') as psse_file:
-        lines = psse_file.readlines()
+    module = _compression_module(psse_file_name, mode)
+    if module is None:
+        return open(psse_file_name, mode)
+    return module.open(psse_file_name, mode+'t')
 
-    #try:
-    psse_data = parse_psse_case_lines(lines)
-    #except BaseException as e:
-    #    raise PSSEDataParsingError('{}'.format(str(e)))
 
+def parse_psse_case_file(psse_file_name, diagnostics=None, instrumentation=None, profile=False):
+    '''opens the given path and parses it as pss/e data, the file may be
+    gzip, bz2 or xz compressed
+
+    Args:
+        psse_file_name(str): path to the a psse data file
+        diagnostics(bool or ParseDiagnostics): if given, the parser issues
+            are collected instead of being issued as warnings, True uses a
+            new collector
+        instrumentation(ParseInstrumentation): receives a ParseEvent for
+            each section, see grg_pssedata.instrumentation
+        profile(bool): if True, the parse_stats attribute of the case is a
+            ParseStats profile of each section, see grg_pssedata.profiling
+    Returns:
+        Case: a grg_pssedata case, or a (Case, ParseDiagnostics) pair if
+            diagnostics are given
+
+    The lines of the file are read as they are parsed, a compressed file
+    is decompressed incrementally and only a window of its lines is kept
+    in memory (see StreamedLines).  Instrumentation and profiling measure
+    the lines as they are read.
+    '''
+
+    if diagnostics is True:
+        diagnostics = ParseDiagnostics()
+    elif diagnostics is False:
+        diagnostics = None
+
+    with open_psse_file(psse_file_name, 'r') as psse_file:
+        lines = StreamedLines(psse_file)
+
+        #try:
+        psse_data = parse_psse_case_lines(lines, diagnostics, instrumentation, profile)
+        #except BaseException as e:
+        #    raise PSSEDataParsingError('{}'.format(str(e)))
+
+    if diagnostics is not None:
+        return psse_data, diagnostics
     return psse_data
 
 
-def parse_psse_case_str(psse_string):
+def parse_psse_case_str(psse_string, diagnostics=None, instrumentation=None, profile=False):
     '''parses a given string as matpower data
 
     Args:
         mpString(str): a matpower data file as a string
+        diagnostics(bool or ParseDiagnostics): see parse_psse_case_file
+        instrumentation(ParseInstrumentation): see parse_psse_case_file
+        profile(bool): see parse_psse_case_file
     Returns:
-        Case: a grg_pssedata case
+        Case: a grg_pssedata case, or a (Case, ParseDiagnostics) pair if
+            diagnostics are given
     '''
 
     lines = psse_string.split('\n')
 
+    if diagnostics is True:
+        diagnostics = ParseDiagnostics()
+    elif diagnostics is False:
+        diagnostics = None
+
     #try:
-    psse_data = parse_psse_case_lines(lines)
+    psse_data = parse_psse_case_lines(lines, diagnostics, instrumentation, profile)
     #except BaseException as e:
     #    raise PSSEDataParsingError('{}'.format(str(e)))
 
+    if diagnostics is not None:
+        return psse_data, diagnostics
     return psse_data
 
 
 
-def parse_line(line, line_reqs=None):
+def write_psse_case_file(case, psse_file_name):
+    '''writes the given case to a path as pss/e data, one line at a time.
+    The file is compressed when the path ends with .gz, .bz2 or .xz.
+
+    Args:
+        case(Case): a grg_pssedata case
+        psse_file_name(str): path to the psse data file to write
+    '''
+
+    with open_psse_file(psse_file_name, 'w') as psse_file:
+        separator = ''
+        for line in case.psse_lines():
+            psse_file.write(separator)
+            psse_file.write(line)
+            separator = '\n'
+
+
+def probe_psse_case_file(psse_file_name, section_lines=False):
+    '''reads the case header of a pss/e data file without parsing its
+    components.  Only the first lines of the file are read, unless the
+    lines of each section are counted, which reads the file once with the
+    terminator scan of grg_pssedata.digest and tokenizes no records.
+
+    Args:
+        psse_file_name(str): path to the a psse data file, it may be gzip,
+            bz2 or xz compressed
+        section_lines(bool): if True, the number of data lines of each
+            section (without its terminator) are counted
+    Returns:
+        CaseHeader: the values of the first three lines of the file, with
+            the parser defaults for blank values
+    Raises:
+        PSSEDataParsingError: if the header is invalid, or if the lines
+            are counted and the file ends before its last section
+    '''
+
+    with open_psse_file(psse_file_name, 'r') as psse_file:
+        lines = [psse_file.readline() for index in range(0, 3)]
+        if len(lines[-1]) <= 0:
+            count = sum(1 for line in lines if len(line) > 0)
+            raise PSSEDataParsingError('psse case has {} lines and at least 3 are required'.format(count))
+
+        counts = None
+        if section_lines:
+            from grg_pssedata.digest import HEADER_SECTION
+            from grg_pssedata.digest import section_lines as split_sections
+            counts = collections.OrderedDict()
+            try:
+                for section, line in split_sections(itertools.chain(lines, psse_file)):
+                    if section != HEADER_SECTION:
+                        counts[section] = counts.get(section, 0) + (line is not None)
+            except EOFError as error:
+                raise PSSEDataParsingError(str(error))
+
+    # the header is checked as the parser checks it, its issues are dropped
+    values = _parse_case_header(lines[0], ParseDiagnostics())
+    try:
+        values = case_header_values(*values)
+    except ValueError as error:
+        raise PSSEDataParsingError('invalid psse case header: {}'.format(error))
+    return CaseHeader(*(values + [lines[1].strip('\n'), lines[2].strip('\n'), counts]))
+
+
+def parse_line(line, line_reqs=None, diagnostics=None):
     line = line.strip()
     comment = None
 
@@ -120,18 +335,25 @@ def parse_line(line, line_reqs=None):
         if len(line_parts) < line_reqs.min_values:
             raise PSSEDataParsingError('on psse data line {} in the "{}" section, at least {} values were expected but only {} where found.\nparsed: {}'.format(line_reqs.line_index, line_reqs.section, line_reqs.min_values, len(line_parts), line_parts))
         if len(line_parts) > line_reqs.max_values:
-            warnings.warn('on psse data line {} in the "{}" section, at most {} values were expected but {} where found, extra values will be ignored.\nparsed: {}'.format(line_reqs.line_index, line_reqs.section, line_reqs.max_values, len(line_parts), line_parts), PSSEDataWarning)
+            template = 'on psse data line {} in the "{}" section, at most {} values were expected but {} where found, extra values will be ignored.\nparsed: {}'
+            if diagnostics is None:
+                warnings.warn(template.format(line_reqs.line_index, line_reqs.section, line_reqs.max_values, len(line_parts), line_parts), PSSEDataWarning)
+            else:
+                diagnostics.add(line_reqs.section, 'extra values', line_reqs.line_index, template,
+                    line_reqs.line_index, line_reqs.section, line_reqs.max_values, len(line_parts), line_parts)
             line_parts = line_parts[:line_reqs.max_values]
 
     return line_parts, comment
 
 
-def parse_psse_case_lines(lines):
-    if len(lines) < 3: # need at base values and record
-        raise PSSEDataParsingError('psse case has {} lines and at least 3 are required'.format(len(lines)))
+def _parse_case_header(line, diagnostics):
+    '''parses and checks the first line of a pss/e data file
 
-    (ic, sbase, rev, xfrrat, nxfrat, basefrq), comment = parse_line(lines[0], LineRequirements(0, 6, 6, "header"))
-    print_err('case data: {} {} {} {} {} {}'.format(ic, sbase, rev, xfrrat, nxfrat, basefrq))
+    Returns:
+        the ic, sbase, rev, xfrrat, nxfrat and basfrq values of the line
+    '''
+
+    (ic, sbase, rev, xfrrat, nxfrat, basefrq), comment = parse_line(line, LineRequirements(0, 6, 6, "header"), diagnostics)
 
     if len(ic.strip()) > 0 and not (ic.strip() == "0"): # note validity checks may fail on "change data"
         raise PSSEDataParsingError('ic value of {} given, only a value of 0 is supported'.format(ic))
@@ -141,15 +363,58 @@ def parse_psse_case_lines(lines):
         try:
             version_id = int(float(rev))
         except ValueError:
-             warnings.warn('assuming PSSE version 33, given version value "{}".'.format(rev.strip()), PSSEDataWarning)
+             diagnostics.add('header', 'version', 0, 'assuming PSSE version 33, given version value "{}".', rev.strip())
 
     if version_id != 33:
-        warnings.warn('PSSE version {} given but only version 33 is supported, parser may not function correctly.'.format(rev.strip()), PSSEDataWarning)
+        diagnostics.add('header', 'version', 0, 'PSSE version {} given but only version 33 is supported, parser may not function correctly.', rev.strip())
+
+    return [ic, sbase, rev, xfrrat, nxfrat, basefrq]
+
+
+def parse_psse_case_lines(lines, diagnostics=None, instrumentation=None, profile=False):
+    '''parses the lines of pss/e data
+
+    Args:
+        lines(list): the lines of a psse data file, or a StreamedLines
+        diagnostics(ParseDiagnostics): collects the issues found while
+            parsing.  By default the issues are collected and issued as
+            warnings when parsing completes, or stops on an error; when a
+            collector is given they are only issued if its escalate flag is
+            set.
+        instrumentation(ParseInstrumentation): receives a ParseEvent for
+            each section, see grg_pssedata.instrumentation
+        profile(bool): if True, the parse_stats attribute of the case is a
+            ParseStats profile of each section, see grg_pssedata.profiling
+    Returns:
+        Case: a grg_pssedata case
+    '''
+
+    if profile:
+        return _profile_psse_case_lines(lines, diagnostics, instrumentation)
+
+    escalate = diagnostics is None or diagnostics.escalate
+    if diagnostics is None:
+        diagnostics = ParseDiagnostics()
+
+    # the issues found before a parsing error are issued as well
+    try:
+        return _parse_psse_case_sections(lines, diagnostics, ParseMeter(lines, instrumentation))
+    finally:
+        if escalate:
+            diagnostics.warn()
+
+
+def _parse_psse_case_sections(lines, diagnostics, meter):
+    try:
+        lines[2] # need at base values and record
+    except IndexError:
+        raise PSSEDataParsingError('psse case has {} lines and at least 3 are required'.format(len(lines)))
+
+    ic, sbase, rev, xfrrat, nxfrat, basefrq = _parse_case_header(lines[0], diagnostics)
 
     record1 = lines[1].strip('\n')
     record2 = lines[2].strip('\n')
-    print_err('record 1: {}'.format(record1))
-    print_err('record 2: {}'.format(record2))
+    meter.section(CASE_SECTION, 1, 3)
 
     buses = []
     loads = []
@@ -174,66 +439,66 @@ def parse_psse_case_lines(lines):
 
     line_index = 3
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 9, 13, "bus"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 9, 13, "bus"), diagnostics)
         buses.append(Bus(*line_parts))
         line_index += 1
-    print_err('parsed {} buses'.format(len(buses)))
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('buses', len(buses), line_index)
 
     load_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 13, 14, "load"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 13, 14, "load"), diagnostics)
         loads.append(Load(line_index - load_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} loads'.format(len(loads)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('loads', len(loads), line_index)
 
     fixed_shunt_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 5, 5, "fixed shunt"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 5, 5, "fixed shunt"), diagnostics)
         fixed_shunts.append(FixedShunt(line_index - fixed_shunt_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} fixed shunts'.format(len(fixed_shunts)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('fixed_shunts', len(fixed_shunts), line_index)
 
     gen_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 20, 28, "generator"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 20, 28, "generator"), diagnostics)
         generators.append(Generator(line_index - gen_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} generators'.format(len(generators)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('generators', len(generators), line_index)
 
     branch_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         #line = shlex.split(lines[line_index].strip())
         #line = expand_commas(line)
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 18, 24, "branch"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 18, 24, "branch"), diagnostics)
         #print(line_parts)
         branches.append(Branch(line_index - branch_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} branches'.format(len(branches)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('branches', len(branches), line_index)
 
     transformer_index = 0
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 20, 21, "transformer"))
+        line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 20, 21, "transformer"), diagnostics)
         parameters_1 = TransformerParametersFirstLine(*line_parts_1)
         #print(parameters_1)
 
         if parameters_1.k == 0: # two winding case
-            line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 3, 3, "transformer"))
-            line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+1, 16, 17, "transformer"))
-            line_parts_4, comment_4 = parse_line(lines[line_index+3], LineRequirements(line_index+1, 2, 2, "transformer"))
+            line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 3, 3, "transformer"), diagnostics)
+            line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+1, 16, 17, "transformer"), diagnostics)
+            line_parts_4, comment_4 = parse_line(lines[line_index+3], LineRequirements(line_index+1, 2, 2, "transformer"), diagnostics)
 
             parameters_2 = TransformerParametersSecondLineShort(*line_parts_2)
             winding_1 = TransformerWinding(1, *line_parts_3)
@@ -243,10 +508,10 @@ def parse_psse_case_lines(lines):
 
             line_index += 4
         else: # three winding case
-            line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 11, 11, "transformer"))
-            line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+2, 17, 17, "transformer"))
-            line_parts_4, comment_4 = parse_line(lines[line_index+3], LineRequirements(line_index+3, 17, 17, "transformer"))
-            line_parts_5, comment_5 = parse_line(lines[line_index+4], LineRequirements(line_index+4, 17, 17, "transformer"))
+            line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 11, 11, "transformer"), diagnostics)
+            line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+2, 17, 17, "transformer"), diagnostics)
+            line_parts_4, comment_4 = parse_line(lines[line_index+3], LineRequirements(line_index+3, 17, 17, "transformer"), diagnostics)
+            line_parts_5, comment_5 = parse_line(lines[line_index+4], LineRequirements(line_index+4, 17, 17, "transformer"), diagnostics)
 
             parameters_2 = TransformerParametersSecondLine(*line_parts_2)
             winding_1 = TransformerWinding(1, *line_parts_3)
@@ -259,26 +524,26 @@ def parse_psse_case_lines(lines):
 
         transformers.append(t)
         transformer_index += 1
-    print_err('parsed {} transformers'.format(len(transformers)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('transformers', len(transformers), line_index)
 
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 1, 5, "areas"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 1, 5, "areas"), diagnostics)
         areas.append(Area(*line_parts))
         line_index += 1
-    print_err('parsed {} areas'.format(len(areas)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('areas', len(areas), line_index)
 
     #two terminal dc line data
     ttdc_index = 0
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 12, 12, "two terminal dc line"))
-        line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 17, 17, "two terminal dc line"))
-        line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+2, 17, 17, "two terminal dc line"))
+        line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 12, 12, "two terminal dc line"), diagnostics)
+        line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 17, 17, "two terminal dc line"), diagnostics)
+        line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+2, 17, 17, "two terminal dc line"), diagnostics)
 
         parameters = TwoTerminalDCLineParameters(*line_parts_1)
         rectifier = TwoTerminalDCLineRectifier(*line_parts_2)
@@ -288,17 +553,17 @@ def parse_psse_case_lines(lines):
 
         ttdc_index += 1
         line_index += 3
-    print_err('parsed {} two terminal dc lines'.format(len(tt_dc_lines)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('tt_dc_lines', len(tt_dc_lines), line_index)
 
     #vsc dc line data
     vscdc_index = 0
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 3, 11, "vsc dc line"))
-        line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 13, 15, "vsc dc line"))
-        line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+2, 13, 15, "vsc dc line"))
+        line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 3, 11, "vsc dc line"), diagnostics)
+        line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 13, 15, "vsc dc line"), diagnostics)
+        line_parts_3, comment_3 = parse_line(lines[line_index+2], LineRequirements(line_index+2, 13, 15, "vsc dc line"), diagnostics)
 
         parameters = VSCDCLineParameters(*line_parts_1)
         converter_1 = VSCDCLineConverter(*line_parts_2)
@@ -308,111 +573,111 @@ def parse_psse_case_lines(lines):
 
         line_index += 3
         vscdc_index += 1
-    print_err('parsed {} vsc dc lines'.format(len(vsc_dc_lines)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('vsc_dc_lines', len(vsc_dc_lines), line_index)
 
     #transformer impedence correction tables data
     trans_offset_index = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 1, 23, "transformer correction"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 1, 23, "transformer correction"), diagnostics)
         transformer_corrections.append(TransformerImpedanceCorrection(line_index - trans_offset_index, *line_parts))
         line_index += 1
-    print_err('parsed {} transformer corrections'.format(len(transformer_corrections)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('transformer_corrections', len(transformer_corrections), line_index)
 
     #multi-terminal dc line data
     mtdc_count = 0
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 8, 8, "multi-terminal dc line"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 8, 8, "multi-terminal dc line"), diagnostics)
         parameters = MultiTerminalDCLineParameters(*line_parts)
 
         nconv, ndcbs, ndcln = [], [], []
         for i in range(0, parameters.nconv):
-            line_parts, comment = parse_line(lines[line_index + i + 1], LineRequirements(line_index + i + 1, 16, 16, "multi-terminal dc line"))
+            line_parts, comment = parse_line(lines[line_index + i + 1], LineRequirements(line_index + i + 1, 16, 16, "multi-terminal dc line"), diagnostics)
             nconv.append(MultiTerminalDCLineConverter(*line_parts))
 
         for i in range(parameters.nconv, parameters.ndcbs+parameters.nconv):
-            line_parts, comment = parse_line(lines[line_index + i + 1], LineRequirements(line_index + i + 1, 8, 8, "multi-terminal dc line"))
+            line_parts, comment = parse_line(lines[line_index + i + 1], LineRequirements(line_index + i + 1, 8, 8, "multi-terminal dc line"), diagnostics)
             ndcbs.append(MultiTerminalDCLineDCBus(*line_parts))
 
         for i in range(parameters.nconv + parameters.ndcbs, parameters.ndcln+parameters.nconv+parameters.ndcbs):
-            line_parts, comment = parse_line(lines[line_index + i + 1], LineRequirements(line_index + i + 1, 6, 6, "multi-terminal dc line"))
+            line_parts, comment = parse_line(lines[line_index + i + 1], LineRequirements(line_index + i + 1, 6, 6, "multi-terminal dc line"), diagnostics)
             ndcln.append(MultiTerminalDCLineDCLink(*line_parts))
 
         mt_dc_lines.append(MultiTerminalDCLine(mtdc_count, parameters, nconv, ndcbs, ndcln))
         mtdc_count += 1
         line_index += 1 + parameters.nconv + parameters.ndcbs + parameters.ndcln
-    print_err('parsed {} multi-terminal dc lines'.format(len(mt_dc_lines)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('mt_dc_lines', len(mt_dc_lines), line_index)
 
     #multi-section line grouping data
     msline_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 5, 5, "multi-section line"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 5, 5, "multi-section line"), diagnostics)
         line_groupings.append(MultiSectionLineGrouping(line_index - msline_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} multi-section lines'.format(len(line_groupings)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('line_groupings', len(line_groupings), line_index)
 
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 2, 2, "zone"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 2, 2, "zone"), diagnostics)
         zones.append(Zone(*line_parts))
         line_index += 1
-    print_err('parsed {} zones'.format(len(zones)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('zones', len(zones), line_index)
 
     # inter area transfer data
     intarea_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 4, 4, "inter-area transfer"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 4, 4, "inter-area transfer"), diagnostics)
         transfers.append(InterareaTransfer(line_index - intarea_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} inter-area transfers'.format(len(transfers)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('transfers', len(transfers), line_index)
 
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 2, 2, "owner"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 2, 2, "owner"), diagnostics)
         owners.append(Owner(*line_parts))
         line_index += 1
-    print_err('parsed {} owners'.format(len(owners)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('owners', len(owners), line_index)
 
     # facts device data block
     facts_index = 0
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 19, 21, "facts device"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 19, 21, "facts device"), diagnostics)
         facts.append(FACTSDevice(facts_index, *line_parts))
         facts_index += 1
         line_index += 1
-    print_err('parsed {} facts devices'.format(len(facts)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('facts', len(facts), line_index)
 
     # switched shunt data block
     swithced_shunt_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 12, 26, "swticthed shunt"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 12, 26, "swticthed shunt"), diagnostics)
         switched_shunts.append(SwitchedShunt(line_index - swithced_shunt_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} switched shunts'.format(len(switched_shunts)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('switched_shunts', len(switched_shunts), line_index)
 
     # GNE device data
     gne_count = 0
@@ -420,28 +685,25 @@ def parse_psse_case_lines(lines):
         gne_count += 1
         line_index += 1
     if gne_count > 0:
-        warnings.warn('skipped {} lines of GNE data'.format(gne_count), PSSEDataWarning)
+        diagnostics.add('gne', 'skipped lines', None, 'skipped {} lines of GNE data', gne_count)
         #print_err('parsed {} generic network elements'.format(len(gnes)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('gnes', len(gnes), line_index)
 
     # induction machine data
     indm_index_offset = line_index
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
-        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 34, 34, "induction machine"))
+        line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 34, 34, "induction machine"), diagnostics)
         induction_machines.append(InductionMachine(line_index - indm_index_offset, *line_parts))
         line_index += 1
-    print_err('parsed {} induction machines'.format(len(induction_machines)))
 
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
+    meter.section('induction_machines', len(induction_machines), line_index)
 
-    print_err('un-parsed lines:')
-    while line_index < len(lines):
-        #print(parse_line(lines[line_index]))
-        print_err('  '+lines[line_index])
-        line_index += 1
+    meter.section(UNPARSED_SECTION, 0, len(lines))
 
     case = Case(ic, sbase, rev, xfrrat, nxfrat, basefrq, record1, record2,
         buses, loads, fixed_shunts, generators, branches, transformers, areas,
@@ -454,6 +716,27 @@ def parse_psse_case_lines(lines):
     return case
 
 
+def _profile_psse_case_lines(lines, diagnostics, instrumentation):
+    from grg_pssedata.profiling import ParseProfiler
+
+    if diagnostics is None:
+        # the issues are warned as they are without a profile
+        diagnostics = ParseDiagnostics(escalate=True)
+    profiler = ParseProfiler(lines, diagnostics)
+    if instrumentation is not None:
+        profiler_group = InstrumentationGroup([profiler, instrumentation])
+    else:
+        profiler_group = profiler
+
+    profiler.start()
+    try:
+        case = parse_psse_case_lines(lines, diagnostics, profiler_group)
+    finally:
+        parse_stats = profiler.stop()
+    case.parse_stats = parse_stats
+    return case
+
+
 def main(args):
     case = parse_psse_case_file(args.file)
     print(case)
@@ -461,6 +744,7 @@ def main(args):
 
 
 def build_cli_parser():
+    import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('file', help='the pss/e data file to operate on (.raw)')
 
@@ -0,0 +1,178 @@
+'''deep memory accounting of pss/e cases
+
+The memory of a case is measured by walking the objects that its sections
+refer to and adding up their ``sys.getsizeof``.  Each object is counted
+once, in the first section (in file order) that refers to it, so the
+sections add up to the size of the whole case.  The bytes of each section
+are split into object bytes (components, their attribute dicts, lists and
+numbers) and string bytes, and strings are split further into unique
+strings, which are referred to once in the case, and shared strings, which
+are referred to more than once, e.g. interned names and identifiers that
+the parser reuses.  The result is a :class:`MemoryReport`.
+'''
+
+import collections
+import sys
+
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+HEADER_SECTION = 'header'
+
+# the types of objects that do not refer to other objects, besides str
+LEAF_TYPES = frozenset([int, float, complex, bool, bytes])
+
+# the attributes of a case that are not part of its data
+IGNORED_ATTRIBUTES = ['component_lists', 'parse_stats']
+
+# the memory of one section in bytes, components is its number of
+# components, the sections of a report add up to the whole case
+SectionMemory = collections.namedtuple('SectionMemory', ['section', 'components', 'object_bytes', 'unique_string_bytes', 'shared_string_bytes', 'bytes'])
+
+MEMORY_COLUMNS = list(SectionMemory._fields)
+
+
+class MemoryReport(object):
+    def __init__(self, sections):
+        '''This data structure contains the memory footprint of a case.
+
+        Args:
+            sections (list of SectionMemory): the header and the sections,
+                in file order
+        '''
+
+        self.sections = sections
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def section(self, section):
+        '''Returns: the SectionMemory of a section'''
+        for memory in self.sections:
+            if memory.section == section:
+                return memory
+        raise KeyError(section)
+
+    def total(self):
+        '''Returns: the SectionMemory of the whole case'''
+        return SectionMemory('total', *[sum(getattr(memory, field) for memory in self.sections)
+            for field in MEMORY_COLUMNS[1:]])
+
+    def records(self):
+        '''Returns: a json compatible dict for each section and the total'''
+        return [dict(memory._asdict()) for memory in self.sections + [self.total()]]
+
+    def table(self):
+        '''Returns: the report as lines of a text table, with the bytes per
+        component of each section
+        '''
+
+        header = '{:<24} {:>10} {:>12} {:>12} {:>12} {:>12} {:>10}'.format(
+            'section', 'components', 'objects', 'unique str', 'shared str', 'bytes', 'per comp')
+        lines = [header, '-'*len(header)]
+        for memory in self.sections + [self.total()]:
+            per_component = '-' if memory.components <= 0 else '{:.0f}'.format(memory.bytes/memory.components)
+            lines.append('{:<24} {:>10} {:>12} {:>12} {:>12} {:>12} {:>10}'.format(memory.section,
+                memory.components, memory.object_bytes, memory.unique_string_bytes,
+                memory.shared_string_bytes, memory.bytes, per_component))
+        return lines
+
+
+def section_roots(case):
+    '''Returns: a list of (section, components, roots) in file order, the
+    roots of the header are the case attributes that are not sections
+    '''
+
+    section_names = [name for name, terminator in PSSE_SECTIONS]
+    header = [value for name, value in case.__dict__.items()
+        if name not in section_names and name not in IGNORED_ATTRIBUTES]
+    roots = [(HEADER_SECTION, 0, header)]
+    for name in section_names:
+        components = getattr(case, name)
+        roots.append((name, len(components), [components]))
+    return roots
+
+
+def memory_report(case):
+    '''Measures the deep size of each section of a case.  The objects are
+    walked once, the strings are classified as unique or shared when the
+    references to them have been counted.
+
+    Args:
+        case (Case): the case to measure
+    Returns:
+        MemoryReport: the memory of the header and the sections
+    '''
+
+    seen = set()
+    references = collections.Counter()
+    string_sections = {}
+    object_bytes = collections.Counter()
+
+    getsizeof = sys.getsizeof
+    for obj in [case, case.__dict__, case.component_lists]:
+        seen.add(id(obj))
+        object_bytes[HEADER_SECTION] += getsizeof(obj)
+
+    roots = section_roots(case)
+    for section, components, section_objects in roots:
+        size = 0
+        stack = list(section_objects)
+        while len(stack) > 0:
+            obj = stack.pop()
+            obj_type = type(obj)
+            if obj_type is str:
+                obj_id = id(obj)
+                references[obj_id] += 1
+                if obj_id not in string_sections:
+                    string_sections[obj_id] = (section, getsizeof(obj))
+                continue
+            obj_id = id(obj)
+            if obj_id in seen:
+                continue
+            seen.add(obj_id)
+            size += getsizeof(obj)
+            if obj_type in LEAF_TYPES or obj is None:
+                continue
+            if isinstance(obj, dict):
+                stack.extend(obj.values())
+                stack.extend(obj.keys())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+            else:
+                # the attribute names of components are part of their
+                # class, the attribute dicts are walked through their values
+                if hasattr(obj, '__dict__'):
+                    attributes = obj.__dict__
+                    seen.add(id(attributes))
+                    size += getsizeof(attributes)
+                    stack.extend(attributes.values())
+                for slot in getattr(obj_type, '__slots__', ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+        object_bytes[section] += size
+
+    unique_bytes = collections.Counter()
+    shared_bytes = collections.Counter()
+    for obj_id, (section, size) in string_sections.items():
+        if references[obj_id] > 1:
+            shared_bytes[section] += size
+        else:
+            unique_bytes[section] += size
+
+    sections = []
+    for section, components, section_objects in roots:
+        section_bytes = object_bytes[section] + unique_bytes[section] + shared_bytes[section]
+        sections.append(SectionMemory(section, components, object_bytes[section],
+            unique_bytes[section], shared_bytes[section], section_bytes))
+    return MemoryReport(sections)
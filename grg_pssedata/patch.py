@@ -0,0 +1,300 @@
+'''key-addressed patches between pss/e cases
+
+A patch is a text file of json lines.  The first line identifies the
+format, e.g. ``{"patch":"grg_pssedata","version":1}``, and every other line
+is one operation on a component list (section) of the base case:
+
+* ``{"op":"remove","section":"buses","key":[1001]}`` removes a component
+* ``{"op":"set","section":"buses","key":[1001],"fields":{"vm":1.02}}``
+  changes fields of a component, nested fields use the paths of
+  :func:`grg_pssedata.diff.component_fields`
+* ``{"op":"add","section":"buses","at":17,"component":...}`` inserts a
+  component at a position of the new list, the component is encoded as a
+  ``[class name, {attribute: value}]`` pair
+* ``{"op":"replace","section":"mt_dc_lines","key":["'DC1'"],"component":...}``
+  replaces a component whose lists of sub-components changed length
+* ``{"op":"order","section":"buses","keys":[[1002],[1001]]}`` gives the
+  order of the components that are in both cases, it is only written if
+  that order changed
+* ``{"op":"set","section":"case","key":[],"fields":{"sbase":100.0}}``
+  changes fields of the case header
+
+Components are addressed by the keys of :data:`grg_pssedata.diff.SECTION_KEYS`.
+Operations are applied section by section, removals, field changes and
+replacements first, followed by the order and the additions.
+'''
+
+import json
+
+import grg_pssedata.struct
+
+from grg_pssedata.diff import CASE_HEADER_SECTION
+from grg_pssedata.diff import component_key_function
+from grg_pssedata.diff import diff_case_headers
+from grg_pssedata.diff import diff_components
+from grg_pssedata.diff import keyed_components
+from grg_pssedata.exception import PSSEDataPatchError
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+PATCH_FORMAT = 'grg_pssedata'
+PATCH_VERSION = 1
+
+_separators = (',', ':')
+_section_names = frozenset(section for section, terminator in PSSE_SECTIONS)
+
+
+def case_delta(case_1, case_2):
+    '''Computes the patch operations that transform one case into another.
+
+    Args:
+        case_1 (Case): the base case
+        case_2 (Case): the new case
+    Returns:
+        an iterator over patch operations (json compatible dicts)
+    '''
+
+    header_changes = diff_case_headers(case_1, case_2)
+    if header_changes is not None:
+        yield _set_operation(header_changes)
+
+    for section, terminator in PSSE_SECTIONS:
+        for operation in section_delta(getattr(case_1, section), getattr(case_2, section), section):
+            yield operation
+
+
+def section_delta(components_1, components_2, section):
+    '''Computes the patch operations that transform one component list into
+    another.
+
+    Returns:
+        an iterator over patch operations (json compatible dicts)
+    '''
+
+    key_function = component_key_function(section)
+    index_2 = None
+    added = False
+    for change in diff_components(components_1, components_2, section):
+        if change.change == 'removed':
+            yield {'op': 'remove', 'section': section, 'key': list(change.key)}
+        elif change.change == 'modified':
+            if any(field.field.endswith('.count') for field in change.fields):
+                # a list of sub-components changed length
+                if index_2 is None:
+                    index_2 = dict(keyed_components(components_2, key_function))
+                component_2 = index_2[change.key]
+                yield {'op': 'replace', 'section': section, 'key': list(change.key), 'component': component_state(component_2)}
+            else:
+                yield _set_operation(change)
+        else:
+            added = True
+
+    keys_1 = set(key for key, component in keyed_components(components_1, key_function))
+    keys_2 = []
+    matched_keys = []
+    for key, component in keyed_components(components_2, key_function):
+        keys_2.append(key)
+        if key in keys_1:
+            matched_keys.append(key)
+
+    keys_2_set = set(keys_2)
+    kept_keys = [key for key, component in keyed_components(components_1, key_function) if key in keys_2_set]
+    if kept_keys != matched_keys:
+        yield {'op': 'order', 'section': section, 'keys': [list(key) for key in matched_keys]}
+
+    if added:
+        for position, (key, component) in enumerate(zip(keys_2, components_2)):
+            if key not in keys_1:
+                yield {'op': 'add', 'section': section, 'at': position, 'component': component_state(component)}
+
+
+def write_case_delta(case_1, case_2, output):
+    '''Writes the patch that transforms one case into another.
+
+    Args:
+        case_1 (Case): the base case
+        case_2 (Case): the new case
+        output: a writable text stream
+    Returns:
+        int: the number of operations written
+    '''
+
+    output.write(json.dumps({'patch': PATCH_FORMAT, 'version': PATCH_VERSION}, separators=_separators))
+    output.write('\n')
+
+    count = 0
+    for operation in case_delta(case_1, case_2):
+        output.write(json.dumps(operation, separators=_separators))
+        output.write('\n')
+        count += 1
+    return count
+
+
+def read_patch(lines):
+    '''Reads the operations of a patch.
+
+    Args:
+        lines (iterable): the lines of a patch, e.g. an open file
+    Returns:
+        an iterator over patch operations
+    '''
+
+    lines = iter(lines)
+    try:
+        header = json.loads(next(lines))
+    except (StopIteration, ValueError):
+        raise PSSEDataPatchError('the patch header is missing')
+
+    if not isinstance(header, dict) or header.get('patch') != PATCH_FORMAT:
+        raise PSSEDataPatchError('the patch header {} is not a {} patch'.format(header, PATCH_FORMAT))
+    if header.get('version') != PATCH_VERSION:
+        raise PSSEDataPatchError('patch version {} given but only version {} is supported'.format(header.get('version'), PATCH_VERSION))
+
+    for line in lines:
+        if len(line.strip()) > 0:
+            yield json.loads(line)
+
+
+def apply_patch(case, operations):
+    '''Applies patch operations to a case, the case is modified in place.
+
+    Args:
+        case (Case): the base case of the patch
+        operations (iterable): patch operations, e.g. from read_patch
+    Returns:
+        Case: the patched case
+    '''
+
+    section_operations = {}
+    for operation in operations:
+        section = operation.get('section')
+        if section == CASE_HEADER_SECTION:
+            for field, value in operation['fields'].items():
+                setattr(case, field, value)
+            continue
+        if section not in _section_names:
+            raise PSSEDataPatchError('unknown section {} in patch operation {}'.format(section, operation))
+        section_operations.setdefault(section, []).append(operation)
+
+    for section, operations in section_operations.items():
+        # the lists are updated in place, the case also refers to them
+        # through its component_lists
+        components = getattr(case, section)
+        components[:] = apply_section_patch(components, section, operations)
+
+    return case
+
+
+def apply_section_patch(components, section, operations):
+    '''Applies the patch operations of one section to a component list.
+
+    Returns:
+        list: the patched component list, components that are not changed
+        are shared with the given list
+    '''
+
+    key_function = component_key_function(section)
+    index = dict(keyed_components(components, key_function))
+
+    removed = set()
+    order = None
+    additions = []
+    for operation in operations:
+        op = operation['op']
+        if op == 'add':
+            additions.append((operation['at'], build_component(operation['component'])))
+            continue
+        if op == 'order':
+            order = [tuple(key) for key in operation['keys']]
+            continue
+
+        key = tuple(operation['key'])
+        if key not in index:
+            raise PSSEDataPatchError('{} component {} of patch operation {} is not in the base case'.format(section, key, op))
+        if op == 'remove':
+            removed.add(key)
+        elif op == 'set':
+            component = index[key]
+            for path, value in operation['fields'].items():
+                set_field(component, path, value)
+        elif op == 'replace':
+            index[key] = build_component(operation['component'])
+        else:
+            raise PSSEDataPatchError('unknown patch operation {}'.format(op))
+
+    reordered = order is not None
+    if not reordered:
+        order = [key for key, component in keyed_components(components, key_function) if key not in removed]
+    patched = [index[key] for key in order]
+
+    for position, component in sorted(additions, key=lambda addition: addition[0]):
+        patched.insert(position, component)
+
+    if reordered or len(removed) > 0 or len(additions) > 0:
+        _renumber(patched)
+
+    return patched
+
+
+def component_state(component):
+    '''Returns: a json compatible encoding of a component, i.e. a pair of
+    its class name and its attributes with nested components encoded'''
+    return [component.__class__.__name__, {name: _value_state(value) for name, value in component.__dict__.items()}]
+
+
+def build_component(state):
+    '''Returns: the component encoded by component_state'''
+    class_name, attributes = state
+    component_class = getattr(grg_pssedata.struct, class_name, None)
+    if not isinstance(component_class, type):
+        raise PSSEDataPatchError('unknown component class {}'.format(class_name))
+
+    # components are restored without their constructors, which would
+    # re-apply default values and string normalization
+    component = component_class.__new__(component_class)
+    component.__dict__.update((name, _build_value(value)) for name, value in attributes.items())
+    return component
+
+
+def set_field(component, path, value):
+    '''sets a field of a component given its path, e.g. 'p1.x12' or
+    'converters[0].ib' '''
+    parts = path.split('.')
+    for part in parts[:-1]:
+        component = _field_owner(component, part)
+    setattr(component, parts[-1], value)
+
+
+def _field_owner(component, part):
+    if part.endswith(']'):
+        name, position = part[:-1].split('[')
+        return getattr(component, name)[int(position)]
+    return getattr(component, part)
+
+
+def _set_operation(change):
+    return {'op': 'set', 'section': change.section, 'key': list(change.key),
+        'fields': {field.field: field.value_2 for field in change.fields}}
+
+
+def _value_state(value):
+    if isinstance(value, list):
+        return {'list': [component_state(item) for item in value]}
+    if hasattr(value, '__dict__'):
+        return {'component': component_state(value)}
+    return value
+
+
+def _build_value(value):
+    if isinstance(value, dict):
+        if 'list' in value:
+            return [build_component(item) for item in value['list']]
+        return build_component(value['component'])
+    return value
+
+
+def _renumber(components):
+    # the index of a component is its position in its list
+    for position, component in enumerate(components):
+        if 'index' in component.__dict__:
+            component.index = position
@@ -0,0 +1,144 @@
+'''per section profiles of the pss/e parser
+
+A :class:`ParseProfiler` receives the parse events of each section (see
+:mod:`grg_pssedata.instrumentation`) and adds the number of tokens of its
+lines, the number of parser issues and, with tracemalloc, the memory that
+remains allocated after the section.  The work of the profiler is not
+included in the section times, but tracing memory slows parsing down.
+'''
+
+import collections
+import tracemalloc
+
+from grg_pssedata.instrumentation import LineMeasure
+from grg_pssedata.instrumentation import ParseInstrumentation
+
+
+# the profile of one section, seconds is the wall time of its parsing and
+# memory the growth in bytes of the traced memory, None when not traced
+SectionStats = collections.namedtuple('SectionStats', ['section', 'seconds', 'lines', 'records', 'tokens', 'warnings', 'memory'])
+
+STATS_COLUMNS = list(SectionStats._fields)
+
+
+class ParseStats(object):
+    def __init__(self, sections):
+        '''This data structure contains the profile of a parse.
+
+        Args:
+            sections (list of SectionStats): the header, the sections and the
+                lines after the last section, in file order
+        '''
+
+        self.sections = sections
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def section(self, section):
+        '''Returns: the SectionStats of a section'''
+        for stats in self.sections:
+            if stats.section == section:
+                return stats
+        raise KeyError(section)
+
+    def total(self):
+        '''Returns: the SectionStats of the whole parse'''
+        memory = None
+        if all(stats.memory is not None for stats in self.sections):
+            memory = sum(stats.memory for stats in self.sections)
+        return SectionStats('total', *[sum(getattr(stats, field) for stats in self.sections)
+            for field in STATS_COLUMNS[1:-1]] + [memory])
+
+    def records(self):
+        '''Returns: a json compatible dict for each section and the total'''
+        return [dict(stats._asdict()) for stats in self.sections + [self.total()]]
+
+    def table(self):
+        '''Returns: the profile as lines of a text table'''
+        header = '{:<24} {:>10} {:>9} {:>9} {:>10} {:>8} {:>12}'.format(*STATS_COLUMNS)
+        lines = [header, '-'*len(header)]
+        for stats in self.sections + [self.total()]:
+            memory = '-' if stats.memory is None else stats.memory
+            lines.append('{:<24} {:>10.6f} {:>9} {:>9} {:>10} {:>8} {:>12}'.format(
+                stats.section, stats.seconds, stats.lines, stats.records, stats.tokens, stats.warnings, memory))
+        return lines
+
+
+class ParseProfiler(ParseInstrumentation):
+    def __init__(self, lines, diagnostics, trace_memory=True):
+        '''An instrumentation that profiles the sections of one parse.
+
+        Args:
+            lines (list): the lines being parsed
+            diagnostics (ParseDiagnostics): the issue collector of the parse
+            trace_memory (bool): if True, memory allocations are traced with
+                tracemalloc during the parse
+        '''
+
+        self.diagnostics = diagnostics
+        self.trace_memory = trace_memory
+        self.sections = []
+        self._line_index = 0
+        self._tokens = LineMeasure(lines, _line_tokens)
+        self._issues = 0
+        self._memory = None
+        self._stop_tracing = False
+
+    @property
+    def enabled(self):
+        return True
+
+    def start(self):
+        '''starts tracing memory, if it is traced'''
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._stop_tracing = True
+            self._memory = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        '''stops tracing memory
+
+        Returns:
+            ParseStats: the profile of the parse
+        '''
+
+        if self._stop_tracing:
+            tracemalloc.stop()
+            self._stop_tracing = False
+        return ParseStats(self.sections)
+
+    def event(self, event):
+        memory = None
+        if self._memory is not None:
+            current = tracemalloc.get_traced_memory()[0]
+            memory = current - self._memory
+
+        self._line_index += event.lines
+        tokens = self._tokens.sum(self._line_index)
+        elapsed = event.elapsed - self._tokens.take_seconds()
+
+        issues = len(self.diagnostics)
+        self.sections.append(SectionStats(event.section, elapsed, event.lines,
+            event.records, tokens, issues - self._issues, memory))
+        self._issues = issues
+
+        if self._memory is not None:
+            self._memory = tracemalloc.get_traced_memory()[0]
+
+
+def _line_tokens(line):
+    # the tokens are counted as parse_line splits the lines
+    from grg_pssedata.io import parse_line
+    return len(parse_line(line)[0])
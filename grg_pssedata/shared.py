@@ -0,0 +1,108 @@
+'''sharing read-only cases between processes, requires python 3.8 or newer
+
+A case is published once into a block of shared memory in the binary
+columnar format (see :mod:`grg_pssedata.binary`).  Worker processes attach
+to the block by name and read it in place, so the case is neither parsed
+nor unpickled by each worker and its data is not duplicated per process::
+
+    with SharedCase(case) as shared_case:
+        pool.map(job, [(shared_case.name, contingency) for contingency in contingencies])
+
+    def job(args):
+        name, contingency = args
+        with attach_shared_case(name) as case:
+            ...
+'''
+
+import sys
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    raise ImportError('grg_pssedata.shared requires python 3.8 or newer, which provides multiprocessing.shared_memory')
+
+from grg_pssedata.binary import BinaryCase
+from grg_pssedata.binary import binary_case_bytes
+
+
+class SharedCase(object):
+    def __init__(self, case, name=None):
+        '''Publishes a case in shared memory, the memory is released when
+        this object is closed.
+
+        Args:
+            case (Case): the case to publish
+            name (str): the name of the shared memory block, a unique name
+                is generated if None
+        '''
+
+        data = binary_case_bytes(case)
+        self.shared_memory = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        self.shared_memory.buf[:len(data)] = data
+        self.name = self.shared_memory.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''detaches from and removes the shared memory block'''
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+
+class AttachedCase(BinaryCase):
+    def __init__(self, name, verify=False):
+        '''This data structure is a read-only, zero-copy view of a case
+        published with SharedCase.  It provides the same attributes as a
+        Case, components are built from the shared data as they are
+        accessed.
+
+        Args:
+            name (str): the name of the shared memory block
+            verify (bool): if True, the checksums of all data blocks are checked
+        '''
+
+        self.shared_memory = _attach(name)
+        BinaryCase.__init__(self, self.shared_memory.buf, verify=verify)
+
+    def close(self):
+        '''detaches from the shared memory block, which stays available to
+        other processes'''
+        BinaryCase.close(self)
+        try:
+            self.shared_memory.close()
+        except BufferError:
+            # column views are still referenced, the memory is detached
+            # when they are released
+            pass
+
+
+def attach_shared_case(name, verify=False):
+    '''attaches to a case published with SharedCase
+
+    Args:
+        name (str): the name of the shared memory block
+        verify (bool): if True, the checksums of all data blocks are checked
+    Returns:
+        AttachedCase: a read-only view of the case
+    '''
+
+    return AttachedCase(name, verify=verify)
+
+
+def _attach(name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # before python 3.13 attaching registers the block with the resource
+    # tracker, which would remove it when the attaching process exits
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, 'shared_memory')
+    except (ImportError, AttributeError):
+        pass
+    return block
@@ -0,0 +1,222 @@
+'''summary statistics of pss/e data files
+
+Statistics are computed in a single streaming pass over a file, without
+building a case.  The records of each section are read as the parser reads
+them (see :func:`grg_pssedata.digest.section_records`) and counted, and
+only the bus, load and generator records are tokenized, for the number of
+buses by area and by type (ide) and the total load and generation of the
+components that are in service.  Many files are summarized on a process
+pool, an error in one file is reported in its statistics and does not
+stop the others.
+'''
+
+import collections
+import csv
+import json
+import multiprocessing
+
+from grg_pssedata.digest import HEADER_SECTION
+from grg_pssedata.digest import section_records
+from grg_pssedata.exception import PSSEDataParsingError
+from grg_pssedata.io import open_psse_file
+from grg_pssedata.io import parse_line
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+# the statistics of one file, records is the number of records of each
+# section in the file (including the gne records that the parser skips),
+# buses_by_area and buses_by_type count the buses of each area and ide.
+# The load and generation totals (MW and MVar) only include components
+# that are in service.  When the file could not be read, error is a
+# description of the problem and the other statistics are partial.
+CaseStats = collections.namedtuple('CaseStats', ['file', 'ic', 'sbase', 'rev',
+    'basfrq', 'records', 'buses_by_area', 'buses_by_type', 'load_p', 'load_q',
+    'generation_p', 'generation_q', 'error'])
+
+STATS_CSV_COLUMNS = ['file', 'statistic', 'key', 'value']
+
+# the positions of the fields of a record line that are summarized
+BUS_IDE, BUS_AREA = 3, 4
+LOAD_STATUS, LOAD_PL, LOAD_QL = 2, 5, 6
+GENERATOR_PG, GENERATOR_QG, GENERATOR_STAT = 2, 3, 14
+
+
+def _value(values, position, default, convert):
+    # blank and missing values take the defaults of the parser
+    if position >= len(values):
+        return default
+    value = values[position].strip()
+    if len(value) <= 0:
+        return default
+    return convert(value)
+
+
+def case_file_stats(psse_file_name):
+    '''Summarizes a pss/e data file, the file may be compressed.  Problems
+    with the file are reported in the error field of the result.
+
+    Args:
+        psse_file_name (str): path to a psse data file
+    Returns:
+        CaseStats: the statistics of the file
+    '''
+
+    try:
+        with open_psse_file(psse_file_name, 'r') as psse_file:
+            return case_stats_lines(psse_file, psse_file_name)
+    except (OSError, UnicodeDecodeError) as error:
+        return CaseStats(psse_file_name, None, None, None, None, collections.OrderedDict(),
+            {}, {}, 0.0, 0.0, 0.0, 0.0, str(error))
+
+
+def case_stats_lines(lines, file_name=None):
+    '''Summarizes the lines of a pss/e data file, see case_file_stats.
+
+    Args:
+        lines (iterable): the lines of a psse data file
+        file_name (str): the name of the file, as given in the result
+    Returns:
+        CaseStats: the statistics of the lines
+    '''
+
+    header = [None, None, None, None]
+    records = collections.OrderedDict((section, 0) for section, terminator in PSSE_SECTIONS)
+    buses_by_area = collections.Counter()
+    buses_by_type = collections.Counter()
+    totals = [0.0, 0.0, 0.0, 0.0]
+    error = None
+
+    try:
+        for section, record in section_records(lines):
+            if record is None:
+                continue
+            if section == HEADER_SECTION:
+                values = parse_line(record[0])[0]
+                header = [_value(values, 0, 0, int), _value(values, 1, 100.0, float),
+                    _value(values, 2, 33, int), _value(values, 5, 60.0, float)]
+                continue
+
+            records[section] += 1
+            if section == 'buses':
+                values = parse_line(record[0])[0]
+                buses_by_area[_value(values, BUS_AREA, 1, int)] += 1
+                buses_by_type[_value(values, BUS_IDE, 1, int)] += 1
+            elif section == 'loads':
+                values = parse_line(record[0])[0]
+                if _value(values, LOAD_STATUS, 1, int) != 0:
+                    totals[0] += _value(values, LOAD_PL, 0.0, float)
+                    totals[1] += _value(values, LOAD_QL, 0.0, float)
+            elif section == 'generators':
+                values = parse_line(record[0])[0]
+                if _value(values, GENERATOR_STAT, 1, int) != 0:
+                    totals[2] += _value(values, GENERATOR_PG, 0.0, float)
+                    totals[3] += _value(values, GENERATOR_QG, 0.0, float)
+    except (EOFError, ValueError, PSSEDataParsingError) as exception:
+        error = str(exception)
+
+    return CaseStats(file_name, header[0], header[1], header[2], header[3], records,
+        dict(buses_by_area), dict(buses_by_type), totals[0], totals[1], totals[2], totals[3], error)
+
+
+def case_files_stats(file_names, workers=None):
+    '''Summarizes many pss/e data files, see case_file_stats.
+
+    Args:
+        file_names (list): paths to psse data files
+        workers (int): if greater than one, the size of the process pool
+    Returns:
+        an iterator over the CaseStats of each file, in the order of the
+        files
+    '''
+
+    if workers is None or workers <= 1:
+        for file_name in file_names:
+            yield case_file_stats(file_name)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        for stats in pool.imap(case_file_stats, file_names):
+            yield stats
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def stats_record(stats):
+    '''Returns: a json compatible dict of a CaseStats'''
+    record = stats._asdict()
+    record['records'] = dict(stats.records)
+    record['buses_by_area'] = {str(area): count for area, count in sorted(stats.buses_by_area.items())}
+    record['buses_by_type'] = {str(ide): count for ide, count in sorted(stats.buses_by_type.items())}
+    return dict(record)
+
+
+def stats_rows(stats):
+    '''Returns: the rows of a CaseStats in the STATS_CSV_COLUMNS format'''
+    rows = []
+    for field in ['ic', 'sbase', 'rev', 'basfrq']:
+        rows.append([stats.file, 'header', field, getattr(stats, field)])
+    for section, count in stats.records.items():
+        rows.append([stats.file, 'records', section, count])
+    for area, count in sorted(stats.buses_by_area.items()):
+        rows.append([stats.file, 'buses_by_area', area, count])
+    for ide, count in sorted(stats.buses_by_type.items()):
+        rows.append([stats.file, 'buses_by_type', ide, count])
+    rows.append([stats.file, 'load', 'p', stats.load_p])
+    rows.append([stats.file, 'load', 'q', stats.load_q])
+    rows.append([stats.file, 'generation', 'p', stats.generation_p])
+    rows.append([stats.file, 'generation', 'q', stats.generation_q])
+    if stats.error is not None:
+        rows.append([stats.file, 'error', '', stats.error])
+    return rows
+
+
+def write_json_stats(case_stats, output):
+    '''writes CaseStats as a json array, one file at a time
+
+    Returns:
+        int: the number of files written
+    '''
+
+    count = 0
+    output.write('[')
+    for stats in case_stats:
+        output.write(',\n' if count > 0 else '\n')
+        output.write(json.dumps(stats_record(stats)))
+        count += 1
+    output.write('\n]\n')
+    return count
+
+
+def write_jsonl_stats(case_stats, output):
+    '''writes CaseStats as json lines, one per file
+
+    Returns:
+        int: the number of files written
+    '''
+
+    count = 0
+    for stats in case_stats:
+        output.write(json.dumps(stats_record(stats)))
+        output.write('\n')
+        output.flush()
+        count += 1
+    return count
+
+
+def write_csv_stats(case_stats, output):
+    '''writes CaseStats as csv in the STATS_CSV_COLUMNS format
+
+    Returns:
+        int: the number of files written
+    '''
+
+    count = 0
+    writer = csv.writer(output)
+    writer.writerow(STATS_CSV_COLUMNS)
+    for stats in case_stats:
+        writer.writerows(stats_rows(stats))
+        output.flush()
+        count += 1
+    return count
@@ -1,6 +1,9 @@
 '''data structures for encoding pss/e data files'''
 
 import os
+import warnings
+
+from grg_pssedata.exception import PSSEDataWarning
 
 def _guard_none(fun, val):
     '''guards the application of a unary function for values taking None
@@ -72,7 +75,121 @@ def _psse_str(s):
     #else:
     #    return str(s)
 
+# the component lists of a Case, in pss/e file order, with the line that
+# terminates each section in a pss/e file
+PSSE_SECTIONS = [
+    ('buses', '0 / END OF BUS DATA, BEGIN LOAD DATA'),
+    ('loads', '0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA'),
+    ('fixed_shunts', '0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA'),
+    ('generators', '0 / END OF GENERATOR DATA, BEGIN BRANCH DATA'),
+    ('branches', '0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA'),
+    ('transformers', '0 / END OF TRANSFORMER DATA, BEGIN AREA DATA'),
+    ('areas', '0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA'),
+    ('tt_dc_lines', '0 / END OF TWO-TERMINAL DC DATA, BEGIN VOLTAGE SOURCE CONVERTER DATA'),
+    ('vsc_dc_lines', '0 / END OF VOLTAGE SOURCE CONVERTER DATA, BEGIN IMPEDANCE CORRECTION DATA'),
+    ('transformer_corrections', '0 / END OF IMPEDANCE CORRECTION DATA, BEGIN MULTI-TERMINAL DC DATA'),
+    ('mt_dc_lines', '0 / END OF MULTI-TERMINAL DC DATA, BEGIN MULTI-SECTION LINE DATA'),
+    ('line_groupings', '0 / END OF MULTI-SECTION LINE DATA, BEGIN ZONE DATA'),
+    ('zones', '0 / END OF ZONE DATA, BEGIN INTER-AREA TRANSFER DATA'),
+    ('transfers', '0 / END OF INTER-AREA TRANSFER DATA, BEGIN OWNER DATA'),
+    ('owners', '0 / END OF OWNER DATA, BEGIN FACTS CONTROL DEVICE DATA'),
+    ('facts', '0 / END OF FACTS CONTROL DEVICE DATA, BEGIN SWITCHED SHUNT DATA'),
+    ('switched_shunts', '0 / END OF SWITCHED SHUNT DATA, BEGIN GNE DEVICE DATA'),
+    ('gnes', '0 / END OF GNE DEVICE DATA, BEGIN INDUCTION MACHINE DATA'),
+    ('induction_machines', '0 / END INDUCTION MACHINE DATA'),
+]
+
+# the smallest number of components sent to a worker by Case.to_psse
+PSSE_PARALLEL_CHUNK_SIZE = 2000
+
+
+def _format_components(components):
+    '''encodes a list of components as pss/e data lines'''
+    return ['  '+component.to_psse() for component in components]
+
+
+# the case being encoded by a Case.to_psse worker process
+_worker_case = None
+
+def _init_format_worker(case):
+    global _worker_case
+    _worker_case = case
+
+
+def _format_section_chunk(task):
+    name, start, stop = task
+    return _format_components(getattr(_worker_case, name)[start:stop])
+
+
+def _format_sections_parallel(case, workers):
+    '''encodes the sections of a case as lists of pss/e data lines, large
+    sections are split into chunks that are formatted on a process pool.
+
+    The case is handed to each worker once, when the pool starts (without
+    any copying on platforms that fork), so only the chunk boundaries and
+    the encoded lines travel between processes.
+
+    Args:
+        case (Case): the case to encode
+        workers (int): the number of worker processes
+    Returns:
+        a list of pss/e data lines for each section in PSSE_SECTIONS
+    '''
+
+    tasks = []
+    for name, terminator in PSSE_SECTIONS:
+        count = len(getattr(case, name))
+        if count > PSSE_PARALLEL_CHUNK_SIZE:
+            chunk_size = max(PSSE_PARALLEL_CHUNK_SIZE, -(-count // (4*workers)))
+            for start in range(0, count, chunk_size):
+                tasks.append((name, start, min(start+chunk_size, count)))
+
+    if len(tasks) <= 0:
+        return [_format_components(getattr(case, name))
+            for name, terminator in PSSE_SECTIONS]
+
+    import multiprocessing
+    pool = multiprocessing.Pool(workers, _init_format_worker, (case,))
+    try:
+        chunks = pool.map_async(_format_section_chunk, tasks)
+
+        section_lines = []
+        for name, terminator in PSSE_SECTIONS:
+            components = getattr(case, name)
+            if len(components) > PSSE_PARALLEL_CHUNK_SIZE:
+                section_lines.append([])
+            else:
+                section_lines.append(_format_components(components))
+
+        section_index = {name: i for i, (name, terminator) in enumerate(PSSE_SECTIONS)}
+        for (name, start, stop), lines in zip(tasks, chunks.get()):
+            section_lines[section_index[name]].extend(lines)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return section_lines
+
+
+# the attributes of a Case that are restored by its constructor
+_case_attributes = set(['ic', 'sbase', 'rev', 'xfrrat', 'nxfrat', 'basfrq',
+    'record1', 'record2', 'component_lists'] + [name for name, terminator in PSSE_SECTIONS])
+
+
+def _case_data(case):
+    return {key: value for key, value in case.__dict__.items() if key != 'parse_stats'}
+
+
 CASE_DEFAULTS = [0, 100.0, 33, 0, 0, 60]
+
+def case_header_values(ic, sbase, rev, xfrrat, nxfrat, basfrq):
+    '''Returns: the typed values of the case header fields, blank values
+    take their CASE_DEFAULTS and the version may be given as a float'''
+    args = [ic, sbase, rev, xfrrat, nxfrat, basfrq]
+    _set_defaults(args, CASE_DEFAULTS)
+    ic, sbase, rev, xfrrat, nxfrat, basfrq = args
+    return [int(ic), float(sbase), int(float(rev)), int(xfrrat), int(nxfrat), float(basfrq)]
+
 class Case(object):
     def __init__(self, ic, sbase, rev, xfrrat, nxfrat, basfrq, record1, record2,
         buses, loads, fixed_shunts, generators, branches, transformers, areas,
@@ -112,16 +229,14 @@ class Case(object):
             induction_machines (list of TBD): induction machines
         '''
 
-        args = [ic, sbase, rev, xfrrat, nxfrat, basfrq]
-        _set_defaults(args, CASE_DEFAULTS)
-        ic, sbase, rev, xfrrat, nxfrat, basfrq = args
+        ic, sbase, rev, xfrrat, nxfrat, basfrq = case_header_values(ic, sbase, rev, xfrrat, nxfrat, basfrq)
 
-        self.ic = int(ic)
-        self.sbase = float(sbase)
-        self.rev = int(rev)
-        self.xfrrat = int(xfrrat)
-        self.nxfrat = int(nxfrat)
-        self.basfrq = float(basfrq)
+        self.ic = ic
+        self.sbase = sbase
+        self.rev = rev
+        self.xfrrat = xfrrat
+        self.nxfrat = nxfrat
+        self.basfrq = basfrq
         self.record1 = str(record1)
         self.record2 = str(record2)
         self.buses = buses
@@ -234,8 +349,18 @@ class Case(object):
 
         return ''.join(tmp)
 
+    def __reduce__(self):
+        # cases are pickled as a packed encoding of their component lists
+        from grg_pssedata import columnar
+        header, sections = columnar.pack_case(self)
+        extras = {key: value for key, value in self.__dict__.items() if key not in _case_attributes}
+        return (columnar.unpack_case, (header, sections), extras or None)
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
+            # parse statistics describe how a case was read, not its data
+            if 'parse_stats' in self.__dict__ or 'parse_stats' in other.__dict__:
+                return _case_data(self) == _case_data(other)
             return self.__dict__ == other.__dict__
         return NotImplemented
 
@@ -244,118 +369,99 @@ class Case(object):
             return not self.__eq__(other)
         return NotImplemented
 
-    def validate(self):
+    def validate(self, workers=None, warn=True):
         '''Checks that this data structure conforms to the pss/e data
-        specification.
-        '''
-
-        if self.rev != 33:
-            warnings.warn('only version 33 is supported, given version {}'.format(self.rev),
-            PSSEDataWarning)
-
-        if len(self.record1) > 60:
-            warnings.warn('the first record has {} characters, only 60 are supported'.format(len(self.record1)),
-            PSSEDataWarning)
-
-        if len(self.record2) > 60:
-            warnings.warn('the first record has {} characters, only 60 are supported'.format(len(self.record2)),
-            PSSEDataWarning)
-
-        _check_boolean(self.ic, 'case type flag', 'case', '-')
-
-        for component_list in self.component_lists:
-            for component in component_list:
-                component.validate()
-
-    def to_psse(self):
-        '''Returns: a pss/e encoding of this data structure as a string'''
-
-        psse_lines = []
-        case_datra = [str(self.ic), str(self.sbase), str(self.rev),
-            str(self.xfrrat), str(self.nxfrat), str(self.basfrq)]
-        psse_lines.append(', '.join(case_datra))
-        psse_lines.append(self.record1)
-        psse_lines.append(self.record2)
+        specification, see :mod:`grg_pssedata.validation`.
 
-        for bus in self.buses:
-            psse_lines.append('  '+bus.to_psse())
-        psse_lines.append('0 / END OF BUS DATA, BEGIN LOAD DATA')
-
-        for load in self.loads:
-            psse_lines.append('  '+load.to_psse())
-        psse_lines.append('0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA')
+        Args:
+            workers (int): if greater than one, large sections are validated
+                on a process pool of this size
+            warn (bool): if True, a PSSEDataWarning is issued for each
+                violation
+        Returns:
+            ValidationReport: the violations of the specification
+        '''
 
-        for fixed_shunt in self.fixed_shunts:
-            psse_lines.append('  '+fixed_shunt.to_psse())
-        psse_lines.append('0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA')
+        from grg_pssedata import validation
+        report = validation.validate_case(self, workers=workers)
+        if warn:
+            report.warn()
+        return report
 
-        for gen in self.generators:
-            psse_lines.append('  '+gen.to_psse())
-        psse_lines.append('0 / END OF GENERATOR DATA, BEGIN BRANCH DATA')
+    def check_integrity(self, warn=False):
+        '''Checks that the components of this data structure refer to buses,
+        areas, zones and owners that exist and that their keys are unique,
+        see :mod:`grg_pssedata.integrity`.
 
-        for branch in self.branches:
-            psse_lines.append('  '+branch.to_psse())
-        psse_lines.append('0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA')
+        Args:
+            warn (bool): if True, a PSSEDataWarning is issued for each
+                problem
+        Returns:
+            IntegrityReport: the problems found
+        '''
 
-        for transformer in self.transformers:
-            psse_lines.append('  '+transformer.to_psse())
-        psse_lines.append('0 / END OF TRANSFORMER DATA, BEGIN AREA DATA')
+        from grg_pssedata import integrity
+        report = integrity.check_case(self)
+        if warn:
+            report.warn()
+        return report
 
-        for area in self.areas:
-            psse_lines.append('  '+area.to_psse())
-        psse_lines.append('0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA')
+    def memory_report(self):
+        '''Measures the deep size of this data structure by section, see
+        :mod:`grg_pssedata.memory`.
 
-        for tt_dc_line in self.tt_dc_lines:
-            psse_lines.append('  '+tt_dc_line.to_psse())
-        psse_lines.append('0 / END OF TWO-TERMINAL DC DATA, BEGIN VOLTAGE SOURCE CONVERTER DATA')
+        Returns:
+            MemoryReport: the object and string bytes of each section
+        '''
 
-        for vsc_dc_line in self.vsc_dc_lines:
-            psse_lines.append('  '+vsc_dc_line.to_psse())
-        psse_lines.append('0 / END OF VOLTAGE SOURCE CONVERTER DATA, BEGIN IMPEDANCE CORRECTION DATA')
+        from grg_pssedata import memory
+        return memory.memory_report(self)
 
-        for transformer_correction in self.transformer_corrections:
-            psse_lines.append('  '+transformer_correction.to_psse())
-        psse_lines.append('0 / END OF IMPEDANCE CORRECTION DATA, BEGIN MULTI-TERMINAL DC DATA')
+    def to_psse(self, workers=None):
+        '''Returns: a pss/e encoding of this data structure as a string
 
-        for mt_dc_line in self.mt_dc_lines:
-            psse_lines.append('  '+mt_dc_line.to_psse())
-        psse_lines.append('0 / END OF MULTI-TERMINAL DC DATA, BEGIN MULTI-SECTION LINE DATA')
+        Args:
+            workers (int): if greater than one, sections with more than
+                PSSE_PARALLEL_CHUNK_SIZE components are formatted in chunks
+                on a process pool of this size.  The output is identical to
+                the serial encoding.
+        '''
 
-        for line_grouping in self.line_groupings:
-            psse_lines.append('  '+line_grouping.to_psse())
-        psse_lines.append('0 / END OF MULTI-SECTION LINE DATA, BEGIN ZONE DATA')
+        psse_lines = self._psse_header_lines()
 
-        for zone in self.zones:
-            psse_lines.append('  '+zone.to_psse())
-        psse_lines.append('0 / END OF ZONE DATA, BEGIN INTER-AREA TRANSFER DATA')
+        if workers is not None and workers > 1:
+            section_lines = _format_sections_parallel(self, workers)
+        else:
+            section_lines = [_format_components(getattr(self, name))
+                for name, terminator in PSSE_SECTIONS]
 
-        for transfer in self.transfers:
-            psse_lines.append('  '+transfer.to_psse())
-        psse_lines.append('0 / END OF INTER-AREA TRANSFER DATA, BEGIN OWNER DATA')
+        for (name, terminator), lines in zip(PSSE_SECTIONS, section_lines):
+            psse_lines.extend(lines)
+            psse_lines.append(terminator)
 
-        for owner in self.owners:
-            psse_lines.append('  '+owner.to_psse())
-        psse_lines.append('0 / END OF OWNER DATA, BEGIN FACTS CONTROL DEVICE DATA')
+        psse_lines.append('Q')
 
-        for fact in self.facts:
-            psse_lines.append('  '+fact.to_psse())
-        psse_lines.append('0 / END OF FACTS CONTROL DEVICE DATA, BEGIN SWITCHED SHUNT DATA')
+        return '\n'.join(psse_lines)
 
-        for switched_shunt in self.switched_shunts:
-            psse_lines.append('  '+switched_shunt.to_psse())
-        psse_lines.append('0 / END OF SWITCHED SHUNT DATA, BEGIN GNE DEVICE DATA')
+    def psse_lines(self):
+        '''Returns: an iterator over the lines of the pss/e encoding of this
+        data structure, which is produced one component at a time
+        '''
 
-        for gne in self.gnes:
-            psse_lines.append('  '+gne.to_psse())
-        psse_lines.append('0 / END OF GNE DEVICE DATA, BEGIN INDUCTION MACHINE DATA')
+        for line in self._psse_header_lines():
+            yield line
 
-        for induction_machine in self.induction_machines:
-            psse_lines.append('  '+induction_machine.to_psse())
-        psse_lines.append('0 / END INDUCTION MACHINE DATA')
+        for name, terminator in PSSE_SECTIONS:
+            for component in getattr(self, name):
+                yield '  '+component.to_psse()
+            yield terminator
 
-        psse_lines.append('Q')
+        yield 'Q'
 
-        return '\n'.join(psse_lines)
+    def _psse_header_lines(self):
+        case_datra = [str(self.ic), str(self.sbase), str(self.rev),
+            str(self.xfrrat), str(self.nxfrat), str(self.basfrq)]
+        return [', '.join(case_datra), self.record1, self.record2]
 
 
 
@@ -1339,7 +1445,7 @@ class TransformerWinding(object):
         specification
         '''
         winding_id = '{} winding {}'.format(transformer_id, self.index)
-        _check_range(self.index, 'winding index', 'transformer', self.transformer_id, 1, 3)
+        _check_range(self.index, 'winding index', 'transformer', transformer_id, 1, 3)
         _check_range(self.ang, 'angle shift', 'transformer', winding_id, -180.0, 180.0)
         _check_range(self.cod, 'control mode', 'transformer', winding_id, -5, 5)
         _check_range(self.cont, 'bus identifier', 'transformer', winding_id, 1, 999997)
@@ -1395,7 +1501,7 @@ class TransformerWindingShort(object):
         specification
         '''
         winding_id = '{} winding {}'.format(transformer_id, self.index)
-        _check_range(self.index, 'winding index', 'transformer', self.transformer_id, 1, 3)
+        _check_range(self.index, 'winding index', 'transformer', transformer_id, 1, 3)
 
     def to_psse(self):
         '''Returns: a pss/e encoding of this data structure as a string'''
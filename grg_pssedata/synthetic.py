@@ -0,0 +1,367 @@
+'''synthetic pss/e cases for scale testing
+
+A synthetic case is built by tiling a base case, e.g. WECC240, any number
+of times.  The buses, areas and zones of each tile are renumbered and
+every reference to them is updated, the tiles are connected by tie
+branches, and sections that the base case does not have (e.g. dc lines or
+facts devices) are filled with one set of template components per tile.
+All random choices are made by a seeded generator, so a base case, a size
+and a seed always give the same case.
+'''
+
+import argparse
+import copy
+import pickle
+import random
+
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import parse_psse_case_str
+from grg_pssedata.io import write_psse_case_file
+from grg_pssedata.struct import Case
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+MAX_BUS_ID = 999997
+MAX_AREA_ID = 9999
+
+# the fields that refer to buses, areas and zones in each section
+BUS_FIELDS = {
+    'buses': ['i'],
+    'loads': ['i'],
+    'fixed_shunts': ['i'],
+    'generators': ['i', 'ireg'],
+    'branches': ['i', 'j'],
+    'transformers': ['p1.i', 'p1.j', 'p1.k', 'w1.cont', 'w2.cont', 'w3.cont'],
+    'areas': ['isw'],
+    'tt_dc_lines': ['rectifier.ipr', 'rectifier.icr', 'rectifier.ifr', 'rectifier.itr',
+        'inverter.ipi', 'inverter.ici', 'inverter.ifi', 'inverter.iti'],
+    'vsc_dc_lines': ['c1.ibus', 'c1.remot', 'c2.ibus', 'c2.remot'],
+    'mt_dc_lines': ['converters.ib', 'dc_buses.ib'],
+    'line_groupings': ['i', 'j'] + ['dum{}'.format(n) for n in range(1, 10)],
+    'facts': ['i', 'j', 'remot'],
+    'switched_shunts': ['i', 'swrem'],
+    'induction_machines': ['i'],
+}
+
+AREA_FIELDS = {
+    'buses': ['area'],
+    'loads': ['area'],
+    'areas': ['i'],
+    'mt_dc_lines': ['dc_buses.area'],
+    'transfers': ['arfrom', 'arto'],
+    'induction_machines': ['area'],
+}
+
+ZONE_FIELDS = {
+    'buses': ['zone'],
+    'loads': ['zone'],
+    'zones': ['i'],
+    'mt_dc_lines': ['dc_buses.zone'],
+    'induction_machines': ['zone'],
+}
+
+# the fields that must be unique names, at most 12 characters
+NAME_FIELDS = {
+    'tt_dc_lines': ['params.name'],
+    'vsc_dc_lines': ['params.name'],
+    'mt_dc_lines': ['params.name'],
+    'facts': ['name', 'mname'],
+}
+
+# the sections that are defined once and shared by all tiles
+SHARED_SECTIONS = ['transformer_corrections', 'owners']
+
+# the sections that are filled from TEMPLATE_DATA when the base case has none
+FILLED_SECTIONS = ['fixed_shunts', 'transformers', 'tt_dc_lines', 'vsc_dc_lines',
+    'transformer_corrections', 'mt_dc_lines', 'facts', 'switched_shunts']
+
+# template components on buses 1, 2 and 3, in area, zone and owner 1
+TEMPLATE_DATA = '''0, 100.00, 33, 0, 1, 60.00
+synthetic case template
+
+1,'TEMPLATE 1', 138.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9, 1.1, 0.9
+2,'TEMPLATE 2', 138.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9, 1.1, 0.9
+3,'TEMPLATE 3',  13.8, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9, 1.1, 0.9
+0 / END OF BUS DATA, BEGIN LOAD DATA
+0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA
+3,'S1', 1, 0.0, 10.0
+0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA
+0 / END OF GENERATOR DATA, BEGIN BRANCH DATA
+0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA
+1, 3, 0,'T1',1,1,1,0.0,0.0,2,'TEMPLATE T1',1, 1,1.0, 0,1.0, 0,1.0, 0,1.0,'            '
+  5.21000E-3,1.77370E-1, 100.00
+  1.025000, 138.000, 0.000, 84.00, 84.00, 84.00,0, 0,1.5,0.5,1.5,0.5,9999, 0, 0.0, 0.0, 0.0
+  1.000000, 13.800
+1, 2, 3,'T2',1,1,1,0.0,0.0,2,'TEMPLATE T2',1, 1,1.0, 0,1.0, 0,1.0, 0,1.0,'            '
+  1.06000E-3,3.60970E-2, 144.00,4.95400E-3,2.01040E-1, 100.00,4.35300E-3,2.38183E-1, 100.00,1.0, 0.0
+  1.0,138.000, 0.000, 336.00, 336.00, 0.00,0, 0,1.5,0.51,1.5,0.51, 33, 0, 0.0, 0.0, 0.0
+  1.0,138.000, 0.000, 268.00, 268.00, 0.00,0, 0,1.5,0.51,1.5,0.51, 33, 0, 0.0, 0.0, 0.0
+  1.0, 13.800, 0.000,  84.00,  84.00, 0.00,0, 0,1.5,0.51,1.5,0.51, 33, 0, 0.0, 0.0, 0.0
+0 / END OF TRANSFORMER DATA, BEGIN AREA DATA
+1, 1, 0.0, 10.0,'TEMPLATE'
+0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA
+'TTDC', 1, 0.1, -20.00, 7.50, 0.00, 0.0, 0.0,I, 0.00, 20,1.0
+  1, 2, 90.00, 18.10, 0.0140, 0.5780, 230.0, 0.09772, 1.0, 1.0, 1.0, 0.00624, 0, 0, 0, 1, 0.0
+  2, 2, 90.00, 17.40, 0.0140, 0.5670, 230.0, 0.07134, 1.0, 1.0, 1.0, 0.00625, 0, 0, 0, 1, 0.0
+0 / END OF TWO-TERMINAL DC DATA, BEGIN VOLTAGE SOURCE CONVERTER DATA
+'VSC', 1, 0.0, 1, 1.0, 0, 1.0, 0, 1.0, 0, 1.0
+  1, 1, 1, 142.0, 1.034, 1118.6, 1.64, 0.00, 226.00, 1499.79, 0.5, 100.00, -100.00, 0, 100.00
+  2, 2, 1, -20.0, 1.021, 1118.6, 1.64, 0.00, 226.00, 1499.79, 0.5, 100.00, -100.00, 0, 100.00
+0 / END OF VOLTAGE SOURCE CONVERTER DATA, BEGIN IMPEDANCE CORRECTION DATA
+33, -60.00,1.00000, -24.40,0.19100,   0.00,0.01000,  24.40,0.19300,  60.00,1.00000
+0 / END OF IMPEDANCE CORRECTION DATA, BEGIN MULTI-TERMINAL DC DATA
+'MTDC', 2, 2, 1, 0, 0, 0.00, 0
+  1, 2,90.00, 0.00, 0.0, 0.0, 138.0,1.0,1.0,1.5,0.51,0.00625, 0.00, 1.0, 0.0, 1
+  2, 2,90.00, 0.00, 0.0, 0.0, 138.0,1.0,1.0,1.5,0.51,0.00625, 0.00, 1.0, 0.0, 1
+  1, 1, 1, 1,'1', 0,9999.0, 1
+  2, 2, 1, 1,'2', 0,9999.0, 1
+  1, 2,'1',1, 0.0007, 0.00
+0 / END OF MULTI-TERMINAL DC DATA, BEGIN MULTI-SECTION LINE DATA
+0 / END OF MULTI-SECTION LINE DATA, BEGIN ZONE DATA
+1,'TEMPLATE'
+0 / END OF ZONE DATA, BEGIN INTER-AREA TRANSFER DATA
+0 / END OF INTER-AREA TRANSFER DATA, BEGIN OWNER DATA
+1,'TEMPLATE'
+0 / END OF OWNER DATA, BEGIN FACTS CONTROL DEVICE DATA
+'FACTS',1, 2, 1, 0.00, 0.00, 1.03, 204.0, 0.00,0.9,1.1,1.0, 0.000, 0.05,100.0,1, 0.0, 0.0,0
+0 / END OF FACTS CONTROL DEVICE DATA, BEGIN SWITCHED SHUNT DATA
+3,0,0,1,1.05,0.95, 0,100.0,'        ', 6.00, 1, 6.00
+0 /END OF SWITCHED SHUNT DATA, BEGIN GNE DEVICE DATA
+0 /END OF GNE DEVICE DATA
+Q
+'''
+
+# the number of tie branches of a tile is limited by the two characters of
+# their circuit ids
+MAX_TIES = 100
+
+# the owner fields of the template components, set to an owner of the base case
+TEMPLATE_OWNER_FIELDS = ['p1.o1', 'params.o1', 'dc_buses.owner', 'owner']
+
+
+def synthetic_case(base_case, buses=None, copies=None, seed=0, ties=2, perturbation=0.0, fill_sections=True):
+    '''Builds a large case by tiling a base case.
+
+    Tile t has the buses of the base case renumbered to t*n+1 to t*n+n,
+    where n is the number of buses of the base case, in the order of their
+    base numbers.  Areas and zones are renumbered in the same way, wrapping
+    around at 9999.  Owners and impedance correction tables are shared by
+    all tiles.
+
+    Args:
+        base_case (Case): the case to tile, it is not modified
+        buses (int): the minimum number of buses of the case
+        copies (int): the number of tiles, if buses is not given
+        seed: the seed of the random choices
+        ties (int): the number of tie branches from each tile to the
+            previous tiles, the first always connects the previous tile,
+            at most 100.  The circuit ids of the ties of a tile are their
+            numbers, '00' to '99'.
+        perturbation (float): if positive, the loads and the generator
+            outputs are scaled by random factors in 1 +/- perturbation
+        fill_sections (bool): if True, the FILLED_SECTIONS that the base case
+            does not have are filled with template components
+    Returns:
+        Case: the synthetic case
+    Raises:
+        ValueError: if there are more than 999997 buses or 100 ties
+    '''
+
+    if ties > MAX_TIES:
+        raise ValueError('{} ties per tile were requested, the two character circuit ids allow at most {}'.format(ties, MAX_TIES))
+
+    if buses is not None:
+        copies = max(1, -(-buses // max(1, len(base_case.buses))))
+    if copies is None:
+        copies = 1
+    bus_count = len(base_case.buses)
+    if bus_count <= 0:
+        raise ValueError('the base case of a synthetic case must have buses')
+    if copies*bus_count > MAX_BUS_ID:
+        raise ValueError('a synthetic case of {} copies of {} buses exceeds the {} bus limit'.format(copies, bus_count, MAX_BUS_ID))
+
+    rng = random.Random(seed)
+    base_sections = {section: getattr(base_case, section) for section, terminator in PSSE_SECTIONS}
+
+    filled = []
+    owner = 1 if len(base_case.owners) <= 0 else base_case.owners[0].i
+    if fill_sections:
+        template_case = parse_psse_case_str(TEMPLATE_DATA)
+        for section in FILLED_SECTIONS:
+            if len(base_sections[section]) <= 0:
+                filled.append(section)
+                base_sections[section] = getattr(template_case, section)
+                for component in base_sections[section]:
+                    _update_fields(component, TEMPLATE_OWNER_FIELDS, lambda value: owner)
+
+    base_buses = {bus.i: bus for bus in base_case.buses}
+    base_bus_ids = sorted(base_buses)
+    bus_ranks = {bus_id: rank for rank, bus_id in enumerate(base_bus_ids)}
+    tie_templates = [branch for branch in base_case.branches if abs(branch.i) in bus_ranks and abs(branch.j) in bus_ranks]
+    base_area_ids = sorted(set(area.i for area in base_case.areas) | set(bus.area for bus in base_case.buses))
+    base_zone_ids = sorted(set(zone.i for zone in base_case.zones) | set(bus.zone for bus in base_case.buses))
+
+    sections = {section: [] for section, terminator in PSSE_SECTIONS}
+    for section in SHARED_SECTIONS:
+        sections[section] = copy.deepcopy(base_sections[section])
+
+    tiled_sections = [section for section, terminator in PSSE_SECTIONS
+        if section not in SHARED_SECTIONS and section != 'gnes']
+    tile_data = pickle.dumps({section: base_sections[section] for section in tiled_sections})
+    area_ids = set()
+    zone_ids = set()
+    for tile in range(0, copies):
+        bus_map = {bus_id: tile*bus_count + rank + 1 for bus_id, rank in bus_ranks.items()}
+        area_map = _wrapped_map(base_area_ids, tile)
+        zone_map = _wrapped_map(base_zone_ids, tile)
+        tile_sections = pickle.loads(tile_data)
+
+        if len(filled) > 0:
+            # the template buses 1, 2 and 3 are placed on random buses of the base case
+            template_buses = rng.sample(base_bus_ids, min(3, bus_count))
+            template_map = {number+1: bus_map[bus_id] for number, bus_id in enumerate(template_buses)}
+            template_area = area_map[base_buses[template_buses[0]].area]
+            template_zone = zone_map[base_buses[template_buses[0]].zone]
+
+        suffix = '_{}'.format(tile)
+        for section in tiled_sections:
+            components = tile_sections[section]
+            if section in filled:
+                mapping = template_map
+                for component in components:
+                    _update_fields(component, AREA_FIELDS.get(section, []), lambda value: template_area)
+                    _update_fields(component, ZONE_FIELDS.get(section, []), lambda value: template_zone)
+            else:
+                mapping = bus_map
+                for component in components:
+                    _update_fields(component, AREA_FIELDS.get(section, []), lambda value: _remap(value, area_map))
+                    _update_fields(component, ZONE_FIELDS.get(section, []), lambda value: _remap(value, zone_map))
+
+            for component in components:
+                _update_fields(component, BUS_FIELDS.get(section, []), lambda value: _remap(value, mapping))
+                _update_fields(component, NAME_FIELDS.get(section, []), lambda value: _tile_name(value, suffix))
+
+            if perturbation > 0.0 and section == 'loads':
+                for load in components:
+                    factor = rng.uniform(1.0 - perturbation, 1.0 + perturbation)
+                    load.pl *= factor
+                    load.ql *= factor
+            if perturbation > 0.0 and section == 'generators':
+                for generator in components:
+                    generator.pg *= rng.uniform(1.0 - perturbation, 1.0 + perturbation)
+
+            if section == 'areas':
+                components = _new_components(components, area_ids)
+            if section == 'zones':
+                components = _new_components(components, zone_ids)
+            sections[section].extend(components)
+
+        if tile > 0 and len(tie_templates) > 0:
+            sections['branches'].extend(_tie_branches(tie_templates, bus_ranks, tile, ties, rng))
+
+    for section in ['areas', 'zones']:
+        sections[section].sort(key=lambda component: component.i)
+    for section, terminator in PSSE_SECTIONS:
+        for index, component in enumerate(sections[section]):
+            if hasattr(component, 'index'):
+                component.index = index
+
+    record2 = 'SYNTHETIC, {} TILES, SEED {}'.format(copies, seed)
+    return Case(base_case.ic, base_case.sbase, base_case.rev, base_case.xfrrat,
+        base_case.nxfrat, base_case.basfrq, base_case.record1, record2,
+        *[sections[section] for section, terminator in PSSE_SECTIONS])
+
+
+def _wrapped_map(base_ids, tile):
+    count = len(base_ids)
+    return {base_id: (tile*count + rank) % MAX_AREA_ID + 1 for rank, base_id in enumerate(base_ids)}
+
+
+def _new_components(components, ids):
+    # area and zone numbers wrap around, so only the first tile defines them
+    new_components = []
+    for component in components:
+        if component.i not in ids:
+            ids.add(component.i)
+            new_components.append(component)
+    return new_components
+
+
+def _tie_branches(base_branches, bus_ranks, tile, ties, rng):
+    # a tie copies a random base branch from its i bus in this tile to its
+    # j bus in a previous tile, which keeps the voltage levels consistent.
+    # The circuit ids of the ties of a tile are distinct, their numbers.
+    bus_count = len(bus_ranks)
+    branches = []
+    for number in range(0, ties):
+        other_tile = tile - 1 if number == 0 else rng.randrange(0, tile)
+        branch = copy.deepcopy(rng.choice(base_branches))
+        branch.i = tile*bus_count + bus_ranks[abs(branch.i)] + 1
+        branch.j = other_tile*bus_count + bus_ranks[abs(branch.j)] + 1
+        branch.ckt = '{:02d}'.format(number)
+        branches.append(branch)
+    return branches
+
+
+def _tile_name(value, suffix):
+    if len(value) <= 0:
+        return value
+    return value.strip()[:12-len(suffix)] + suffix
+
+
+def _remap(value, mapping):
+    '''Returns: the mapped value, with its sign, 0 and unknown values are
+    not changed'''
+    if value == 0:
+        return value
+    new_value = mapping.get(abs(value))
+    if new_value is None:
+        return value
+    return new_value if value > 0 else -new_value
+
+
+def _update_fields(component, paths, function):
+    '''sets each field of a component, given by an attribute path, to the
+    result of function on its value.  Paths through lists apply to every
+    item and fields that a component does not have are skipped.'''
+    for path in paths:
+        parts = path.split('.')
+        objects = [component]
+        for part in parts[:-1]:
+            next_objects = []
+            for item in objects:
+                value = getattr(item, part, None)
+                if isinstance(value, list):
+                    next_objects.extend(value)
+                elif value is not None:
+                    next_objects.append(value)
+            objects = next_objects
+        for item in objects:
+            if hasattr(item, parts[-1]):
+                setattr(item, parts[-1], function(getattr(item, parts[-1])))
+
+
+def main(args):
+    base_case = parse_psse_case_file(args.base_file)
+    case = synthetic_case(base_case, buses=args.buses, copies=args.copies, seed=args.seed,
+        ties=args.ties, perturbation=args.perturbation, fill_sections=not args.no_fill)
+    write_psse_case_file(case, args.output_file)
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(description='builds a synthetic pss/e case by tiling a base case')
+    parser.add_argument('base_file', help='the pss/e data file to tile (.raw)')
+    parser.add_argument('output_file', help='the pss/e data file to write (.raw, .raw.gz, ...)')
+    parser.add_argument('--buses', type=int, help='the minimum number of buses')
+    parser.add_argument('--copies', type=int, default=1, help='the number of tiles, if --buses is not given')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random choices')
+    parser.add_argument('--ties', type=int, default=2, help='the number of tie branches of each tile, at most 100')
+    parser.add_argument('--perturbation', type=float, default=0.0, help='the relative range of random load and generation changes')
+    parser.add_argument('--no-fill', action='store_true', help='do not fill the sections that the base case does not have')
+
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
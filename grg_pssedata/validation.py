@@ -0,0 +1,444 @@
+'''rule-based validation of pss/e cases
+
+The range and format checks of the pss/e data specification are expressed
+as rules on the fields of a section (e.g. the area of a bus is in 1 to
+9999).  Rules are evaluated a column at a time over whole sections, using
+numpy when it is available, and violations are collected in a
+:class:`ValidationReport` instead of being issued as warnings one field at
+a time.  Large sections can be validated on a process pool.
+'''
+
+import collections
+import multiprocessing
+import operator
+import warnings
+
+from grg_pssedata.diff import SECTION_COMPONENT_NAMES
+from grg_pssedata.diff import component_key_function
+from grg_pssedata.diff import format_key
+from grg_pssedata.exception import PSSEDataWarning
+from grg_pssedata.struct import PSSE_PARALLEL_CHUNK_SIZE
+from grg_pssedata.struct import PSSE_SECTIONS
+
+
+CASE_SECTION = 'case'
+
+_number_types = frozenset([int, float])
+
+# one rule violation, position is the index of the component in its section
+# and key its identifier (see grg_pssedata.diff.SECTION_KEYS)
+Violation = collections.namedtuple('Violation', ['section', 'position', 'key', 'field', 'value', 'rule'])
+
+
+class RangeRule(object):
+    def __init__(self, section, path, name, lb, ub):
+        '''A rule requiring the values of a field to be in a closed range,
+        None values are not checked.
+
+        Args:
+            section (str): the section of the components, e.g. 'buses'
+            path (str): the attribute path of the field, e.g. 'p1.stat'
+            name (str): a readable name of the field
+            lb: the lower bound of the range
+            ub: the upper bound of the range
+        '''
+
+        self.section = section
+        self.path = path
+        self.name = name
+        self.lb = lb
+        self.ub = ub
+
+    def __repr__(self):
+        return 'RangeRule({!r}, {!r}, {!r}, {!r}, {!r})'.format(self.section, self.path, self.name, self.lb, self.ub)
+
+    def check(self, values):
+        '''Returns: the positions of the values that violate this rule'''
+        lb, ub = self.lb, self.ub
+        numbers = _number_array(values)
+        if numbers is not None:
+            valid = (numbers >= lb) & (numbers <= ub)
+            return (~valid).nonzero()[0].tolist()
+
+        if _number_types.issuperset(map(type, values)):
+            return [row for row, value in enumerate(values) if not (value >= lb and value <= ub)]
+
+        rows = []
+        for row, value in enumerate(values):
+            if value is None or value is _missing:
+                continue
+            try:
+                if not (value >= lb and value <= ub):
+                    rows.append(row)
+            except TypeError:
+                rows.append(row)
+        return rows
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def bounds(self):
+        '''Returns: a description of the valid values'''
+        return '{} to {}'.format(self.lb, self.ub)
+
+    def message(self, value, component_type, component_id):
+        return 'the {} value {} on {} {} is not in the valid range {} to {}'.format(
+            self.name, value, component_type, component_id, self.lb, self.ub)
+
+
+class FormatRule(object):
+    def __init__(self, section, path, name, predicate, description):
+        '''A rule requiring the values of a field to satisfy a predicate,
+        None values are not checked.
+
+        Args:
+            section (str): the section of the components, e.g. 'branches'
+            path (str): the attribute path of the field
+            name (str): a readable name of the field
+            predicate: a module level function that is True for valid values
+            description (str): a description of the valid values
+        '''
+
+        self.section = section
+        self.path = path
+        self.name = name
+        self.predicate = predicate
+        self.description = description
+
+    def __repr__(self):
+        return 'FormatRule({!r}, {!r}, {!r}, {}, {!r})'.format(self.section, self.path, self.name, self.predicate.__name__, self.description)
+
+    def check(self, values):
+        '''Returns: the positions of the values that violate this rule'''
+        predicate = self.predicate
+        return [row for row, value in enumerate(values)
+            if value is not None and value is not _missing and not predicate(value)]
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def bounds(self):
+        '''Returns: a description of the valid values'''
+        return self.description
+
+    def message(self, value, component_type, component_id):
+        return 'the {} value {!r} on {} {} is invalid, {}'.format(
+            self.name, value, component_type, component_id, self.description)
+
+
+class ValidationReport(object):
+    def __init__(self, violations):
+        '''This data structure contains the rule violations of a case.
+
+        Args:
+            violations (list of Violation): the violations in section order
+        '''
+
+        self.violations = violations
+
+    def __len__(self):
+        return len(self.violations)
+
+    def __iter__(self):
+        return iter(self.violations)
+
+    @property
+    def valid(self):
+        '''True if there are no violations'''
+        return len(self.violations) <= 0
+
+    def counts(self):
+        '''Returns: a Counter of the violations per (section, field)'''
+        return collections.Counter((violation.section, violation.field) for violation in self.violations)
+
+    def messages(self):
+        '''Returns: a readable message for each violation'''
+        return [violation_message(violation) for violation in self.violations]
+
+    def records(self):
+        '''Returns: a json compatible dict for each violation'''
+        records = []
+        for violation in self.violations:
+            rule = violation.rule
+            records.append({
+                'section': violation.section,
+                'position': violation.position,
+                'key': list(violation.key),
+                'field': violation.field,
+                'value': violation.value,
+                'lb': getattr(rule, 'lb', None),
+                'ub': getattr(rule, 'ub', None),
+                'bounds': rule.bounds(),
+                'message': violation_message(violation),
+            })
+        return records
+
+    def warn(self):
+        '''issues a PSSEDataWarning for each violation'''
+        for violation in self.violations:
+            warnings.warn(violation_message(violation), PSSEDataWarning)
+
+
+def violation_message(violation):
+    '''Returns: a readable description of a Violation'''
+    component_type = SECTION_COMPONENT_NAMES.get(violation.section, violation.section)
+    component_id = format_key(violation.key) if len(violation.key) > 0 else '-'
+    return violation.rule.message(violation.value, component_type, component_id)
+
+
+def _ckt_valid(ckt):
+    return not str(ckt).startswith('&')
+
+
+def _record_valid(record):
+    return len(record) <= 60
+
+
+def _owner_rules(section, prefix=''):
+    rules = []
+    for number, name in enumerate(['one', 'two', 'three', 'four']):
+        rules.append(RangeRule(section, '{}o{}'.format(prefix, number+1), 'owner '+name, 1, 9999))
+        rules.append(RangeRule(section, '{}f{}'.format(prefix, number+1), 'owner faction '+name, 0.0, 1.0))
+    return rules
+
+
+def _winding_rules(winding):
+    prefix = 'w{}.'.format(winding)
+    suffix = ' of winding {}'.format(winding)
+    return [
+        RangeRule('transformers', prefix+'index', 'winding index'+suffix, 1, 3),
+        RangeRule('transformers', prefix+'ang', 'angle shift'+suffix, -180.0, 180.0),
+        RangeRule('transformers', prefix+'cod', 'control mode'+suffix, -5, 5),
+        RangeRule('transformers', prefix+'cont', 'bus identifier'+suffix, 1, 999997),
+        RangeRule('transformers', prefix+'ntp', 'tap positions'+suffix, 2, 9999),
+        RangeRule('transformers', prefix+'tab', 'impedance correction table'+suffix, 1, float('Inf')),
+    ]
+
+
+# the checks of the validate methods of the components, fields that a
+# component does not have (e.g. the third winding of a two winding
+# transformer) are not checked
+CASE_RULES = [
+    RangeRule(CASE_SECTION, 'rev', 'version', 33, 33),
+    FormatRule(CASE_SECTION, 'record1', 'first record', _record_valid, 'at most 60 characters are supported'),
+    FormatRule(CASE_SECTION, 'record2', 'second record', _record_valid, 'at most 60 characters are supported'),
+    RangeRule(CASE_SECTION, 'ic', 'case type flag', 0, 1),
+]
+
+VALIDATION_RULES = [
+    RangeRule('buses', 'i', 'id', 1, 999997),
+    RangeRule('buses', 'area', 'area', 1, 9999),
+    RangeRule('buses', 'zone', 'zone', 1, 9999),
+    RangeRule('buses', 'owner', 'owner', 1, 9999),
+
+    RangeRule('loads', 'status', 'status', 0, 1),
+    RangeRule('loads', 'i', 'bus identifier', 1, 999997),
+    RangeRule('loads', 'area', 'area', 1, 9999),
+    RangeRule('loads', 'zone', 'zone', 1, 9999),
+    RangeRule('loads', 'owner', 'owner', 1, 9999),
+
+    RangeRule('fixed_shunts', 'status', 'status', 0, 1),
+    RangeRule('fixed_shunts', 'i', 'bus identifier', 1, 999997),
+
+    RangeRule('generators', 'stat', 'stat', 0, 1),
+    RangeRule('generators', 'i', 'bus identifier', 1, 999997),
+    RangeRule('generators', 'ireg', 'regulator bus identifier', 1, 999997),
+] + _owner_rules('generators') + [
+    RangeRule('generators', 'wmod', 'wmod', 0, 3),
+    RangeRule('generators', 'wpf', 'wpf', 0.0, 1.0),
+
+    RangeRule('branches', 'st', 'st', 0, 1),
+    RangeRule('branches', 'i', 'bus i identifier', 1, 999997),
+    RangeRule('branches', 'j', 'bus j identifier', 1, 999997),
+] + _owner_rules('branches') + [
+    FormatRule('branches', 'ckt', 'ckt', _ckt_valid, 'ckt values cannot start with "&"'),
+
+    RangeRule('transformers', 'p1.stat', 'stat', 0, 4),
+    RangeRule('transformers', 'p1.i', 'bus i identifier', 1, 999997),
+    RangeRule('transformers', 'p1.j', 'bus j identifier', 1, 999997),
+    RangeRule('transformers', 'p1.k', 'bus k identifier', 0, 999997),
+    RangeRule('transformers', 'p1.cw', 'cw', 1, 3),
+    RangeRule('transformers', 'p1.cz', 'cz', 1, 3),
+    RangeRule('transformers', 'p1.cm', 'cm', 1, 2),
+] + _owner_rules('transformers', 'p1.') + _winding_rules(1) + _winding_rules(2) + _winding_rules(3) + [
+
+    RangeRule('areas', 'i', 'id', 1, 9999),
+    RangeRule('zones', 'i', 'id', 1, 9999),
+    RangeRule('owners', 'i', 'id', 1, 9999),
+
+    RangeRule('facts', 'owner', 'owner', 1, 9999),
+
+    RangeRule('switched_shunts', 'stat', 'status', 0, 1),
+    RangeRule('switched_shunts', 'i', 'bus identifier', 1, 999997),
+    RangeRule('switched_shunts', 'modsw', 'control mode', 0, 6),
+    RangeRule('switched_shunts', 'adjm', 'status', 0, 1),
+    RangeRule('switched_shunts', 'swrem', 'bus identifier', 0, 999997),
+    RangeRule('switched_shunts', 'rmpct', 'reactive percentage', 0.0, 1.0),
+] + [RangeRule('switched_shunts', 'n{}'.format(bank), 'bank n{}'.format(bank), 0, 9) for bank in range(1, 9)]
+
+
+def validate_case(case, rules=None, workers=None):
+    '''Checks a case against validation rules.
+
+    Args:
+        case (Case): the case to validate
+        rules (list): the component rules, VALIDATION_RULES by default, the
+            case header is checked with CASE_RULES
+        workers (int): if greater than one, sections with more than
+            PSSE_PARALLEL_CHUNK_SIZE components are validated in chunks on
+            a process pool of this size
+    Returns:
+        ValidationReport: the rule violations
+    '''
+
+    if rules is None:
+        rules = VALIDATION_RULES
+
+    violations = []
+    for rule in CASE_RULES:
+        value = getattr(case, rule.path)
+        if len(rule.check([value])) > 0:
+            violations.append(Violation(CASE_SECTION, None, (), rule.path, value, rule))
+
+    section_rules = collections.OrderedDict((section, []) for section, terminator in PSSE_SECTIONS)
+    for rule in rules:
+        section_rules[rule.section].append(rule)
+
+    tasks = []
+    parallel = False
+    for section, terminator in PSSE_SECTIONS:
+        count = len(getattr(case, section))
+        if len(section_rules[section]) <= 0 or count <= 0:
+            continue
+        chunk_size = count
+        if workers is not None and workers > 1 and count > PSSE_PARALLEL_CHUNK_SIZE:
+            chunk_size = max(PSSE_PARALLEL_CHUNK_SIZE, -(-count // (4*workers)))
+            parallel = True
+        for start in range(0, count, chunk_size):
+            tasks.append((section, start, min(start+chunk_size, count)))
+
+    if not parallel:
+        results = [validate_components(getattr(case, section), section, section_rules[section])
+            for section, start, stop in tasks]
+    else:
+        # the case is handed to each worker once, when the pool starts
+        pool = multiprocessing.Pool(workers, _init_validation_worker, (case, section_rules))
+        try:
+            results = pool.map(_validate_chunk, tasks)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    for chunk_violations in results:
+        violations.extend(chunk_violations)
+    return ValidationReport(violations)
+
+
+# the case and rules of a validate_case worker process
+_worker_case = None
+_worker_rules = None
+
+def _init_validation_worker(case, section_rules):
+    global _worker_case, _worker_rules
+    _worker_case = case
+    _worker_rules = section_rules
+
+
+def _validate_chunk(task):
+    section, start, stop = task
+    components = getattr(_worker_case, section)[start:stop]
+    return validate_components(components, section, _worker_rules[section], start)
+
+
+def validate_components(components, section, rules, start=0):
+    '''Checks the rules of a section on a list of its components.
+
+    Args:
+        components (list): the components
+        section (str): the name of the section, e.g. 'buses'
+        rules (list): the rules of the section
+        start (int): the position of the first component in its section
+    Returns:
+        a list of Violation, in component order
+    '''
+
+    # rules are grouped by field so each column is read once
+    path_rules = collections.OrderedDict()
+    for rule in rules:
+        path_rules.setdefault(rule.path, []).append(rule)
+
+    rows = []
+    for path, field_rules in path_rules.items():
+        values = component_column(components, path)
+        for rule in field_rules:
+            for row in rule.check(values):
+                rows.append((row, path, values[row], rule))
+
+    # violations are reported in component order, then in rule order
+    rows.sort(key=operator.itemgetter(0))
+    key_function = component_key_function(section)
+    violations = []
+    key_row, key = None, None
+    for row, path, value, rule in rows:
+        if row != key_row:
+            key_row, key = row, key_function(components[row])
+        violations.append(Violation(section, start+row, key, path, value, rule))
+    return violations
+
+
+def component_column(components, path):
+    '''Returns: the values of a field of a list of components, components
+    without the field have a placeholder value that rules do not check'''
+    getter = operator.attrgetter(path)
+    try:
+        return [getter(component) for component in components]
+    except AttributeError:
+        pass
+
+    values = []
+    for component in components:
+        try:
+            values.append(getter(component))
+        except AttributeError:
+            values.append(_missing)
+    return values
+
+
+# the value of a field that a component does not have
+_missing = object()
+
+
+def _number_array(values):
+    '''Returns: the values as a numpy array if numpy is available and all
+    values are ints or floats, otherwise None'''
+    if len(values) <= 0:
+        return None
+    try:
+        import numpy
+    except ImportError:
+        return None
+    types = set(map(type, values))
+    if not types.issubset([int, float]):
+        return None
+    try:
+        return numpy.asarray(values, dtype=numpy.float64 if float in types else numpy.int64)
+    except OverflowError:
+        return None
@@ -0,0 +1,113 @@
+import asyncio, concurrent.futures, os, pytest, threading
+
+import grg_pssedata
+import grg_pssedata.aio
+
+
+class TestAsyncio:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/powermodels/case5.raw'
+        self.other_file = test_path+'/data/correct/powermodels/case14.raw'
+        self.exception_file = test_path+'/data/exception/powermodels/parser_test_d.raw'
+
+    def test_load_write(self, tmp_path):
+        file_name = str(tmp_path / 'case5.raw.gz')
+        async def round_trip():
+            case = await grg_pssedata.aio.load_case(self.case_file)
+            await grg_pssedata.aio.write_case(case, file_name)
+            return case, await grg_pssedata.aio.load_case(file_name, diagnostics=True)
+
+        case, (case_2, diagnostics) = asyncio.run(round_trip())
+        assert case == grg_pssedata.io.parse_psse_case_file(self.case_file)
+        assert case_2 == case
+
+    def test_process_executor(self):
+        async def load(executor):
+            return await grg_pssedata.aio.load_case(self.other_file, executor)
+
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            case = asyncio.run(load(executor))
+        assert case == grg_pssedata.io.parse_psse_case_file(self.other_file)
+
+    def test_limiter(self, monkeypatch):
+        lock = threading.Lock()
+        running = [0, 0]
+        parse = grg_pssedata.aio.parse_psse_case_file
+        def counting_parse(psse_file_name, **kwargs):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            try:
+                return parse(psse_file_name, **kwargs)
+            finally:
+                with lock:
+                    running[0] -= 1
+        monkeypatch.setattr(grg_pssedata.aio, 'parse_psse_case_file', counting_parse)
+
+        async def load_all():
+            limiter = asyncio.Semaphore(2)
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                return await asyncio.gather(*[grg_pssedata.aio.load_case(self.other_file, executor, limiter) for index in range(0, 8)])
+
+        cases = asyncio.run(load_all())
+        assert len(cases) == 8
+        assert 1 <= running[1] <= 2
+
+    def test_iter_cases(self):
+        file_names = [self.case_file, self.other_file, self.exception_file, self.case_file]
+        async def collect(concurrency):
+            return [item async for item in grg_pssedata.aio.iter_cases(file_names,
+                concurrency=concurrency, return_exceptions=True)]
+
+        for concurrency in [1, 3]:
+            results = asyncio.run(collect(concurrency))
+            assert sorted(file_name for file_name, case in results) == sorted(file_names)
+            for file_name, case in results:
+                if file_name == self.exception_file:
+                    assert isinstance(case, Exception)
+                else:
+                    assert case == grg_pssedata.io.parse_psse_case_file(file_name)
+
+        with pytest.raises(ValueError):
+            asyncio.run(collect(0))
+
+    def test_iter_cases_errors(self):
+        async def collect():
+            return [item async for item in grg_pssedata.aio.iter_cases([self.exception_file, self.case_file], concurrency=1)]
+
+        with pytest.raises(Exception):
+            asyncio.run(collect())
+
+    def test_cancel(self):
+        started = threading.Event()
+        release = threading.Event()
+        def blocked_parse(psse_file_name, **kwargs):
+            started.set()
+            release.wait(10)
+            return None
+        async def cancel_load(executor):
+            limiter = asyncio.Semaphore(1)
+            running = asyncio.ensure_future(grg_pssedata.aio._run(executor, limiter, blocked_parse, self.case_file))
+            waiting = asyncio.ensure_future(grg_pssedata.aio.load_case(self.case_file, executor, limiter))
+            await asyncio.get_event_loop().run_in_executor(None, started.wait, 10)
+            waiting.cancel()
+            running.cancel()
+            results = await asyncio.gather(running, waiting, return_exceptions=True)
+            release.set()
+            return results
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = asyncio.run(cancel_load(executor))
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+    def test_iter_cases_close(self):
+        file_names = [self.other_file]*6
+        async def first():
+            cases = grg_pssedata.aio.iter_cases(file_names, concurrency=2)
+            async for file_name, case in cases:
+                break
+            await cases.aclose()
+            return case
+
+        assert asyncio.run(first()) == grg_pssedata.io.parse_psse_case_file(self.other_file)
@@ -0,0 +1,8 @@
+import sys, pytest
+
+# the tests use asyncio.run and async comprehensions, they are kept in a
+# module that is only imported by python 3.7 or newer, which can compile it
+if sys.version_info < (3, 7):
+    pytest.skip('the asyncio interfaces are tested on python 3.7 or newer', allow_module_level=True)
+
+from aio_tests import TestAsyncio
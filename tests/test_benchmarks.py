@@ -0,0 +1,55 @@
+import io, json, pytest
+
+from benchmarks import compare
+
+
+def document(kind, metric, values):
+    results = [dict([('case', case), ('benchmark', 'parse'), (metric, value)]) for case, value in values.items()]
+    return {'version': 1, 'kind': kind, 'results': results}
+
+
+class TestCompare:
+    def test_throughput(self):
+        baseline = document('throughput', 'records_per_second', {'a': 1000.0, 'b': 1000.0, 'c': 1000.0, 'd': 1000.0})
+        results = document('throughput', 'records_per_second', {'a': 1200.0, 'b': 950.0, 'c': 850.0, 'e': 10.0})
+        comparisons = compare.compare_results(baseline, results, 0.1)
+        assert [comparison.case for comparison in comparisons] == ['a', 'b', 'c']
+        assert [comparison.regression for comparison in comparisons] == [False, False, True]
+        assert comparisons[1].ratio == pytest.approx(0.95)
+
+    def test_default_kind(self):
+        baseline = document('throughput', 'records_per_second', {'a': 1000.0})
+        results = document('throughput', 'records_per_second', {'a': 800.0})
+        del results['kind']
+        assert compare.compare_results(baseline, results, 0.1)[0].regression
+
+    @pytest.mark.parametrize('kind, metric', [('memory', 'peak_bytes'), ('startup', 'import_us')])
+    def test_lower_is_better(self, kind, metric):
+        baseline = document(kind, metric, {'a': 1000, 'b': 1000, 'c': 1000, 'd': 0})
+        results = document(kind, metric, {'a': 500, 'b': 1150, 'c': 1250, 'd': 10})
+        comparisons = compare.compare_results(baseline, results, 0.2)
+        # benchmarks without a baseline value are skipped
+        assert [comparison.case for comparison in comparisons] == ['a', 'b', 'c']
+        assert [comparison.regression for comparison in comparisons] == [False, False, True]
+
+    def test_print_comparison(self):
+        baseline = document('startup', 'import_us', {'a': 1000, 'b': 1000})
+        results = document('startup', 'import_us', {'a': 1000, 'b': 2000})
+        output = io.StringIO()
+        regressions = compare.print_comparison(compare.compare_results(baseline, results, 0.1), output, unit='us')
+        assert regressions == 1
+        lines = output.getvalue().splitlines()
+        assert 'base us' in lines[0]
+        assert lines[2].endswith('REGRESSION')
+        assert lines[-1] == '1 of 2 benchmarks regressed'
+
+    def test_exit_status(self, tmp_path, capsys):
+        base_file = tmp_path / 'base.json'
+        base_file.write_text(json.dumps(document('memory', 'peak_bytes', {'a': 1000})))
+        parser = compare.build_cli_parser()
+        for peak_bytes, status in [(1050, 0), (1200, 1)]:
+            results_file = tmp_path / 'new.json'
+            results_file.write_text(json.dumps(document('memory', 'peak_bytes', {'a': peak_bytes})))
+            args = parser.parse_args([str(base_file), str(results_file), '--threshold', '0.1'])
+            assert compare.main(args) == status
+            assert 'base bytes' in capsys.readouterr().out
@@ -0,0 +1,51 @@
+import os, pytest
+
+import grg_pssedata
+import grg_pssedata.binary
+
+from test_common import correct_files
+from test_common import warning_files
+
+@pytest.mark.parametrize('input_data', correct_files + warning_files)
+def test_001(input_data, tmp_path):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    file_name = str(tmp_path / 'case.grgb')
+    grg_pssedata.binary.write_binary_case_file(case, file_name)
+
+    case_2 = grg_pssedata.binary.read_binary_case_file(file_name)
+    assert case == case_2
+    assert case.to_psse() == case_2.to_psse()
+
+
+class TestBinaryCase:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        self.data = grg_pssedata.binary.binary_case_bytes(self.case)
+
+    def test_columns(self):
+        binary_case = grg_pssedata.binary.BinaryCase(self.data, verify=True)
+        assert binary_case.record1 == self.case.record1
+        assert binary_case.count('buses') == len(self.case.buses)
+        assert list(binary_case.column('buses', 'vm')) == [bus.vm for bus in self.case.buses]
+        assert binary_case.column('buses', 'name') == [bus.name for bus in self.case.buses]
+
+        table = binary_case.tables('transformers')[0]
+        assert list(table.column('p1.i')) == [t.p1.i for t in self.case.transformers]
+
+    def test_numpy(self):
+        numpy = pytest.importorskip('numpy')
+        binary_case = grg_pssedata.binary.BinaryCase(self.data)
+        vm = binary_case.column('buses', 'vm', numpy=True)
+        assert vm.dtype == numpy.float64
+        assert vm.tolist() == [bus.vm for bus in self.case.buses]
+
+    def test_corrupted(self):
+        data = bytearray(self.data)
+        data[100] ^= 0xff
+        with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+            grg_pssedata.binary.BinaryCase(bytes(data), verify=True)
+
+    def test_not_binary(self):
+        with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+            grg_pssedata.binary.BinaryCase(self.case.to_psse().encode('utf-8'))
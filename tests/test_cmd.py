@@ -1,6 +1,8 @@
-import os, pytest
+import os, copy, csv, glob, io, json, pytest
 
 import grg_pssedata
+import grg_pssedata.convert
+import grg_pssedata.diff
 
 class TestDiff:
     def setup_method(self, _):
@@ -14,23 +16,167 @@ class TestDiff:
 
     def test_001(self):
         count = grg_pssedata.cmd.diff(self.case_1, self.case_2)
-        assert(count == 17)
+        assert(count == 46)
 
     def test_002(self):
         count = grg_pssedata.cmd.diff(self.case_2, self.case_3)
-        assert(count == 17)
+        assert(count == 28)
 
     def test_003(self):
         count = grg_pssedata.cmd.diff(self.case_3, self.case_4)
-        assert(count == 349)
+        assert(count == 361)
 
     def test_004(self):
         count = grg_pssedata.cmd.diff(self.case_4, self.case_5)
-        assert(count == 678)
+        assert(count == 1375)
 
     def test_005(self):
         count = grg_pssedata.cmd.diff(self.case_2, self.case_5)
-        assert(count == 1011)
+        assert(count == 1044)
+
+
+class TestKeyDiff:
+    def setup_method(self, _):
+        """Parse a real network file"""
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_1 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        self.case_2 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def test_inserted_bus(self):
+        bus = copy.deepcopy(self.case_2.buses[0])
+        bus.i = 999001
+        self.case_2.buses.insert(0, bus)
+
+        changes = list(grg_pssedata.diff.diff_cases(self.case_1, self.case_2))
+        assert(len(changes) == 1)
+        assert(changes[0].change == 'added')
+        assert(changes[0].key == (999001,))
+
+    def test_inserted_load(self):
+        self.case_2.loads.insert(0, copy.deepcopy(self.case_2.loads[5]))
+        self.case_2.loads[0].id = 'X'
+        del self.case_2.branches[10]
+
+        changes = list(grg_pssedata.diff.diff_cases(self.case_1, self.case_2))
+        assert([(c.section, c.change) for c in changes] == [('loads', 'added'), ('branches', 'removed')])
+
+    def test_modified_fields(self):
+        self.case_2.buses[7].vm = 1.5
+        self.case_2.transformers[3].w1.windv = 1.1
+
+        changes = list(grg_pssedata.diff.diff_cases(self.case_1, self.case_2))
+        assert([c.fields[0].field for c in changes] == ['vm', 'w1.windv'])
+        assert(changes[0].fields[0].value_2 == 1.5)
+
+    def test_reordered(self):
+        self.case_2.buses.reverse()
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2)
+        assert(count == 0)
+
+
+class TestDiffFormats:
+    def setup_method(self, _):
+        """Parse two real network files"""
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_1 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case5.raw')
+        self.case_2 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_json(self):
+        output = io.StringIO()
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2, 'json', output=output)
+        records = json.loads(output.getvalue())
+        assert(count == 60)
+        assert(len(records) == 60)
+        assert(records[0]['section'] == 'case')
+        assert({'section': 'buses', 'change': 'added', 'key': [6], 'fields': []} in records)
+
+    def test_jsonl(self):
+        output = io.StringIO()
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2, 'jsonl', output=output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert(count == 60)
+        assert(records == json.loads(self.json_output()))
+
+    def test_csv(self):
+        output = io.StringIO()
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2, 'csv', output=output)
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert(count == 60)
+        assert(rows[0] == grg_pssedata.diff.CSV_CHANGE_COLUMNS)
+        records = json.loads(self.json_output())
+        assert(len(rows) == 1 + sum(max(1, len(record['fields'])) for record in records))
+
+    def test_summary(self):
+        output = io.StringIO()
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2, 'json', summary=True, output=output)
+        rows = json.loads(output.getvalue())
+        assert(count == 60)
+        assert(sum(row['count'] for row in rows if row['field'] == '') == 60)
+        assert({'section': 'buses', 'change': 'added', 'field': '', 'count': 9} in rows)
+
+    def test_summary_text(self):
+        output = io.StringIO()
+        grg_pssedata.cmd.diff(self.case_1, self.case_2, summary=True, output=output)
+        assert('buses added: 9' in output.getvalue().splitlines())
+
+    def test_bad_format(self):
+        with pytest.raises(ValueError):
+            grg_pssedata.cmd.diff(self.case_1, self.case_2, 'xml')
+
+    def json_output(self):
+        output = io.StringIO()
+        grg_pssedata.cmd.diff(self.case_1, self.case_2, 'json', output=output)
+        return output.getvalue()
+
+
+class TestToleranceDiff:
+    def setup_method(self, _):
+        """Parse a real network file and perturb its float fields"""
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_1 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        self.case_2 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        for bus in self.case_2.buses:
+            bus.vm += 1e-9
+            bus.va += 1e-7
+        for branch in self.case_2.branches:
+            branch.r *= 1 + 1e-8
+
+    def test_exact(self):
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2, output=io.StringIO())
+        assert(count == len(self.case_1.buses) + len(self.case_1.branches))
+
+    def test_rtol(self):
+        tolerance = grg_pssedata.diff.Tolerance(rtol=1e-6, atol=1e-6)
+        count = grg_pssedata.cmd.diff(self.case_1, self.case_2, output=io.StringIO(), tolerance=tolerance)
+        assert(count == 0)
+
+    def test_field_override(self):
+        tolerance = grg_pssedata.cmd.build_tolerance(1e-6, 1e-6, ['buses.va=0,1e-9'])
+        changes = list(grg_pssedata.diff.diff_cases(self.case_1, self.case_2, tolerance))
+        assert(all(change.section == 'buses' for change in changes))
+        assert(set(field.field for change in changes for field in change.fields) == set(['va']))
+
+    def test_chunks(self, monkeypatch):
+        monkeypatch.setattr(grg_pssedata.diff, 'DIFF_CHUNK_SIZE', 7)
+        self.case_2.buses[3].vm = 2.0
+        del self.case_2.buses[5]
+        del self.case_2.buses[20]
+        tolerance = grg_pssedata.diff.Tolerance(rtol=1e-6, atol=1e-6)
+        changes = list(grg_pssedata.diff.diff_components(self.case_1.buses, self.case_2.buses, 'buses', tolerance=tolerance))
+        assert([change.change for change in changes] == ['modified', 'removed', 'removed'])
+        assert(changes[0].fields[0].field == 'vm')
+
+    def test_nested_components(self):
+        self.case_2.transformers[0].w1.windv += 1e-9
+        self.case_2.transformers[1].p2.x12 += 1.0
+        tolerance = grg_pssedata.diff.Tolerance(rtol=1e-6)
+        changes = list(grg_pssedata.diff.diff_components(self.case_1.transformers, self.case_2.transformers, 'transformers', tolerance=tolerance))
+        assert(len(changes) == 1)
+        assert(changes[0].fields[0].field == 'p2.x12')
+
+    def test_bad_tolerance(self):
+        with pytest.raises(ValueError):
+            grg_pssedata.cmd.build_tolerance(field_tolerances=['vm'])
 
 
 class TestEq:
@@ -50,6 +196,99 @@ class TestEq:
         assert(not equiv)
 
 
+class TestDiffMany:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.pattern = test_path+'/data/correct/powermodels/case[0-9]*.raw'
+        self.files = sorted(glob.glob(self.pattern))
+
+    def pair_count(self, file_1, file_2):
+        case_1 = grg_pssedata.io.parse_psse_case_file(file_1)
+        case_2 = grg_pssedata.io.parse_psse_case_file(file_2)
+        return len(list(grg_pssedata.diff.diff_cases(case_1, case_2)))
+
+    def test_consecutive(self):
+        output = io.StringIO()
+        count = grg_pssedata.cmd.diff_many(self.files, output=output)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert(count == sum(self.pair_count(file_1, file_2) for file_1, file_2 in zip(self.files, self.files[1:])))
+        assert(len(records) == count)
+        assert(records[0]['file_1'] == self.files[0])
+        assert(records[0]['file_2'] == self.files[1])
+
+    def test_base(self):
+        output = io.StringIO()
+        count = grg_pssedata.cmd.diff_many(self.files[1:], self.files[0], format='csv', output=output)
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert(count == sum(self.pair_count(self.files[0], file_name) for file_name in self.files[1:]))
+        assert(rows[0][:2] == ['file_1', 'file_2'])
+        assert(set(row[0] for row in rows[1:]) == set([self.files[0]]))
+
+    def test_workers(self):
+        for base in [None, self.files[2]]:
+            serial = io.StringIO()
+            grg_pssedata.cmd.diff_many(self.files, base, format='json', output=serial)
+            parallel = io.StringIO()
+            grg_pssedata.cmd.diff_many(self.files, base, workers=2, format='json', output=parallel)
+            assert(serial.getvalue() == parallel.getvalue())
+            assert(len(json.loads(serial.getvalue())) > 0)
+
+    def test_runs(self, monkeypatch):
+        monkeypatch.setattr(grg_pssedata.diff, 'DIFF_RUN_PAIRS', 2)
+        for base in [None, self.files[2]]:
+            serial = [(file_1, file_2, list(changes)) for file_1, file_2, changes in grg_pssedata.diff.diff_case_files(self.files, base)]
+            parallel = [(file_1, file_2, list(changes)) for file_1, file_2, changes in grg_pssedata.diff.diff_case_files(self.files, base, workers=2)]
+            assert(serial == parallel)
+            assert(len(parallel) == len(self.files) - (1 if base is None else 0))
+
+    def test_glob(self):
+        assert(grg_pssedata.cmd.expand_file_names([self.pattern]) == self.files)
+        assert(grg_pssedata.cmd.expand_file_names(['missing.raw']) == ['missing.raw'])
+
+
+class TestEqFiles:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def write_case(self, tmp_path, name, comments=True):
+        lines = self.case.to_psse().split('\n')
+        if not comments:
+            lines = [line.split(' /')[0] for line in lines]
+        file_name = str(tmp_path / name)
+        with open(file_name, 'w') as psse_file:
+            psse_file.write('\n'.join(lines))
+        return file_name
+
+    def test_identical(self, tmp_path, capsys):
+        file_1 = self.write_case(tmp_path, 'case_1.raw')
+        file_2 = self.write_case(tmp_path, 'case_2.raw')
+        assert(grg_pssedata.cmd.eq_files(file_1, file_2))
+        assert(capsys.readouterr().out == 'the files are identical\n')
+
+    def test_equivalent(self, tmp_path, capsys):
+        file_1 = self.write_case(tmp_path, 'case_1.raw')
+        file_2 = self.write_case(tmp_path, 'case_2.raw', comments=False)
+        assert(grg_pssedata.cmd.eq_files(file_1, file_2))
+        assert('the section digests are identical' in capsys.readouterr().out)
+
+    def test_changed(self, tmp_path):
+        file_1 = self.write_case(tmp_path, 'case_1.raw')
+        self.case.loads[3].pl += 1.0
+        file_2 = self.write_case(tmp_path, 'case_2.raw')
+        assert(not grg_pssedata.cmd.eq_files(file_1, file_2))
+
+    def test_spacing(self, tmp_path):
+        file_1 = self.write_case(tmp_path, 'case_1.raw')
+        file_2 = str(tmp_path / 'case_2.raw')
+        with open(file_1) as psse_file:
+            lines = psse_file.read().split('\n')
+        lines[5] = lines[5].replace(',', ' ,')
+        with open(file_2, 'w') as psse_file:
+            psse_file.write('\n'.join(lines))
+        assert(grg_pssedata.cmd.eq_files(file_1, file_2))
+
+
 class TestCLI:
     def setup_method(self, _):
         """Parse a real network file"""
@@ -68,7 +307,81 @@ class TestCLI:
     def test_diff_001(self):
         args = self.parser.parse_args(['diff', self.case_2_file, self.case_3_file])
         count = grg_pssedata.cmd.main(args)
-        assert(count == 37)
+        assert(count == 60)
+
+    def test_diff_format(self, capsys):
+        args = self.parser.parse_args(['diff', '--format', 'jsonl', '--summary', self.case_2_file, self.case_3_file])
+        count = grg_pssedata.cmd.main(args)
+        assert(count == 60)
+        assert(len(capsys.readouterr().out.splitlines()) > 0)
+
+    def test_diff_tolerance(self):
+        args = self.parser.parse_args(['diff', '--rtol', '1e-6', '--tolerance', 'buses.vm=0.5', self.case_2_file, self.case_3_file])
+        count = grg_pssedata.cmd.main(args)
+        assert(count <= 60)
+
+    def test_diff_many(self, capsys):
+        args = self.parser.parse_args(['diff-many', '--jobs', '2', self.case_1_file, self.case_2_file, self.case_3_file])
+        count = grg_pssedata.cmd.main(args)
+        assert(count == 60)
+        assert(len(capsys.readouterr().out.splitlines()) == 60)
+
+    def test_delta_apply(self, capsys, tmp_path):
+        args = self.parser.parse_args(['delta', self.case_2_file, self.case_3_file])
+        count = grg_pssedata.cmd.main(args)
+        assert(count == 60)
+
+        patch_file = tmp_path / 'case.patch'
+        patch_file.write_text(capsys.readouterr().out)
+        args = self.parser.parse_args(['apply', self.case_2_file, str(patch_file)])
+        case = grg_pssedata.cmd.main(args)
+        output = capsys.readouterr().out
+        case_3 = grg_pssedata.io.parse_psse_case_file(self.case_3_file)
+        assert(case == case_3)
+        assert(grg_pssedata.io.parse_psse_case_str(output) == case_3)
+
+    def test_profile(self, capsys):
+        args = self.parser.parse_args(['profile', self.case_2_file])
+        parse_stats = grg_pssedata.cmd.main(args)
+        lines = capsys.readouterr().out.splitlines()
+        assert(len(lines) == 2 + len(parse_stats.sections) + 1)
+        assert(lines[3].split()[0] == 'buses')
+
+        args = self.parser.parse_args(['profile', self.case_2_file, '--format', 'json'])
+        grg_pssedata.cmd.main(args)
+        profile = json.loads(capsys.readouterr().out)
+        assert(profile['sections'][1]['section'] == 'buses')
+        assert(profile['sections'][-1]['section'] == 'total')
+
+    def test_stats(self, capsys):
+        args = self.parser.parse_args(['stats', self.case_1_file, self.case_3_file])
+        errors = grg_pssedata.cmd.main(args)
+        assert(errors == 0)
+        stats = json.loads(capsys.readouterr().out)
+        assert([file_stats['records']['buses'] for file_stats in stats] == [5, 14])
+
+        args = self.parser.parse_args(['stats', '--jobs', '2', '--format', 'csv', self.case_1_file, 'missing.raw'])
+        errors = grg_pssedata.cmd.main(args)
+        assert(errors == 1)
+        assert(capsys.readouterr().out.splitlines()[0] == 'file,statistic,key,value')
+
+    def test_convert(self, tmp_path, capsys):
+        assert(grg_pssedata.cmd.CONVERT_FORMATS is grg_pssedata.convert.CONVERT_FORMATS)
+        out_dir = str(tmp_path / 'out')
+        args = self.parser.parse_args(['convert', '--to', 'json', self.case_1_file, self.case_3_file, out_dir])
+        errors = grg_pssedata.cmd.main(args)
+        assert(errors == 0)
+        assert(sorted(os.listdir(out_dir)) == ['case14.json', 'case5.json'])
+        progress = capsys.readouterr().err.splitlines()
+        assert(progress[0].startswith('[1/2] '))
+        assert(progress[-1].startswith('converted 2 of 2 files to json'))
+
+        args = self.parser.parse_args(['convert', '--jobs', '2', self.case_3_file, 'missing.raw', out_dir])
+        errors = grg_pssedata.cmd.main(args)
+        assert(errors == 1)
+        assert(grg_pssedata.io.parse_psse_case_file(os.path.join(out_dir, 'case14.raw')) ==
+            grg_pssedata.io.parse_psse_case_file(self.case_3_file))
+        assert('missing.raw failed: FileNotFoundError' in capsys.readouterr().err)
 
     def test_eq_001(self):
         args = self.parser.parse_args(['eq', self.case_1_file, self.case_2_file])
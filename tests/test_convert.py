@@ -0,0 +1,113 @@
+import csv, gzip, json, os, pytest, warnings
+
+import grg_pssedata
+import grg_pssedata.convert
+
+from grg_pssedata.struct import PSSE_SECTIONS
+
+from test_common import correct_files
+from test_common import warning_files
+
+@pytest.mark.parametrize('input_data', correct_files + warning_files)
+def test_001(input_data, tmp_path):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    file_name = str(tmp_path / 'case.json')
+    grg_pssedata.convert.write_json_case_file(case, file_name)
+
+    case_2 = grg_pssedata.convert.read_json_case_file(file_name)
+    assert case_2 == case
+    assert case_2.to_psse() == case.to_psse()
+
+
+class TestConvert:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/powermodels/case5.raw'
+        self.other_file = test_path+'/data/correct/powermodels/three_winding_test.raw'
+        self.exception_file = test_path+'/data/exception/powermodels/parser_test_d.raw'
+
+    def test_output_name(self):
+        assert grg_pssedata.convert.output_name('archive/case.raw.gz', 'out', 'json') == os.path.join('out', 'case.json')
+        assert grg_pssedata.convert.output_name('case.raw', 'out', 'csv') == os.path.join('out', 'case')
+        assert grg_pssedata.convert.output_name('case', 'out', 'binary') == os.path.join('out', 'case.grgb')
+        with pytest.raises(ValueError):
+            grg_pssedata.convert.output_name('case.raw', 'out', 'xml')
+
+    @pytest.mark.parametrize('format', ['raw', 'json', 'binary'])
+    def test_formats(self, format, tmp_path):
+        case = grg_pssedata.io.parse_psse_case_file(self.other_file)
+        result = grg_pssedata.convert.convert_file(self.other_file, str(tmp_path / 'case'), format)
+        assert result.error is None
+        assert result.components == sum(len(getattr(case, name)) for name, terminator in PSSE_SECTIONS)
+        assert result.input_bytes == os.path.getsize(self.other_file)
+        assert result.output_bytes == os.path.getsize(result.output)
+
+        if format == 'raw':
+            case_2 = grg_pssedata.io.parse_psse_case_file(result.output)
+        elif format == 'json':
+            case_2 = grg_pssedata.convert.read_json_case_file(result.output)
+        else:
+            case_2 = grg_pssedata.binary.read_binary_case_file(result.output)
+        assert case_2.to_psse() == case.to_psse()
+
+    def test_csv(self, tmp_path):
+        case = grg_pssedata.io.parse_psse_case_file(self.other_file)
+        directory = str(tmp_path / 'case')
+        result = grg_pssedata.convert.convert_file(self.other_file, directory, 'csv')
+        assert result.error is None
+
+        with open(os.path.join(directory, 'header.csv')) as csv_file:
+            header = dict(csv.reader(csv_file))
+        assert float(header['sbase']) == case.sbase
+
+        with open(os.path.join(directory, 'transformers.csv')) as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        assert len(rows) == len(case.transformers)
+        assert [int(row['p1.i']) for row in rows] == [transformer.p1.i for transformer in case.transformers]
+        assert [float(row['w3.windv']) for row in rows] == [transformer.w3.windv for transformer in case.transformers]
+        assert not os.path.exists(os.path.join(directory, 'facts.csv'))
+
+    def test_npz(self, tmp_path):
+        numpy = pytest.importorskip('numpy')
+        case = grg_pssedata.io.parse_psse_case_file(self.other_file)
+        result = grg_pssedata.convert.convert_file(self.other_file, str(tmp_path / 'case.npz'), 'npz')
+        assert result.error is None
+
+        with numpy.load(result.output) as arrays:
+            assert list(arrays['buses/0/i']) == [bus.i for bus in case.buses]
+            assert json.loads(str(arrays['header']))['sbase'] == case.sbase
+
+    def test_errors(self, tmp_path):
+        result = grg_pssedata.convert.convert_file('missing.raw', str(tmp_path / 'missing.raw'), 'raw')
+        assert result.error.startswith('FileNotFoundError')
+
+        result = grg_pssedata.convert.convert_file(self.exception_file, str(tmp_path / 'case.raw'), 'raw')
+        assert result.error is not None
+        assert not os.path.exists(str(tmp_path / 'case.raw'))
+
+        result = grg_pssedata.convert.convert_file(self.case_file, self.case_file, 'raw')
+        assert result.error is not None
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_convert_files(self, workers, tmp_path):
+        compressed_file = str(tmp_path / 'other.raw.gz')
+        with open(self.other_file, 'rb') as psse_file:
+            with gzip.open(compressed_file, 'wb') as gzip_file:
+                gzip_file.write(psse_file.read())
+
+        out_dir = str(tmp_path / 'out')
+        file_names = [self.case_file, self.exception_file, compressed_file]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            results = list(grg_pssedata.convert.convert_files(file_names, out_dir, 'json', workers))
+        results = dict((result.file, result) for result in results)
+
+        assert sorted(results) == sorted(file_names)
+        assert results[self.exception_file].error is not None
+        case = grg_pssedata.convert.read_json_case_file(os.path.join(out_dir, 'other.json'))
+        assert case == grg_pssedata.io.parse_psse_case_file(self.other_file)
+        assert os.path.exists(os.path.join(out_dir, 'case5.json'))
+
+    def test_duplicate_outputs(self, tmp_path):
+        with pytest.raises(ValueError):
+            list(grg_pssedata.convert.convert_files([self.case_file, self.case_file+'.gz'], str(tmp_path), 'raw'))
@@ -0,0 +1,78 @@
+import os, pytest, warnings
+
+import grg_pssedata
+
+from grg_pssedata.diagnostics import ParseDiagnostics
+from grg_pssedata.exception import PSSEDataWarning
+
+from test_common import correct_files
+
+def dirty_case_str(case):
+    # every bus record has two values too many
+    lines = case.to_psse().split('\n')
+    for index in range(3, 3+len(case.buses)):
+        lines[index] += ', 0, 0'
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    with warnings.catch_warnings(record=True) as parse_warnings:
+        warnings.simplefilter('always')
+        case, diagnostics = grg_pssedata.io.parse_psse_case_file(input_data, diagnostics=True)
+    assert len(parse_warnings) == 0
+    assert case == grg_pssedata.io.parse_psse_case_file(input_data)
+
+
+class TestDiagnostics:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        self.psse_data = dirty_case_str(self.case)
+
+    def test_counts(self):
+        case, diagnostics = grg_pssedata.io.parse_psse_case_str(self.psse_data, diagnostics=True)
+        assert case == self.case
+        assert len(diagnostics) == len(self.case.buses)
+        assert diagnostics.counts() == {('bus', 'extra values'): len(self.case.buses)}
+
+        examples = list(diagnostics)
+        assert len(examples) == grg_pssedata.diagnostics.MAX_EXAMPLES
+        assert [example.line_index for example in examples] == list(range(3, 3+len(examples)))
+        assert diagnostics.suppressed() == {('bus', 'extra values'): len(self.case.buses) - len(examples)}
+
+    def test_messages(self):
+        diagnostics = ParseDiagnostics(max_examples=2)
+        grg_pssedata.io.parse_psse_case_str(self.psse_data, diagnostics=diagnostics)
+
+        messages = diagnostics.messages()
+        assert len(messages) == 3
+        assert messages[0].startswith('on psse data line 3 in the "bus" section')
+        assert messages[2].startswith('{} more issues'.format(len(self.case.buses) - 2))
+
+        records = diagnostics.records()
+        assert records[0]['count'] == len(self.case.buses)
+        assert len(records[0]['examples']) == 2
+
+    def test_escalate(self):
+        with pytest.warns(PSSEDataWarning) as parse_warnings:
+            grg_pssedata.io.parse_psse_case_str(self.psse_data, diagnostics=ParseDiagnostics(escalate=True))
+        assert len(parse_warnings) == grg_pssedata.diagnostics.MAX_EXAMPLES + 1
+
+    def test_default_warnings(self):
+        # without a collector the issues are issued as rate limited warnings
+        with pytest.warns(PSSEDataWarning) as parse_warnings:
+            case = grg_pssedata.io.parse_psse_case_str(self.psse_data)
+        assert len(parse_warnings) == grg_pssedata.diagnostics.MAX_EXAMPLES + 1
+        assert case == self.case
+
+    def test_failed_parse(self):
+        # the first branch record has too few values
+        lines = self.psse_data.split('\n')
+        branch_index = 3 + len(self.case.buses) + 1 + len(self.case.loads) + 1 + len(self.case.fixed_shunts) + 1 + len(self.case.generators) + 1
+        lines[branch_index] = '1, 2'
+
+        with pytest.warns(PSSEDataWarning) as parse_warnings:
+            with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+                grg_pssedata.io.parse_psse_case_str('\n'.join(lines))
+        assert len(parse_warnings) == grg_pssedata.diagnostics.MAX_EXAMPLES + 1
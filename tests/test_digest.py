@@ -0,0 +1,61 @@
+import os, pytest
+
+import grg_pssedata
+import grg_pssedata.digest
+
+from grg_pssedata.struct import PSSE_SECTIONS
+
+from test_common import correct_files
+from test_common import warning_files
+
+@pytest.mark.parametrize('input_data', correct_files + warning_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    sections = set(section for section, terminator in PSSE_SECTIONS)
+    lines = grg_pssedata.digest.reduced_case_lines(input_data, sections)
+    assert grg_pssedata.io.parse_psse_case_lines(lines) == case
+
+
+class TestDigest:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/WECC240_M21_psse33_v01b.raw'
+        self.case = grg_pssedata.io.parse_psse_case_file(self.case_file)
+
+    def write_case(self, tmp_path, name, comments=True):
+        lines = self.case.to_psse().split('\n')
+        if not comments:
+            lines = [line.split(' /')[0] for line in lines]
+        file_name = str(tmp_path / name)
+        with open(file_name, 'w') as psse_file:
+            psse_file.write('\n'.join(lines))
+        return file_name
+
+    def differing_sections(self, file_1, file_2):
+        digests_1 = grg_pssedata.digest.section_digests(file_1)
+        digests_2 = grg_pssedata.digest.section_digests(file_2)
+        assert [section for section, digest in digests_1] == [section for section, digest in digests_2]
+        return [section for (section, digest_1), (section_2, digest_2) in zip(digests_1, digests_2) if digest_1 != digest_2]
+
+    def test_sections(self):
+        digests = grg_pssedata.digest.section_digests(self.case_file)
+        assert [section for section, digest in digests] == ['case'] + [section for section, terminator in PSSE_SECTIONS]
+
+    def test_comments(self, tmp_path):
+        file_1 = self.write_case(tmp_path, 'case_1.raw')
+        file_2 = self.write_case(tmp_path, 'case_2.raw', comments=False)
+        assert not grg_pssedata.digest.files_identical(file_1, file_2)
+        assert self.differing_sections(file_1, file_2) == []
+
+    def test_changed_section(self, tmp_path):
+        file_1 = self.write_case(tmp_path, 'case_1.raw')
+        self.case.transformers[2].w2.windv = 1.1
+        file_2 = self.write_case(tmp_path, 'case_2.raw')
+        assert self.differing_sections(file_1, file_2) == ['transformers']
+
+    def test_truncated(self, tmp_path):
+        lines = self.case.to_psse().split('\n')
+        file_name = str(tmp_path / 'case.raw')
+        with open(file_name, 'w') as psse_file:
+            psse_file.write('\n'.join(lines[:100]))
+        assert grg_pssedata.digest.section_digests(file_name) is None
@@ -1,4 +1,4 @@
-import os, pytest
+import copy, os, pickle, pytest
 
 import grg_pssedata
 
@@ -30,3 +30,45 @@ def test_002(input_data):
     assert not case != case_2
     assert str(case) == str(case_2) # checks string representation of data structure
 
+
+def test_003(monkeypatch):
+    test_path = os.path.dirname(os.path.realpath(__file__))
+    case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+    monkeypatch.setattr(grg_pssedata.struct, 'PSSE_PARALLEL_CHUNK_SIZE', 25)
+
+    assert case.to_psse(workers=3) == case.to_psse() # checks parallel encoding
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_004(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    case_2 = pickle.loads(pickle.dumps(case))
+
+    assert not case != case_2 # checks columnar pickling
+    assert case.to_psse() == case_2.to_psse()
+
+def test_005():
+    test_path = os.path.dirname(os.path.realpath(__file__))
+    case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case5.raw')
+    bus = case.buses[1]
+    name = bus.name
+    del bus.name
+    bus.name = name # moves the name to the end of the attributes
+
+    case_2 = pickle.loads(pickle.dumps(case))
+    assert case_2.buses[1].name == name
+    assert not case != case_2 # checks columnar pickling of reordered attributes
+    assert case.to_psse() == case_2.to_psse()
+
+def test_006():
+    test_path = os.path.dirname(os.path.realpath(__file__))
+    case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/three_winding_test.raw')
+    case.buses[0].note = 'extra' # gives the buses two attribute layouts
+    case.buses[-1].note = 'extra'
+
+    case_2 = pickle.loads(pickle.dumps(case))
+    assert [bus.__dict__ for bus in case_2.buses] == [bus.__dict__ for bus in case.buses]
+    assert not case != case_2 # checks packed pickling of mixed layouts and nested components
+
+    case_3 = copy.deepcopy(case)
+    assert not case != case_3
+    assert case_3.transformers[0].w1 is not case.transformers[0].w1
@@ -0,0 +1,101 @@
+import os, pytest, shutil
+
+import grg_pssedata
+import grg_pssedata.index
+
+from grg_pssedata.diff import component_key_function
+from grg_pssedata.diff import keyed_components
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data, tmp_path):
+    file_name = str(tmp_path / 'case.raw')
+    shutil.copyfile(input_data, file_name)
+    case = grg_pssedata.io.parse_psse_case_file(file_name)
+    index = grg_pssedata.index.open_index(file_name)
+
+    for section in grg_pssedata.index.INDEXED_SECTIONS:
+        key_function = component_key_function(section)
+        for key, component in keyed_components(getattr(case, section), key_function):
+            assert index.lookup(section, key) == component
+
+    assert os.path.isfile(file_name + grg_pssedata.index.INDEX_SUFFIX)
+    assert grg_pssedata.index.read_index(file_name) == index
+
+
+class TestIndex:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/powermodels/case5.raw'
+
+    def copy_case(self, tmp_path):
+        file_name = str(tmp_path / 'case5.raw')
+        shutil.copyfile(self.case_file, file_name)
+        return file_name
+
+    def test_lookup(self, tmp_path):
+        file_name = self.copy_case(tmp_path)
+        case = grg_pssedata.io.parse_psse_case_file(file_name)
+
+        assert grg_pssedata.index.lookup(file_name, 'bus', 10) == case.buses[4]
+        assert grg_pssedata.index.lookup(file_name, 'buses', (10,)) == case.buses[4]
+        assert grg_pssedata.index.lookup(file_name, 'branch', (1, 2, '1')) == case.branches[0]
+        assert grg_pssedata.index.lookup(file_name, 'load', [3, "'1 '"]) == case.loads[1]
+
+        with pytest.raises(KeyError):
+            grg_pssedata.index.lookup(file_name, 'bus', 1001)
+        with pytest.raises(KeyError):
+            grg_pssedata.index.lookup(file_name, 'gnes', 0)
+
+    def test_invalidation(self, tmp_path):
+        file_name = self.copy_case(tmp_path)
+        index = grg_pssedata.index.open_index(file_name)
+        assert index.is_current()
+
+        # a new modification time alone does not change the index
+        status = os.stat(file_name)
+        os.utime(file_name, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+        assert grg_pssedata.index.open_index(file_name) == grg_pssedata.index.read_index(file_name)
+        assert grg_pssedata.index.read_index(file_name).mtime_ns == status.st_mtime_ns + 10**9
+
+        # a changed file of the same size is found by its digest
+        with open(file_name, 'rb') as psse_file:
+            psse_data = psse_file.read()
+        with open(file_name, 'wb') as psse_file:
+            psse_file.write(psse_data.replace(b"    1,'1           ', 230.0000", b"    7,'1           ', 230.0000", 1))
+        os.utime(file_name, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+        assert grg_pssedata.index.read_index(file_name).is_current()
+        assert not grg_pssedata.index.read_index(file_name).is_current(check_hash=True)
+
+        assert grg_pssedata.index.lookup(file_name, 'bus', 7, check_hash=True).i == 7
+        assert grg_pssedata.index.lookup(file_name, 'bus', 7).i == 7
+        with pytest.raises(KeyError):
+            grg_pssedata.index.lookup(file_name, 'bus', 1)
+
+    def test_cached_touch(self, tmp_path):
+        file_name = self.copy_case(tmp_path)
+        assert grg_pssedata.index.lookup(file_name, 'bus', 10).i == 10
+
+        # a cached index whose file was touched writes the new time to the sidecar
+        status = os.stat(file_name)
+        os.utime(file_name, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+        assert grg_pssedata.index.lookup(file_name, 'bus', 10).i == 10
+        assert grg_pssedata.index.read_index(file_name).mtime_ns == status.st_mtime_ns + 10**9
+
+    def test_compressed(self, tmp_path):
+        file_name = str(tmp_path / 'case5.raw.gz')
+        grg_pssedata.io.write_psse_case_file(grg_pssedata.io.parse_psse_case_file(self.case_file), file_name)
+        with pytest.raises(ValueError):
+            grg_pssedata.index.build_index(file_name)
+
+    def test_crlf(self, tmp_path):
+        file_name = str(tmp_path / 'case5.raw')
+        with open(self.case_file) as psse_file:
+            psse_data = psse_file.read()
+        with open(file_name, 'w', newline='\r\n') as psse_file:
+            psse_file.write(psse_data)
+        case = grg_pssedata.io.parse_psse_case_file(self.case_file)
+        index = grg_pssedata.index.open_index(file_name, write=False)
+        assert index.lookup('generator', (10, '1')) == case.generators[4]
+        assert not os.path.isfile(file_name + grg_pssedata.index.INDEX_SUFFIX)
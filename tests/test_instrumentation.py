@@ -0,0 +1,86 @@
+import logging, os, pytest
+
+import grg_pssedata
+
+from grg_pssedata.instrumentation import ParseInstrumentation
+from grg_pssedata.instrumentation import ParseMetrics
+from grg_pssedata.struct import PSSE_SECTIONS
+
+from test_common import correct_files
+
+class RecordingInstrumentation(ParseInstrumentation):
+    def __init__(self):
+        self.events = []
+
+    @property
+    def enabled(self):
+        return True
+
+    def event(self, event):
+        self.events.append(event)
+
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    instrumentation = RecordingInstrumentation()
+    case = grg_pssedata.io.parse_psse_case_file(input_data, instrumentation=instrumentation)
+    events = instrumentation.events
+
+    assert [event.section for event in events] == ['case'] + [section for section, terminator in PSSE_SECTIONS] + ['unparsed']
+    for event in events[1:-1]:
+        assert event.records == len(getattr(case, event.section))
+
+    with open(input_data, 'rb') as psse_file:
+        # line endings are read as newlines
+        data = psse_file.read().replace(b'\r\n', b'\n')
+    assert sum(event.lines for event in events) == len(data.splitlines())
+    assert sum(event.bytes for event in events) == len(data)
+
+
+class TestInstrumentation:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/WECC240_M21_psse33_v01b.raw'
+
+    def test_silent(self, capsys):
+        grg_pssedata.io.parse_psse_case_file(self.case_file)
+        captured = capsys.readouterr()
+        assert captured.out == ''
+        assert captured.err == ''
+
+    def test_logging(self, caplog):
+        with caplog.at_level(logging.DEBUG, logger='grg_pssedata.io'):
+            grg_pssedata.io.parse_psse_case_file(self.case_file)
+        messages = [record for record in caplog.records if record.name == 'grg_pssedata.io']
+        assert len(messages) == len(PSSE_SECTIONS) + 2
+        assert messages[1].parse_event['section'] == 'buses'
+        assert messages[1].parse_event['records'] == 240
+
+    def test_metrics(self):
+        metrics = ParseMetrics()
+        for index in range(0, 3):
+            grg_pssedata.io.parse_psse_case_file(self.case_file, instrumentation=metrics)
+        assert metrics.parses == 3
+        assert metrics.totals['buses'].records == 3*240
+        assert len(metrics.records()) == len(PSSE_SECTIONS) + 2
+
+    def test_streamed(self, monkeypatch):
+        # the sections are longer than the lines kept by the streamed reader
+        monkeypatch.setattr(grg_pssedata.io, 'STREAMED_LINES_WINDOW', 8)
+        parse_psse_case_lines = grg_pssedata.io.parse_psse_case_lines
+        parsed_lines = []
+        def recording_parse(lines, *args):
+            parsed_lines.append(lines)
+            return parse_psse_case_lines(lines, *args)
+        monkeypatch.setattr(grg_pssedata.io, 'parse_psse_case_lines', recording_parse)
+
+        streamed = RecordingInstrumentation()
+        grg_pssedata.io.parse_psse_case_file(self.case_file, instrumentation=streamed)
+        assert isinstance(parsed_lines[0], grg_pssedata.io.StreamedLines)
+        monkeypatch.undo()
+
+        read = RecordingInstrumentation()
+        with open(self.case_file) as psse_file:
+            grg_pssedata.io.parse_psse_case_lines(psse_file.readlines(), instrumentation=read)
+
+        assert [event[:4] for event in streamed.events] == [event[:4] for event in read.events]
@@ -0,0 +1,82 @@
+import copy, os, pytest, warnings
+
+import grg_pssedata
+import grg_pssedata.integrity
+
+from grg_pssedata.exception import PSSEDataWarning
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    report = case.check_integrity()
+
+    # the test cases only have duplicate facts device names
+    assert set(section for problem, section, field in report.counts()).issubset(['facts'])
+    assert report.missing() == []
+
+
+class TestIntegrity:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/frankenstein_00.raw')
+
+    def test_valid(self):
+        report = self.case.check_integrity()
+        assert report.valid
+        assert len(report) == 0
+
+    def test_missing_bus(self):
+        self.case.loads[1].i = 99
+        self.case.branches[0].j = 98
+        self.case.transformers[0].p1.k = 97
+
+        issues = self.case.check_integrity().missing()
+        assert [(issue.section, issue.position, issue.field, issue.value) for issue in issues] == [
+            ('loads', 1, 'i', 99), ('branches', 0, 'j', 98), ('transformers', 0, 'p1.k', 97)]
+        assert all(issue.target == 'buses' for issue in issues)
+        assert issues[0].key == (99, self.case.loads[1].id)
+
+    def test_optional_references(self):
+        self.case.generators[0].ireg = 0
+        self.case.transformers[0].p1.k = 0
+        assert self.case.check_integrity().valid
+
+    def test_missing_area_zone_owner(self):
+        self.case.buses[2].area = 50
+        self.case.loads[0].zone = 51
+        self.case.generators[1].o2 = 52
+
+        issues = self.case.check_integrity().missing()
+        assert [(issue.section, issue.field, issue.target) for issue in issues] == [
+            ('buses', 'area', 'areas'), ('loads', 'zone', 'zones'), ('generators', 'o2', 'owners')]
+
+    def test_empty_target(self):
+        # area data is optional
+        del self.case.areas[:]
+        assert self.case.check_integrity().valid
+
+    def test_duplicates(self):
+        self.case.buses.append(copy.deepcopy(self.case.buses[3]))
+        self.case.branches.append(copy.deepcopy(self.case.branches[1]))
+
+        issues = self.case.check_integrity().duplicates()
+        assert [(issue.section, issue.position, issue.value) for issue in issues] == [
+            ('buses', len(self.case.buses)-1, 3), ('branches', len(self.case.branches)-1, 1)]
+        assert issues[1].key == (self.case.branches[1].i, self.case.branches[1].j, self.case.branches[1].ckt)
+
+    def test_report(self):
+        self.case.loads[0].i = 99
+        self.case.buses.append(copy.deepcopy(self.case.buses[0]))
+
+        report = self.case.check_integrity()
+        assert report.counts() == {('duplicate', 'buses', None): 1, ('missing', 'loads', 'i'): 1}
+        records = report.records()
+        assert records[1]['problem'] == 'missing'
+        assert records[1]['key'][0] == 99
+        assert 'does not exist' in records[1]['message']
+        assert 'same key' in records[0]['message']
+
+        with pytest.warns(PSSEDataWarning):
+            self.case.check_integrity(warn=True)
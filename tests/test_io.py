@@ -0,0 +1,116 @@
+import os, shutil, pytest
+
+import grg_pssedata
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+@pytest.mark.parametrize('extension', ['.raw', '.raw.gz', '.raw.bz2', '.raw.xz'])
+def test_001(input_data, extension, tmp_path):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    file_name = str(tmp_path / ('case'+extension))
+    grg_pssedata.io.write_psse_case_file(case, file_name)
+
+    with grg_pssedata.io.open_psse_file(file_name) as psse_file:
+        assert psse_file.read() == case.to_psse() # checks streaming writer
+
+    case_2 = grg_pssedata.io.parse_psse_case_file(file_name)
+    assert case == case_2
+
+
+@pytest.mark.parametrize('extension', ['.gz', '.bz2', '.xz'])
+def test_002(extension, tmp_path):
+    test_path = os.path.dirname(os.path.realpath(__file__))
+    case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+    file_name = str(tmp_path / ('case14.raw'+extension))
+    grg_pssedata.io.write_psse_case_file(case, file_name)
+
+    unlabeled_file_name = str(tmp_path / 'case14.raw')
+    shutil.move(file_name, unlabeled_file_name)
+
+    case_2 = grg_pssedata.io.parse_psse_case_file(unlabeled_file_name) # checks leading byte detection
+    assert case == case_2
+
+
+def test_streamed_lines():
+    lines = grg_pssedata.io.StreamedLines(('line {}\n'.format(index) for index in range(0, 100)), window=10)
+    assert lines[0] == 'line 0\n'
+    assert lines[35] == 'line 35\n'
+    assert lines[30:32] == ['line 30\n', 'line 31\n']
+    with pytest.raises(IndexError):
+        lines[1] # discarded, it is more than two windows before line 35
+    assert len(lines) == 100
+    assert lines[-1] == 'line 99\n'
+    with pytest.raises(IndexError):
+        lines[100]
+
+
+@pytest.mark.parametrize('extension', ['.raw', '.raw.gz'])
+def test_streamed_parse(extension, tmp_path, monkeypatch):
+    test_path = os.path.dirname(os.path.realpath(__file__))
+    case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+    file_name = str(tmp_path / ('case'+extension))
+    grg_pssedata.io.write_psse_case_file(case, file_name)
+
+    # the parser only reads back within a record
+    monkeypatch.setattr(grg_pssedata.io, 'STREAMED_LINES_WINDOW', 8)
+    assert grg_pssedata.io.parse_psse_case_file(file_name) == case
+    assert grg_pssedata.io.parse_psse_case_file(file_name, profile=True) == case
+
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_probe(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    header = grg_pssedata.io.probe_psse_case_file(input_data)
+
+    assert header.section_lines is None
+    assert header[:8] == (case.ic, case.sbase, case.rev, case.xfrrat, case.nxfrat, case.basfrq, case.record1, case.record2)
+
+    header = grg_pssedata.io.probe_psse_case_file(input_data, section_lines=True)
+    assert header.section_lines['buses'] == len(case.buses)
+    assert header.section_lines['loads'] == len(case.loads)
+    assert header.section_lines['transformers'] >= 4*len(case.transformers)
+
+
+class TestProbe:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/powermodels/case5.raw'
+
+    def test_compressed(self, tmp_path):
+        file_name = str(tmp_path / 'case5.raw.xz')
+        grg_pssedata.io.write_psse_case_file(grg_pssedata.io.parse_psse_case_file(self.case_file), file_name)
+        header = grg_pssedata.io.probe_psse_case_file(file_name, section_lines=True)
+        assert header == grg_pssedata.io.probe_psse_case_file(self.case_file, section_lines=True)
+
+    @pytest.mark.parametrize('header, valid', [(' 0, 100.0, 33.0, 0, 0, 60.0', True), (' , , , , , ', True),
+        (' 1, 100.0, 33, 0, 0, 60.0', False), (' 0, 100.0, 33, 0, 0', False)])
+    def test_header_checks(self, header, valid, tmp_path):
+        with open(self.case_file) as psse_file:
+            lines = psse_file.read().split('\n')
+        file_name = tmp_path / 'case.raw'
+        file_name.write_text('\n'.join([header] + lines[1:]))
+
+        if valid:
+            case = grg_pssedata.io.parse_psse_case_file(str(file_name))
+            assert grg_pssedata.io.probe_psse_case_file(str(file_name))[:6] == (case.ic, case.sbase, case.rev, case.xfrrat, case.nxfrat, case.basfrq)
+        else:
+            with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+                grg_pssedata.io.parse_psse_case_file(str(file_name))
+            with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+                grg_pssedata.io.probe_psse_case_file(str(file_name))
+
+    def test_invalid(self, tmp_path):
+        file_name = tmp_path / 'case.raw'
+        file_name.write_text('0, 100.0, 33, 0, 0, 60.0\nrecord 1\n')
+        with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+            grg_pssedata.io.probe_psse_case_file(str(file_name))
+
+        file_name.write_text('0, 100.0, 33, 0, 0, 60.0\nrecord 1\nrecord 2\n1, \'bus\', 230.0, 1, 1, 1, 1, 1.0, 0.0\n0\n')
+        assert grg_pssedata.io.probe_psse_case_file(str(file_name)).record2 == 'record 2'
+        with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+            grg_pssedata.io.probe_psse_case_file(str(file_name), section_lines=True)
+
+        file_name.write_text('0, 100.0, 33\nrecord 1\nrecord 2\n')
+        with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+            grg_pssedata.io.probe_psse_case_file(str(file_name))
@@ -0,0 +1,71 @@
+import os, pickle, pytest, sys
+
+import grg_pssedata
+
+from grg_pssedata.memory import HEADER_SECTION
+from grg_pssedata.struct import PSSE_SECTIONS
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    report = case.memory_report()
+
+    assert [memory.section for memory in report] == [HEADER_SECTION] + [section for section, terminator in PSSE_SECTIONS]
+    for section, terminator in PSSE_SECTIONS:
+        memory = report.section(section)
+        assert memory.components == len(getattr(case, section))
+        assert memory.bytes == memory.object_bytes + memory.unique_string_bytes + memory.shared_string_bytes
+        assert memory.bytes >= sys.getsizeof(getattr(case, section))
+
+    # the report does not depend on how the case was created
+    assert pickle.loads(pickle.dumps(case)).memory_report().total().components == report.total().components
+
+
+class TestMemory:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def test_sections(self):
+        report = self.case.memory_report()
+        buses = report.section('buses')
+        assert buses.components == 240
+        # a bus is an object, its attribute dict and its values
+        assert buses.object_bytes > 240*(sys.getsizeof(self.case.buses[0]) + sys.getsizeof(self.case.buses[0].__dict__))
+        assert buses.unique_string_bytes > 240*sys.getsizeof('')
+
+        total = report.total()
+        assert total.bytes == sum(memory.bytes for memory in report)
+        assert len(report.records()) == len(report.sections) + 1
+        assert len(report.table()) == len(report.sections) + 3
+
+        with pytest.raises(KeyError):
+            report.section('unknown')
+
+    def test_shared_strings(self):
+        name = self.case.buses[0].name
+        before = self.case.memory_report()
+        assert before.section('buses').shared_string_bytes == 0
+
+        # the second reference makes the string shared, it is counted once
+        self.case.buses[1].name = name
+        after = self.case.memory_report()
+        assert after.section('buses').shared_string_bytes == sys.getsizeof(name)
+        assert after.section('buses').unique_string_bytes < before.section('buses').unique_string_bytes - sys.getsizeof(name)
+
+    def test_shared_objects(self):
+        report = self.case.memory_report()
+
+        # components that appear in two sections are counted in the first
+        self.case.zones.append(self.case.buses[0])
+        shared = self.case.memory_report()
+        assert shared.section('buses') == report.section('buses')
+        assert shared.section('zones').components == report.section('zones').components + 1
+        assert shared.total().bytes - report.total().bytes < sys.getsizeof(self.case.buses[0])
+
+    def test_ignored_attributes(self):
+        report = self.case.memory_report()
+        self.case.parse_stats = list(range(0, 1000))
+        assert self.case.memory_report() == report
@@ -0,0 +1,83 @@
+import copy, io, os, pytest
+
+import grg_pssedata
+import grg_pssedata.patch
+
+from grg_pssedata.exception import PSSEDataPatchError
+
+from test_common import correct_files
+from test_common import warning_files
+
+def round_trip(case_1, case_2, base_case):
+    patch = io.StringIO()
+    grg_pssedata.patch.write_case_delta(case_1, case_2, patch)
+    patch.seek(0)
+    return grg_pssedata.patch.apply_patch(base_case, grg_pssedata.patch.read_patch(patch))
+
+
+@pytest.mark.parametrize('input_data', correct_files + warning_files)
+def test_001(input_data):
+    base_file = correct_files[0] if input_data != correct_files[0] else correct_files[1]
+    case_1 = grg_pssedata.io.parse_psse_case_file(base_file)
+    case_2 = grg_pssedata.io.parse_psse_case_file(input_data)
+
+    case_3 = round_trip(case_1, case_2, grg_pssedata.io.parse_psse_case_file(base_file))
+    assert case_3 == case_2
+    assert case_3.to_psse() == case_2.to_psse()
+
+
+class TestPatch:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/WECC240_M21_psse33_v01b.raw'
+        self.case_1 = grg_pssedata.io.parse_psse_case_file(self.case_file)
+        self.case_2 = grg_pssedata.io.parse_psse_case_file(self.case_file)
+
+    def operations(self):
+        return list(grg_pssedata.patch.case_delta(self.case_1, self.case_2))
+
+    def test_identical(self):
+        assert self.operations() == []
+
+    def test_operations(self):
+        self.case_2.buses[3].vm = 1.5
+        self.case_2.transformers[2].w1.windv = 1.1
+        bus = copy.deepcopy(self.case_2.buses[0])
+        bus.i = 999001
+        self.case_2.buses.insert(7, bus)
+        del self.case_2.generators[4]
+
+        operations = self.operations()
+        assert [(operation['op'], operation['section']) for operation in operations] == [
+            ('set', 'buses'), ('add', 'buses'), ('remove', 'generators'), ('set', 'transformers')]
+        assert operations[0]['fields'] == {'vm': 1.5}
+        assert operations[1]['at'] == 7
+        assert operations[3]['fields'] == {'w1.windv': 1.1}
+
+    def test_reorder(self):
+        self.case_2.branches.reverse()
+        for index, branch in enumerate(self.case_2.branches):
+            branch.index = index
+
+        operations = self.operations()
+        assert [operation['op'] for operation in operations] == ['order']
+        case_3 = round_trip(self.case_1, self.case_2, grg_pssedata.io.parse_psse_case_file(self.case_file))
+        assert case_3 == self.case_2
+
+    def test_unknown_key(self):
+        operations = [{'op': 'remove', 'section': 'buses', 'key': [-1]}]
+        with pytest.raises(PSSEDataPatchError):
+            grg_pssedata.patch.apply_patch(self.case_1, operations)
+
+    def test_unknown_section(self):
+        operations = [{'op': 'remove', 'section': 'widgets', 'key': [1]}]
+        with pytest.raises(PSSEDataPatchError):
+            grg_pssedata.patch.apply_patch(self.case_1, operations)
+
+    def test_bad_header(self):
+        with pytest.raises(PSSEDataPatchError):
+            list(grg_pssedata.patch.read_patch(['{"patch":"other","version":1}']))
+        with pytest.raises(PSSEDataPatchError):
+            list(grg_pssedata.patch.read_patch(['{"patch":"grg_pssedata","version":2}']))
+        with pytest.raises(PSSEDataPatchError):
+            list(grg_pssedata.patch.read_patch([]))
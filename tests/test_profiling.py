@@ -0,0 +1,64 @@
+import os, pickle, pytest, tracemalloc
+
+import grg_pssedata
+
+from grg_pssedata.struct import PSSE_SECTIONS
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data, profile=True)
+    parse_stats = case.parse_stats
+
+    assert [stats.section for stats in parse_stats] == ['case'] + [section for section, terminator in PSSE_SECTIONS] + ['unparsed']
+    for section, terminator in PSSE_SECTIONS:
+        assert parse_stats.section(section).records == len(getattr(case, section))
+    assert not tracemalloc.is_tracing()
+
+    # the profile is not part of the case data
+    assert case == grg_pssedata.io.parse_psse_case_file(input_data)
+
+
+class TestProfiling:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/WECC240_M21_psse33_v01b.raw'
+
+    def test_stats(self):
+        parse_stats = grg_pssedata.io.parse_psse_case_file(self.case_file, profile=True).parse_stats
+        buses = parse_stats.section('buses')
+        assert buses.records == 240
+        assert buses.lines == 241
+        assert buses.tokens > 240*9
+        assert buses.memory > 0
+        assert buses.seconds > 0
+
+        total = parse_stats.total()
+        assert total.records == sum(stats.records for stats in parse_stats)
+        assert len(parse_stats.records()) == len(parse_stats.sections) + 1
+
+    def test_warnings(self):
+        case = grg_pssedata.io.parse_psse_case_file(self.case_file)
+        lines = case.to_psse().split('\n')
+        lines[3] += ', 0, 0'
+
+        with pytest.warns(grg_pssedata.exception.PSSEDataWarning):
+            parse_stats = grg_pssedata.io.parse_psse_case_str('\n'.join(lines), profile=True).parse_stats
+        assert parse_stats.section('buses').warnings == 1
+        assert parse_stats.total().warnings == 1
+
+    def test_pickle(self):
+        case = grg_pssedata.io.parse_psse_case_file(self.case_file, profile=True)
+        case_2 = pickle.loads(pickle.dumps(case))
+        assert case_2.parse_stats == case.parse_stats
+        assert case_2 == case
+
+    def test_streamed(self, monkeypatch):
+        monkeypatch.setattr(grg_pssedata.io, 'STREAMED_LINES_WINDOW', 8)
+        parse_stats = grg_pssedata.io.parse_psse_case_file(self.case_file, profile=True).parse_stats
+        with open(self.case_file) as psse_file:
+            read_stats = grg_pssedata.io.parse_psse_case_lines(psse_file.readlines(), profile=True).parse_stats
+
+        assert [stats.tokens for stats in parse_stats] == [stats.tokens for stats in read_stats]
+        assert parse_stats.section('buses').tokens > 240*9
@@ -0,0 +1,45 @@
+import os, multiprocessing, pytest, sys
+
+import grg_pssedata
+import grg_pssedata.binary
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 8), reason='shared memory requires python 3.8 or newer')
+
+if sys.version_info >= (3, 8):
+    from grg_pssedata import shared
+
+
+def bus_voltage_sum(name):
+    with shared.attach_shared_case(name) as case:
+        return sum(bus.vm for bus in case.buses)
+
+
+class TestSharedCase:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        self.case_2 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/three_winding_test.raw')
+
+    def test_attributes(self):
+        with shared.SharedCase(self.case) as shared_case:
+            case = shared.attach_shared_case(shared_case.name, verify=True)
+            assert case.sbase == self.case.sbase
+            assert len(case.buses) == len(self.case.buses)
+            assert case.buses[3] == self.case.buses[3]
+            assert case.buses[-1] == self.case.buses[-1]
+            assert case.transformers[:5] == self.case.transformers[:5]
+            assert case.loads == self.case.loads
+            assert case.to_case() == self.case
+            case.close()
+
+    def test_mixed_shapes(self):
+        with shared.SharedCase(self.case_2) as shared_case:
+            with shared.attach_shared_case(shared_case.name) as case:
+                for name, terminator in grg_pssedata.struct.PSSE_SECTIONS:
+                    assert getattr(case, name) == getattr(self.case_2, name)
+
+    def test_workers(self):
+        with shared.SharedCase(self.case) as shared_case:
+            with multiprocessing.Pool(2) as pool:
+                sums = pool.map(bus_voltage_sum, [shared_case.name]*2)
+        assert sums == [sum(bus.vm for bus in self.case.buses)]*2
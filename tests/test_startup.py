@@ -0,0 +1,44 @@
+import os, pytest, subprocess, sys
+
+import grg_pssedata
+
+
+package_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# standard library modules that only some sub-commands use
+subcommand_modules = ['array', 'asyncio', 'csv', 'glob', 'json', 'logging', 'multiprocessing', 'tracemalloc']
+
+def loaded_modules(arguments, prefix='grg_pssedata'):
+    '''runs python with the given arguments and returns the modules that
+    start with the given prefix that were loaded when it exits'''
+    code = 'import atexit, sys; atexit.register(lambda: sys.stderr.write(" ".join(sorted(m for m in sys.modules if m.startswith("{}")))))'.format(prefix)
+    environment = dict(os.environ, PYTHONPATH=package_path)
+    process = subprocess.run([sys.executable, '-c', code+'; '+arguments], env=environment,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    return process.stdout, process.stderr.split()
+
+
+# the package imports its modules eagerly before python 3.7, which has no
+# module __getattr__
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='lazy imports require python 3.7 or newer')
+class TestStartup:
+    def test_import(self):
+        output, modules = loaded_modules('import grg_pssedata')
+        assert modules == ['grg_pssedata']
+
+    def test_version(self):
+        output, modules = loaded_modules('import runpy; sys.argv = ["cmd", "--version"]; runpy.run_module("grg_pssedata.cmd", run_name="__main__")')
+        assert output.strip() == 'grg_pssedata.cmd (version {})'.format(grg_pssedata.__version__)
+        assert modules == ['grg_pssedata', 'grg_pssedata.formats']
+
+        output, modules = loaded_modules('import runpy; sys.argv = ["cmd", "--version"]; runpy.run_module("grg_pssedata.cmd", run_name="__main__")', prefix='')
+        assert [module for module in subcommand_modules if module in modules] == []
+
+    def test_lazy_attributes(self):
+        output, modules = loaded_modules('import grg_pssedata; grg_pssedata.exception.PSSEDataWarning')
+        assert modules == ['grg_pssedata', 'grg_pssedata.exception']
+
+        assert 'io' in dir(grg_pssedata)
+        assert grg_pssedata.io.parse_psse_case_file is not None
+        with pytest.raises(AttributeError):
+            grg_pssedata.unknown
@@ -0,0 +1,72 @@
+import gzip, io, os, pytest
+
+import grg_pssedata
+import grg_pssedata.stats
+
+from grg_pssedata.struct import PSSE_SECTIONS
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    stats = grg_pssedata.stats.case_file_stats(input_data)
+
+    assert stats.error is None
+    for section, terminator in PSSE_SECTIONS:
+        assert stats.records[section] == len(getattr(case, section))
+    assert stats.buses_by_area == dict((area, sum(1 for bus in case.buses if bus.area == area)) for area in set(bus.area for bus in case.buses))
+    assert stats.buses_by_type == dict((ide, sum(1 for bus in case.buses if bus.ide == ide)) for ide in set(bus.ide for bus in case.buses))
+    assert stats.load_p == pytest.approx(sum(load.pl for load in case.loads if load.status != 0))
+    assert stats.generation_q == pytest.approx(sum(generator.qg for generator in case.generators if generator.stat != 0))
+    assert (stats.sbase, stats.rev) == (case.sbase, case.rev)
+
+
+class TestStats:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case_file = test_path+'/data/correct/powermodels/case5.raw'
+        self.other_file = test_path+'/data/correct/powermodels/case14.raw'
+        self.incomplete_file = test_path+'/data/exception/powermodels/parser_test_d.raw'
+
+    def test_compressed(self, tmp_path):
+        file_name = str(tmp_path / 'case5.raw.gz')
+        with open(self.case_file, 'rb') as psse_file:
+            with gzip.open(file_name, 'wb') as gzip_file:
+                gzip_file.write(psse_file.read())
+        stats = grg_pssedata.stats.case_file_stats(file_name)
+        assert stats._replace(file=None) == grg_pssedata.stats.case_file_stats(self.case_file)._replace(file=None)
+
+    def test_errors(self, tmp_path):
+        stats = grg_pssedata.stats.case_file_stats(self.incomplete_file)
+        assert stats.error is not None
+
+        # the statistics of an incomplete file are partial
+        with open(self.case_file) as psse_file:
+            lines = psse_file.readlines()
+        stats = grg_pssedata.stats.case_stats_lines(lines[:12])
+        assert stats.error is not None
+        assert stats.records['buses'] == 5
+        assert stats.records['loads'] == 3
+
+        stats = grg_pssedata.stats.case_file_stats(str(tmp_path / 'missing.raw'))
+        assert stats.error is not None
+
+    def test_parallel(self):
+        file_names = [self.case_file, self.incomplete_file, self.other_file]
+        serial = list(grg_pssedata.stats.case_files_stats(file_names))
+        assert [stats.file for stats in serial] == file_names
+        assert list(grg_pssedata.stats.case_files_stats(file_names, workers=2)) == serial
+
+    def test_formats(self):
+        stats = [grg_pssedata.stats.case_file_stats(self.case_file), grg_pssedata.stats.case_file_stats(self.incomplete_file)]
+
+        output = io.StringIO()
+        assert grg_pssedata.stats.write_jsonl_stats(stats, output) == 2
+        assert len(output.getvalue().splitlines()) == 2
+
+        output = io.StringIO()
+        grg_pssedata.stats.write_csv_stats(stats, output)
+        rows = output.getvalue().splitlines()
+        assert rows[0] == ','.join(grg_pssedata.stats.STATS_CSV_COLUMNS)
+        assert sum(1 for row in rows if ',error,' in row) == 1
@@ -0,0 +1,85 @@
+import os, pytest
+
+import grg_pssedata
+
+from grg_pssedata.struct import PSSE_SECTIONS
+from grg_pssedata.synthetic import synthetic_case
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    base_case = grg_pssedata.io.parse_psse_case_file(input_data)
+    if len(base_case.buses) <= 0:
+        with pytest.raises(ValueError):
+            synthetic_case(base_case, copies=3)
+        return
+
+    case = synthetic_case(base_case, copies=3)
+    assert len(case.buses) == 3*len(base_case.buses)
+    assert case == grg_pssedata.io.parse_psse_case_str(case.to_psse())
+
+
+class TestSynthetic:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.base_case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def test_size(self):
+        case = synthetic_case(self.base_case, buses=1000)
+        assert len(case.buses) == 5*240
+        assert sorted(bus.i for bus in case.buses) == list(range(1, 5*240+1))
+        assert len(case.branches) == 5*len(self.base_case.branches) + 4*2
+        assert len(case.areas) == 5*len(self.base_case.areas)
+
+    def test_integrity(self):
+        case = synthetic_case(self.base_case, copies=4, ties=3)
+        assert case.check_integrity().valid
+
+        # the base case is not changed
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        assert self.base_case == grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def test_all_sections(self):
+        case = synthetic_case(self.base_case, copies=2)
+        for section, terminator in PSSE_SECTIONS:
+            if section in ['line_groupings', 'transfers', 'gnes', 'induction_machines']:
+                continue
+            assert len(getattr(case, section)) > 0
+        assert len(case.facts) == 2
+        assert case.facts[0].name != case.facts[1].name
+        assert len(case.switched_shunts) == 2
+
+        case = synthetic_case(self.base_case, copies=2, fill_sections=False)
+        assert len(case.facts) == 0
+
+    def test_ties(self):
+        case = synthetic_case(self.base_case, copies=3, ties=2)
+        ties = [branch for branch in case.branches if (branch.i - 1) // 240 != (branch.j - 1) // 240]
+        assert [branch.ckt for branch in ties] == ['00', '01', '00', '01']
+
+        case = synthetic_case(self.base_case, copies=2, ties=100)
+        ties = [branch for branch in case.branches if (branch.i - 1) // 240 != (branch.j - 1) // 240]
+        assert len(set(branch.ckt for branch in ties)) == 100
+
+        with pytest.raises(ValueError):
+            synthetic_case(self.base_case, copies=2, ties=101)
+
+    def test_seed(self):
+        case_1 = synthetic_case(self.base_case, copies=3, seed=1, perturbation=0.1)
+        case_2 = synthetic_case(self.base_case, copies=3, seed=1, perturbation=0.1)
+        case_3 = synthetic_case(self.base_case, copies=3, seed=2, perturbation=0.1)
+        assert case_1 == case_2
+        assert case_1 != case_3
+        assert case_1.loads[0].pl != self.base_case.loads[0].pl
+
+    def test_area_wrap(self, monkeypatch):
+        monkeypatch.setattr(grg_pssedata.synthetic, 'MAX_AREA_ID', 50)
+        case = synthetic_case(self.base_case, copies=5)
+        assert max(area.i for area in case.areas) <= 50
+        assert len(case.areas) == 50
+        assert case.check_integrity().valid
+
+    def test_too_many_buses(self):
+        with pytest.raises(ValueError):
+            synthetic_case(self.base_case, buses=2000000)
@@ -0,0 +1,81 @@
+import os, pytest, warnings
+
+import grg_pssedata
+import grg_pssedata.validation
+
+from grg_pssedata.exception import PSSEDataWarning
+
+from test_common import correct_files
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    report = case.validate(warn=False)
+
+    # the rules reproduce the checks of the component validate methods
+    with warnings.catch_warnings(record=True) as component_warnings:
+        warnings.simplefilter('always')
+        for component_list in case.component_lists:
+            for component in component_list:
+                component.validate()
+    component_violations = [violation for violation in report if violation.section != 'case']
+    assert len(component_violations) == len(component_warnings)
+
+
+class TestValidation:
+    def setup_method(self, _):
+        test_path = os.path.dirname(os.path.realpath(__file__))
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def violations(self, section, field):
+        report = grg_pssedata.validation.validate_case(self.case)
+        return [violation for violation in report if violation.section == section and violation.field == field]
+
+    def test_range(self):
+        assert self.violations('buses', 'area') == []
+        self.case.buses[7].area = 0
+        self.case.buses[9].area = 10000
+
+        violations = self.violations('buses', 'area')
+        assert [violation.position for violation in violations] == [7, 9]
+        assert violations[0].key == (self.case.buses[7].i,)
+        assert violations[1].value == 10000
+        assert violations[1].rule.ub == 9999
+
+    def test_nested_fields(self):
+        self.case.transformers[2].w1.ang = 200.0
+        violations = self.violations('transformers', 'w1.ang')
+        assert [violation.position for violation in violations] == [2]
+        assert 'winding 1' in grg_pssedata.validation.violation_message(violations[0])
+
+    def test_format(self):
+        self.case.branches[4].ckt = '&1'
+        violations = self.violations('branches', 'ckt')
+        assert [violation.position for violation in violations] == [4]
+
+    def test_case_header(self):
+        self.case.record1 = 'x'*61
+        assert len(self.violations('case', 'record1')) == 1
+
+    def test_report(self):
+        self.case.buses[7].area = 0
+        report = self.case.validate(warn=False)
+        records = report.records()
+        assert len(records) == len(report)
+        assert not report.valid
+        assert {'section': 'buses', 'position': 7, 'key': [self.case.buses[7].i], 'field': 'area',
+            'value': 0, 'lb': 1, 'ub': 9999, 'bounds': '1 to 9999',
+            'message': report.messages()[[violation.field for violation in report].index('area')]} in records
+        assert report.counts()[('buses', 'area')] == 1
+
+    def test_warnings(self):
+        self.case.buses[7].area = 0
+        with pytest.warns(PSSEDataWarning):
+            self.case.validate()
+
+    def test_workers(self, monkeypatch):
+        monkeypatch.setattr(grg_pssedata.validation, 'PSSE_PARALLEL_CHUNK_SIZE', 25)
+        self.case.buses[100].zone = -1
+        serial = grg_pssedata.validation.validate_case(self.case)
+        parallel = grg_pssedata.validation.validate_case(self.case, workers=2)
+        assert serial.violations == parallel.violations